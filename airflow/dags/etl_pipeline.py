@@ -0,0 +1,181 @@
+"""
+Cricket ETL DAG: extract, per-team preprocessing fan-out, fan-in training.
+
+    split_by_team ──> preprocess_partition[team] (mapped, in parallel) ──> train_on_partitions ──> cleanup_partitions
+
+``split_by_team`` writes one Parquet partition per ``team`` of the raw ODI
+data, each mapped ``preprocess_partition`` task cleans one partition (the
+expensive numeric repair in cleaning.py) and writes it next to it, and
+``train_on_partitions`` combines the cleaned partitions, writes the combined
+cleaned_data.parquet and trains the model. Partitions carry each row's position
+in the raw file, so the combined frame is put back in raw order: the same rows
+in the same order as the linear preprocess, hence the same train/test split
+and model. Tasks only pass file paths to each other, so XCom carries short
+strings, never DataFrames. Each run partitions into its own work directory,
+which is removed once training succeeded (and kept for retries otherwise).
+
+The task bodies are plain functions. ``run_local`` runs the same graph with a
+process pool and no Airflow at all; with Airflow installed the ``cricket_etl``
+DAG wires them as TaskFlow tasks (dynamic task mapping, Airflow >= 2.3) and can
+be exercised without a server via ``airflow dags test cricket_etl``.
+
+Usage without Airflow:
+    python airflow/dags/etl_pipeline.py --workers 4
+"""
+import argparse
+import hashlib
+import os
+import re
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+
+def _find_base_dir():
+    """Project root: the first parent with a src/ directory (repo checkout or /opt/airflow)"""
+    here = Path(__file__).resolve().parent
+    for candidate in (here, *here.parents):
+        if (candidate / 'src').is_dir():
+            return candidate
+    return here.parent.parent
+
+# Define paths
+BASE_DIR = Path(os.environ.get('CRICKET_BASE_DIR', _find_base_dir()))
+RAW_DATA_PATH = BASE_DIR / 'data' / 'raw' / 'ODI_Cricket_Data.csv'
+PROCESSED_DIR = BASE_DIR / 'data' / 'processed'
+PARTITIONS_DIR = PROCESSED_DIR / 'teams'
+MODELS_DIR = BASE_DIR / 'models'
+ROW_COLUMN = '_raw_row'   # position of a row in the raw file, dropped before training
+
+sys.path.insert(0, str(BASE_DIR / 'src'))
+
+
+def team_slug(team):
+    """File-name-safe, unique partition key for a team name
+
+    The readable part alone would map e.g. "A&B" and "A B" to the same file, so
+    a short hash of the raw name is appended.
+    """
+    if team is None or team != team:   # None or NaN
+        return 'unknown'
+    readable = re.sub(r'[^0-9A-Za-z]+', '_', str(team)).strip('_') or 'team'
+    return f"{readable}-{hashlib.md5(str(team).encode('utf-8')).hexdigest()[:8]}"
+
+
+# ── Tasks ────────────────────────────────────────────────────────────────────────
+def split_by_team(raw_path=RAW_DATA_PATH, out_dir=PARTITIONS_DIR):
+    """Read the raw CSV once and write one partition per team; returns the partition paths"""
+    import pandas as pd
+    from data_io import write_frame
+    from schema import read_csv_kwargs
+
+    out_dir = Path(out_dir) / 'raw'
+    df = pd.read_csv(raw_path, **read_csv_kwargs('extract'))
+    df[ROW_COLUMN] = range(len(df))
+    paths = []
+    for team, part in df.groupby('team', observed=True, dropna=False, sort=True):
+        path = out_dir / f'team={team_slug(team)}.parquet'
+        paths.append(write_frame(part.reset_index(drop=True), path))
+    print(f"✅ Split {len(df)} rows from {raw_path} into {len(paths)} team partitions under {out_dir}")
+    return paths
+
+
+def preprocess_partition(partition_path):
+    """Clean one team partition; returns the cleaned partition's path"""
+    from data_io import read_frame, write_frame
+    from preprocess import preprocess_frame
+
+    partition_path = Path(partition_path)
+    out_path = partition_path.parent.parent / 'cleaned' / partition_path.name
+    # Duplicate rows share a team, so per-partition de-duplication equals the global one
+    # (the first occurrence is kept, as partitions keep the raw order)
+    df = read_frame(partition_path)
+    df = preprocess_frame(df, subset=[col for col in df.columns if col != ROW_COLUMN])
+    write_frame(df, out_path)
+    print(f"✅ {partition_path.name}: {len(df)} cleaned rows -> {out_path}")
+    return str(out_path)
+
+
+def train_on_partitions(cleaned_paths, cleaned_output=None, model_dir=MODELS_DIR):
+    """Combine the cleaned partitions, write the combined file and train; returns the model path"""
+    import pandas as pd
+    import train_model as trainer
+    from data_io import read_frame, write_frame
+
+    cleaned_output = cleaned_output or PROCESSED_DIR / 'cleaned_data.parquet'
+    df = pd.concat([read_frame(path) for path in cleaned_paths], ignore_index=True)
+    # Back to raw order (whatever order the fan-out finished in), so the split matches the linear pipeline
+    df = df.sort_values(ROW_COLUMN, kind='stable').drop(columns=ROW_COLUMN).reset_index(drop=True)
+    write_frame(df, cleaned_output)
+    model, mae = trainer.train(df)
+    model_path = trainer.save_model(model, model_dir, mae=mae, data_path=str(cleaned_output))
+    print(f"✅ Trained on {len(df)} rows from {len(cleaned_paths)} partitions")
+    return str(model_path)
+
+
+def cleanup_partitions(work_dir):
+    """Remove a run's raw and cleaned team partitions"""
+    shutil.rmtree(work_dir, ignore_errors=True)
+    print(f"🧹 Removed partitions under {work_dir}")
+
+
+# ── Local stand-in ───────────────────────────────────────────────────────────────
+def run_local(raw_path=RAW_DATA_PATH, work_dir=None, model_dir=MODELS_DIR, cleaned_output=None, max_workers=None,
+              keep_partitions=False):
+    """Run the DAG without Airflow: the fan-out runs on a process pool; returns the model path"""
+    work_dir = Path(work_dir or PARTITIONS_DIR / datetime.now().strftime('%Y%m%dT%H%M%S'))
+    start = time.perf_counter()
+    partitions = split_by_team(raw_path, work_dir)
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        cleaned = list(pool.map(preprocess_partition, partitions))
+    model_path = train_on_partitions(cleaned, cleaned_output, model_dir)
+    if not keep_partitions:
+        cleanup_partitions(work_dir)
+    print(f"✅ DAG finished in {time.perf_counter() - start:.2f}s")
+    return model_path
+
+
+# ── Airflow wiring ───────────────────────────────────────────────────────────────
+try:
+    from airflow.decorators import dag, task
+except ImportError:
+    dag = task = None
+
+if dag is not None:
+    @dag(
+        dag_id='cricket_etl',
+        schedule=None,
+        start_date=datetime(2024, 1, 1),
+        catchup=False,
+        default_args={'retries': 1},
+        tags=['cricket', 'etl'],
+    )
+    def cricket_etl():
+        # op_args are templated: each run partitions into its own directory
+        work_dir = str(PARTITIONS_DIR / '{{ ts_nodash }}')
+        partitions = task(split_by_team)(str(RAW_DATA_PATH), work_dir)
+        cleaned = task(preprocess_partition).expand(partition_path=partitions)
+        # Runs only after training succeeded, so a failed run keeps its partitions for the retry
+        task(train_on_partitions)(cleaned) >> task(cleanup_partitions)(work_dir)
+
+    cricket_etl_dag = cricket_etl()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the cricket ETL DAG locally, without Airflow")
+    parser.add_argument('--input', default=str(RAW_DATA_PATH), help="Raw ODI CSV")
+    parser.add_argument('--work-dir', help="Directory for the team partitions (default: a new one per run)")
+    parser.add_argument('--model-dir', default=str(MODELS_DIR), help="Directory to save the model to")
+    parser.add_argument('--workers', type=int, default=None, help="Parallel preprocessing processes")
+    parser.add_argument('--keep-partitions', action='store_true',
+                        help="Keep the work directory's partitions after training")
+    args = parser.parse_args()
+    run_local(args.input, args.work_dir, args.model_dir, max_workers=args.workers,
+              keep_partitions=args.keep_partitions)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,10 +1,8 @@
-from flask import Flask, render_template_string, redirect, url_for
+from flask import Flask, render_template_string, redirect, url_for, jsonify, request, abort
 import os
 import json
 from pathlib import Path
-import subprocess
 import sys
-from datetime import datetime
 
 app = Flask(__name__)
 
@@ -14,6 +12,26 @@ AIRFLOW_DAGS_DIR = BASE_DIR / 'airflow' / 'dags'
 LOGS_DIR = BASE_DIR / 'logs'
 os.makedirs(LOGS_DIR, exist_ok=True)
 
+sys.path.insert(0, str(BASE_DIR / 'src'))
+from dag_runner import DagRunner, QUEUED, RUNNING
+from log_store import LogStore
+from run_history import RunHistory
+
+# Background executor settings
+MAX_CONCURRENT_RUNS = int(os.environ.get('DASHBOARD_WORKERS', 2))
+LOG_CHUNK_BYTES = 64 * 1024    # most log bytes returned per incremental poll or range read
+LOG_TAIL_LINES = 200           # lines shown on the details page before paging back
+
+# Run log retention and rotation (per run: at most LOG_SEGMENT_MB * LOG_MAX_SEGMENTS on disk)
+LOG_RETENTION_RUNS = int(os.environ.get('LOG_RETENTION_RUNS', 20))    # per DAG
+LOG_RETENTION_DAYS = float(os.environ.get('LOG_RETENTION_DAYS', 14))
+LOG_SEGMENT_MB = float(os.environ.get('LOG_SEGMENT_MB', 8))
+LOG_MAX_SEGMENTS = int(os.environ.get('LOG_MAX_SEGMENTS', 4))
+LOG_PAGE_LINES = int(os.environ.get('LOG_PAGE_LINES', 200))
+
+# Run history survives restarts in SQLite
+RUN_HISTORY_DB = Path(os.environ.get('DASHBOARD_DB', LOGS_DIR / 'run_history.sqlite'))
+
 # Template for the dashboard
 HTML_TEMPLATE = '''
 <!DOCTYPE html>
@@ -70,9 +88,12 @@ HTML_TEMPLATE = '''
         .failure {
             color: red;
         }
-        .running {
+        .running, .queued {
             color: orange;
         }
+        .failed {
+            color: red;
+        }
         pre {
             background-color: #f9f9f9;
             padding: 10px;
@@ -108,33 +129,92 @@ HTML_TEMPLATE = '''
         
         {% if dag_details %}
         <h2>DAG Details: {{ dag_details.id }}</h2>
+        {% if dag_details.run_id %}
+        <p>Run <code>{{ dag_details.run_id }}</code>:
+           <span id="run-status" class="{{ dag_details.status.lower() }}">{{ dag_details.status }}</span>
+           (queued {{ dag_details.queued_at }}{% if dag_details.started_at %}, started {{ dag_details.started_at }}{% endif %}{% if dag_details.finished_at %}, finished {{ dag_details.finished_at }}{% endif %})</p>
+        {% endif %}
         <h3>Log Output:</h3>
-        <pre>{{ dag_details.log }}</pre>
+        {% if dag_details.pages %}
+        <p>
+            {% if dag_details.page is not none %}Page {{ dag_details.page + 1 }} of {{ dag_details.pages }}{% else %}Last {{ tail_lines }} lines{% endif %}
+            {% if dag_details.prev_page is not none %}<a href="{{ url_for('view_dag_details', dag_id=dag_details.id, page=dag_details.prev_page) }}">&laquo; older</a>{% endif %}
+            {% if dag_details.next_page is not none %}<a href="{{ url_for('view_dag_details', dag_id=dag_details.id, page=dag_details.next_page) }}">newer &raquo;</a>{% endif %}
+            {% if dag_details.page is not none %}<a href="{{ url_for('view_dag_details', dag_id=dag_details.id) }}">tail</a>{% endif %}
+        </p>
+        {% endif %}
+        <pre id="log">{{ dag_details.log }}</pre>
+        {% if dag_details.live %}
+        <script>
+            // Follow the log while the run is queued or running
+            let offset = {{ dag_details.offset }};
+            const logUrl = "{{ url_for('run_log', run_id=dag_details.run_id) }}";
+            async function poll() {
+                const response = await fetch(logUrl + "?offset=" + offset);
+                const data = await response.json();
+                document.getElementById("log").textContent += data.text;
+                offset = data.next_offset;
+                const status = document.getElementById("run-status");
+                status.textContent = data.status;
+                status.className = data.status.toLowerCase();
+                if (data.live || data.text) {
+                    setTimeout(poll, data.text ? 0 : 1000);
+                }
+            }
+            poll();
+        </script>
+        {% endif %}
         {% endif %}
     </div>
 </body>
 </html>
 '''
 
-# Store DAG execution information
-DAG_EXECUTIONS = {}
+# Background DAG runs: bounded pool, one active and one queued run per DAG
+LOG_STORE = LogStore(
+    LOGS_DIR,
+    page_lines=LOG_PAGE_LINES,
+    segment_bytes=int(LOG_SEGMENT_MB * 1024 * 1024),
+    max_segments=LOG_MAX_SEGMENTS,
+    keep_runs=LOG_RETENTION_RUNS,
+    max_age_days=LOG_RETENTION_DAYS,
+)
+RUNNER = DagRunner(
+    command_for=lambda dag_id: [sys.executable, 'run_etl_pipeline.py'],
+    log_store=LOG_STORE,
+    max_workers=MAX_CONCURRENT_RUNS,
+    cwd=BASE_DIR,
+    store=RunHistory(RUN_HISTORY_DB),
+)
+
+# DAG discovery cache: re-listed only when the directory's mtime changes
+# (adding, removing or renaming a file updates it)
+_dag_cache = {'mtime': None, 'files': []}
 
 def get_dag_files():
     """Get all Python files in the DAGs directory"""
-    dag_files = []
-    for file in AIRFLOW_DAGS_DIR.glob('*.py'):
-        if file.name != '__init__.py':
-            dag_files.append(file)
-    return dag_files
+    try:
+        mtime = AIRFLOW_DAGS_DIR.stat().st_mtime_ns
+    except FileNotFoundError:
+        return []
+    if mtime != _dag_cache['mtime']:
+        dag_files = []
+        for file in AIRFLOW_DAGS_DIR.glob('*.py'):
+            if file.name != '__init__.py':
+                dag_files.append(file)
+        _dag_cache['files'] = sorted(dag_files)
+        _dag_cache['mtime'] = mtime
+    return _dag_cache['files']
 
 def get_dag_info():
     """Get information about available DAGs"""
     dags = []
+    latest = RUNNER.latest_per_dag()    # one query for every DAG
     for dag_file in get_dag_files():
         dag_id = dag_file.stem
-        execution_info = DAG_EXECUTIONS.get(dag_id, {})
-        last_run_at = execution_info.get('last_run_at', 'Never')
-        status = execution_info.get('status', 'Not Run')
+        run = latest.get(dag_id) or {}
+        last_run_at = run.get('finished_at') or run.get('started_at') or run.get('queued_at') or 'Never'
+        status = run.get('status', 'Not Run')
         
         dags.append({
             'id': dag_id,
@@ -144,38 +224,18 @@ def get_dag_info():
         })
     return dags
 
-def run_dag_process(dag_id):
-    """Run the DAG using the standalone ETL script and capture output"""
-    log_file = LOGS_DIR / f"{dag_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
-    
-    # Run the standalone ETL script as a subprocess
-    cmd = [sys.executable, 'run_etl_pipeline.py']
-    try:
-        with open(log_file, 'w') as f:
-            process = subprocess.run(cmd, stdout=f, stderr=subprocess.STDOUT, text=True)
-        
-        # Read the log file
-        with open(log_file, 'r') as f:
-            log = f.read()
-        
-        # Update DAG execution information
-        DAG_EXECUTIONS[dag_id] = {
-            'last_run_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            'status': 'Success' if process.returncode == 0 else 'Failed',
-            'log': log,
-            'log_file': str(log_file)
-        }
-        
-        return DAG_EXECUTIONS[dag_id]
-    except Exception as e:
-        error_message = f"Error running DAG: {str(e)}"
-        DAG_EXECUTIONS[dag_id] = {
-            'last_run_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            'status': 'Failed',
-            'log': error_message,
-            'log_file': None
-        }
-        return DAG_EXECUTIONS[dag_id]
+def run_status(run_id):
+    """(status, live) of a run; 404 if neither the runner nor the log store knows it"""
+    run = RUNNER.get(run_id)
+    if run is None:
+        if not LOG_STORE.exists(run_id):
+            abort(404)
+        return None, False    # aged out of the in-memory history, log still on disk
+    return run['status'], run['status'] in (QUEUED, RUNNING)
+
+def log_response(run_id, **fields):
+    status, live = run_status(run_id)
+    return jsonify(dict(fields, run_id=run_id, status=status, live=live))
 
 @app.route('/')
 def dashboard():
@@ -187,15 +247,68 @@ def dashboard():
 def view_dag_details(dag_id):
     """View DAG details"""
     dags = get_dag_info()
-    dag_details = DAG_EXECUTIONS.get(dag_id, {'id': dag_id, 'log': 'No execution record found'})
-    dag_details['id'] = dag_id
-    return render_template_string(HTML_TEMPLATE, dags=dags, dag_details=dag_details)
+    run = RUNNER.latest(dag_id)
+    if run is None:
+        dag_details = {'id': dag_id, 'log': 'No execution record found'}
+    else:
+        # Only the tail or one page of the log is read, never the whole file
+        run_id = run['run_id']
+        first, pages = LOG_STORE.page_count(run_id)
+        page = request.args.get('page', type=int)
+        if page is not None and first <= page < pages:
+            log, offset = LOG_STORE.read_page(run_id, page), None
+            prev_page = page - 1 if page > first else None
+            next_page = page + 1 if page + 1 < pages else None
+            live = False
+        else:
+            log, _, offset = LOG_STORE.tail(run_id, LOG_TAIL_LINES)
+            page, next_page = None, None
+            prev_page = pages - 1 if pages > 1 else None
+            live = run['status'] in (QUEUED, RUNNING)
+        dag_details = dict(run, id=dag_id, log=log, offset=offset, live=live,
+                           page=page, pages=pages, prev_page=prev_page, next_page=next_page)
+    return render_template_string(HTML_TEMPLATE, dags=dags, dag_details=dag_details, tail_lines=LOG_TAIL_LINES)
 
 @app.route('/run/<dag_id>')
 def run_dag(dag_id):
-    """Run a DAG"""
-    run_dag_process(dag_id)
+    """Queue a DAG run in the background (a trigger while one is queued is ignored)"""
+    if not any(dag_file.stem == dag_id for dag_file in get_dag_files()):
+        abort(404)
+    RUNNER.trigger(dag_id)
     return redirect(url_for('view_dag_details', dag_id=dag_id))
 
+@app.route('/api/runs/<run_id>/log')
+def run_log(run_id):
+    """Live tail: complete lines written since byte ``offset``"""
+    offset = request.args.get('offset', 0, type=int)
+    text, offset, next_offset = LOG_STORE.read_range(run_id, offset, LOG_CHUNK_BYTES)
+    return log_response(run_id, text=text, offset=offset, next_offset=next_offset)
+
+@app.route('/api/runs/<run_id>/tail')
+def run_log_tail(run_id):
+    """The last ``lines`` lines of a run's log"""
+    lines = min(request.args.get('lines', LOG_TAIL_LINES, type=int), 10 * LOG_TAIL_LINES)
+    text, offset, next_offset = LOG_STORE.tail(run_id, lines, LOG_CHUNK_BYTES)
+    return log_response(run_id, text=text, offset=offset, next_offset=next_offset)
+
+@app.route('/api/runs/<run_id>/range')
+def run_log_range(run_id):
+    """Up to ``length`` bytes of a run's log from byte ``offset``"""
+    offset = request.args.get('offset', 0, type=int)
+    length = min(request.args.get('length', LOG_CHUNK_BYTES, type=int), LOG_CHUNK_BYTES)
+    text, offset, next_offset = LOG_STORE.read_range(run_id, offset, length, whole_lines=False)
+    start, end = LOG_STORE.bounds(run_id)
+    return log_response(run_id, text=text, offset=offset, next_offset=next_offset, start=start, end=end)
+
+@app.route('/api/runs/<run_id>/pages/<int:page>')
+def run_log_page(run_id, page):
+    """One page (LOG_PAGE_LINES lines) of a run's log"""
+    first, pages = LOG_STORE.page_count(run_id)
+    text = LOG_STORE.read_page(run_id, page)
+    if text is None:
+        run_status(run_id)
+        abort(404)
+    return log_response(run_id, text=text, page=page, first_page=first, pages=pages)
+
 if __name__ == '__main__':
     app.run(debug=True, port=8080) 
\ No newline at end of file
@@ -1,12 +1,25 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import joblib
 import os
 import requests
+from requests.adapters import HTTPAdapter
 import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent / "src"))
+from linear_scorer import LinearScorer
+from feature_store import FeatureStore, derive
+from metrics import MODEL_LOAD_SECONDS, observe_latency, record_batch, record_cache, serve_metrics
+from model_registry import ModelRegistry, ModelWatcher
+from player_index import current_index
+from prediction_cache import PredictionCache
+from prediction_log import PredictionLogger, log_dir_from_env
+from schema import FEATURES
+
 # Set page configuration
 st.set_page_config(
     page_title="Cricket Performance Predictor",
@@ -16,40 +29,190 @@ st.set_page_config(
 
 # Define paths
 MODEL_PATH = Path("models") / "cricket_model.pkl"
-API_URL = "http://localhost:5050"  # Flask API URL
+SCORER_PATH = Path("models") / "cricket_model.json"  # exported coefficients (see src/export_model.py)
+REGISTRY_DIR = Path(os.environ.get("MODEL_REGISTRY", Path("models") / "registry"))  # see src/model_registry.py
+API_URL = os.environ.get("API_URL", "http://localhost:5050")  # Flask API URL
+METRICS_PORT = int(os.environ.get("METRICS_PORT", 9102))  # Prometheus scrape port of this UI process
+
+# API client settings
+API_TIMEOUT = (3.05, 10)     # (connect, read) seconds
+HEALTH_TTL = 10              # seconds a health check result is reused
+BULK_BATCH_SIZE = 256        # rows per /predict call in bulk mode
+BULK_CONCURRENCY = 4         # concurrent /predict calls in bulk mode
+
+# Direct prediction cache (the form's strike rate step is 0.1, so this is lossless)
+CACHE_SIZE = 4096
+CACHE_QUANTIZE = {"strike_rate": 0.1}
+
+# Shared keep-alive HTTP session (connection pool survives script reruns)
+@st.cache_resource
+def get_session():
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=BULK_CONCURRENCY)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"Content-Type": "application/json"})
+    return session
+
+# Prometheus endpoint for the UI process, started once
+@st.cache_resource
+def start_metrics_server():
+    try:
+        serve_metrics(METRICS_PORT)
+        return True
+    except OSError:
+        # Port taken (e.g. a second UI on the same host): run without metrics
+        return False
+
+# Registry watcher shared by all sessions: swaps in a newly promoted version in the background
+@st.cache_resource
+def get_model_watcher():
+    def on_swap(old, new):
+        MODEL_LOAD_SECONDS.labels("registry").observe(watcher.load_seconds)
+        # Predictions are cached per version, so a swap only needs to free the old entries
+        get_prediction_cache().clear()
+
+    watcher = ModelWatcher(ModelRegistry(REGISTRY_DIR), on_swap=on_swap)
+    return watcher.start()
+
+# Served (version, model): the registry's CURRENT version when there is one (never stale after a retrain)
+def current_model():
+    if ModelRegistry(REGISTRY_DIR).current() is not None:
+        return get_model_watcher().current()
+    return None, load_file_model()
 
-# Function to load model directly
 @st.cache_resource
-def load_model():
+def load_file_model():
+    # Prefer the exported linear artifact: no sklearn validation per prediction
+    start = time.perf_counter()
+    if SCORER_PATH.exists():
+        model = LinearScorer.load(SCORER_PATH)
+        MODEL_LOAD_SECONDS.labels("scorer").observe(time.perf_counter() - start)
+        return model
     if MODEL_PATH.exists():
-        return joblib.load(MODEL_PATH)
+        import joblib  # sklearn is only imported when there is no linear artifact
+        model = joblib.load(MODEL_PATH)
+        MODEL_LOAD_SECONDS.labels("file").observe(time.perf_counter() - start)
+        return model
     else:
         st.error(f"Model file not found at {MODEL_PATH}")
         return None
 
+# Prediction cache shared by all sessions; keyed on the served registry version,
+# and cleared when a model file changes
+@st.cache_resource
+def get_prediction_cache():
+    return PredictionCache(
+        max_size=CACHE_SIZE,
+        quantize=CACHE_QUANTIZE,
+        watch_paths=[SCORER_PATH, MODEL_PATH]
+    )
+
+# Feature store and player index (see src/feature_store.py, src/player_index.py)
+@st.cache_resource
+def get_feature_store():
+    return FeatureStore()
+
+def get_player_index():
+    store = get_feature_store()
+    return current_index(store) if store.exists() else None
+
+# Request/prediction log of direct predictions (see src/prediction_log.py); None when disabled
+@st.cache_resource
+def get_prediction_log():
+    log_dir = log_dir_from_env()
+    return PredictionLogger(log_dir, source="streamlit") if log_dir else None
+
+def log_predictions(path, rows, predictions):
+    prediction_log = get_prediction_log()
+    if prediction_log is not None:
+        prediction_log.log(path, rows, predictions)
+
 # Function to make API prediction
 def predict_via_api(data):
     try:
-        response = requests.post(
-            f"{API_URL}/predict", 
-            json=data,
-            headers={"Content-Type": "application/json"}
-        )
+        with observe_latency("api_client"):
+            response = get_session().post(
+                f"{API_URL}/predict", 
+                json=data,
+                timeout=API_TIMEOUT
+            )
         return response.json()
     except requests.exceptions.ConnectionError:
         st.error("Cannot connect to API. Is the Flask server running?")
         return None
+    except requests.exceptions.Timeout:
+        st.error("The API did not answer in time.")
+        return None
+
+# Health status of the API, cached for HEALTH_TTL seconds
+@st.cache_data(ttl=HEALTH_TTL, show_spinner=False)
+def check_api_health():
+    try:
+        response = get_session().get(f"{API_URL}/health", timeout=API_TIMEOUT)
+        return "healthy" if response.status_code == 200 else "unhealthy"
+    except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+        return "unreachable"
+
+# Send one batch of records to the API (runs in a worker thread, no st.* calls)
+def _post_batch(session, records):
+    with observe_latency("api_client_bulk"):
+        response = session.post(f"{API_URL}/predict", json=records, timeout=API_TIMEOUT)
+    response.raise_for_status()
+    record_batch("api_client_bulk", len(records))
+    return response.json()["predictions"]
+
+# Function to make bulk API predictions with concurrent batched calls
+def predict_bulk_via_api(df):
+    records = df[FEATURES].astype(float).to_dict(orient="records")
+    batches = [records[i:i + BULK_BATCH_SIZE] for i in range(0, len(records), BULK_BATCH_SIZE)]
+    session = get_session()
+    try:
+        with ThreadPoolExecutor(max_workers=BULK_CONCURRENCY) as executor:
+            results = list(executor.map(lambda batch: _post_batch(session, batch), batches))
+    except requests.exceptions.RequestException as e:
+        st.error(f"Bulk prediction via API failed: {e}")
+        return None
+    return [prediction for batch in results for prediction in batch]
+
+# Function to make bulk direct predictions with one vectorized call
+def predict_bulk_direct(model, df):
+    if model is None:
+        return None
+    with observe_latency("direct_bulk"):
+        predictions = model.predict(df[FEATURES])
+    record_batch("direct_bulk", len(df))
+    log_predictions("streamlit_bulk", df[FEATURES].to_numpy(dtype=float), predictions)
+    return [round(float(p), 2) for p in predictions]
 
 # Function to make direct prediction
-def predict_direct(model, data):
+def predict_direct(model, data, version=None):
     if model is None:
         return None
     
-    # Convert input to DataFrame
-    input_df = pd.DataFrame([data])
+    misses = []
+    
+    def compute(row):
+        misses.append(row)
+        record_batch("direct", 1)
+        if isinstance(model, LinearScorer):
+            # Bare dot product over the exported coefficients
+            return model.predict_one(row)
+        # Convert input to DataFrame
+        input_df = pd.DataFrame([row])
+        
+        # Make prediction
+        return float(model.predict(input_df)[0])
     
-    # Make prediction
-    prediction = model.predict(input_df)[0]
+    cache = get_prediction_cache()
+    key = (version, *cache.key(data))
+    with observe_latency("direct"):
+        prediction = cache.get(key)
+        if prediction is None:
+            prediction = compute(data)
+            cache.put(key, prediction)
+    record_cache("direct", cache, hits=1 - len(misses), misses=len(misses))
+    log_predictions("streamlit", [[data[name] for name in FEATURES]], [prediction])
     
     return {
         "predicted_runs": round(float(prediction), 2),
@@ -59,12 +222,14 @@ def predict_direct(model, data):
 
 # Main app
 def main():
+    start_metrics_server()
+    
     # Header
     st.title("🏏 Cricket Performance Predictor")
     st.markdown("### Predict a player's total runs based on performance metrics")
     
     # Model loading (for direct prediction option)
-    model = load_model()
+    model_version, model = current_model()
     
     # Sidebar for prediction mode
     prediction_mode = st.sidebar.radio(
@@ -111,7 +276,7 @@ def main():
             if prediction_mode == "Use API":
                 prediction = predict_via_api(input_data)
             else:
-                prediction = predict_direct(model, input_data)
+                prediction = predict_direct(model, input_data, model_version)
             
             if prediction:
                 # Display prediction results
@@ -134,24 +299,94 @@ def main():
                 })
                 st.bar_chart(chart_data.set_index('Metric'))
                 
-                # Win-loss ratio calculation and display
-                win_loss_ratio = matches_won / matches_lost if matches_lost > 0 else "N/A"
+                # Win-loss ratio, computed the same way as in the feature store
+                win_loss_ratio = float(derive(input_df)["win_loss_ratio"].iloc[0])
+                win_loss_ratio = "N/A" if np.isnan(win_loss_ratio) else win_loss_ratio
                 
                 # Display KPIs
                 col1, col2, col3 = st.columns(3)
                 col1.metric("Strike Rate", f"{strike_rate:.1f}")
                 col2.metric("Total Matches", total_matches_played)
                 col3.metric("Win-Loss Ratio", f"{win_loss_ratio:.2f}" if isinstance(win_loss_ratio, float) else win_loss_ratio)
+    
+    # Predict by player name or team, using the stored features of known players
+    st.markdown("---")
+    st.subheader("Predict by Player")
+    index = get_player_index()
+    if index is None:
+        st.info("Build the feature store (`make features`) to look players up by name.")
+    else:
+        col1, col2 = st.columns(2)
+        query = col1.text_input("Player name (exact, prefix or approximate)")
+        team = col2.selectbox("Team", ["All teams"] + sorted(pd.unique(index.teams)))
+        team = None if team == "All teams" else team
+        if query:
+            names = [name for name, _ in index.search(query, team=team, limit=20)]
+            rows = index.select(names) if names else []
+        elif team:
+            rows = index.select(team=team)
+        else:
+            rows = []
+        if len(rows):
+            found = index.frame(rows)
+            with st.spinner(f"Predicting {len(found):,} players..."):
+                if prediction_mode == "Use API":
+                    predictions = predict_bulk_via_api(found)
+                else:
+                    predictions = [round(float(p), 2) for p in index.predict(model, rows)]
+                    log_predictions("streamlit_players", index.features[rows], predictions)
+            if predictions is not None:
+                found["predicted_runs"] = predictions
+                st.dataframe(found[["player_name", "team", "predicted_runs"] + FEATURES])
+        elif query:
+            st.warning(f"No players match {query!r}")
+
+    # Bulk prediction from an uploaded CSV of players
+    st.markdown("---")
+    st.subheader("Bulk Prediction")
+    uploaded = st.file_uploader(
+        "Upload a CSV with columns: " + ", ".join(FEATURES),
+        type=["csv"]
+    )
+    if uploaded is not None:
+        players_df = pd.read_csv(uploaded)
+        missing = [col for col in FEATURES if col not in players_df.columns]
+        if missing:
+            st.error(f"Missing columns: {', '.join(missing)}")
+        elif st.button("Predict All Players"):
+            with st.spinner(f"Predicting {len(players_df):,} players..."):
+                if prediction_mode == "Use API":
+                    predictions = predict_bulk_via_api(players_df)
+                else:
+                    predictions = predict_bulk_direct(model, players_df)
+            
+            if predictions is not None:
+                players_df["predicted_runs"] = predictions
+                st.success(f"Predicted total runs for {len(players_df):,} players")
+                st.dataframe(players_df)
+                st.download_button(
+                    "Download Predictions",
+                    players_df.to_csv(index=False),
+                    file_name="predictions.csv",
+                    mime="text/csv"
+                )
                 
-    # Health check for API connection
+    # Direct prediction cache statistics
+    if prediction_mode == "Direct Prediction":
+        cache_stats = get_prediction_cache().stats()
+        st.sidebar.caption(
+            f"Prediction cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses "
+            f"({cache_stats['hit_rate']:.0%}), {cache_stats['evictions']} evictions"
+        )
+    
+    # Health check for API connection (cached for HEALTH_TTL seconds)
     if prediction_mode == "Use API":
-        try:
-            response = requests.get(f"{API_URL}/health")
-            if response.status_code == 200:
-                st.sidebar.success("✅ API connection is healthy")
-            else:
-                st.sidebar.error("❌ API is not responding correctly")
-        except requests.exceptions.ConnectionError:
+        health = check_api_health()
+        if health == "healthy":
+            st.sidebar.success("✅ API connection is healthy")
+        elif health == "unhealthy":
+            st.sidebar.error("❌ API is not responding correctly")
+        else:
             st.sidebar.error("❌ Cannot connect to API")
 
 if __name__ == "__main__":
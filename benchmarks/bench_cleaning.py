@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+"""
+Benchmark the vectorized strike_rate/average repair against the original
+per-row lambda from train_model.py and check that both produce identical output.
+
+Usage:
+    python benchmarks/bench_cleaning.py --rows 2000000
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR / 'src'))
+
+from cleaning import DOTTED_COLUMNS, repair_dotted_numeric  # noqa: E402
+
+RAW_DATA_PATH = BASE_DIR / 'data' / 'raw' / 'ODI_Cricket_Data.csv'
+
+
+def lambda_repair(series):
+    """The original per-row implementation"""
+    return (
+        series
+          .astype(str)
+          .apply(lambda x: x.replace(".", "", x.count(".") - 1))
+          .pipe(pd.to_numeric, errors="coerce")
+    )
+
+
+def load_scaled(rows):
+    """Tile the bundled raw CSV up to ``rows`` rows"""
+    df = pd.read_csv(RAW_DATA_PATH, dtype={col: str for col in DOTTED_COLUMNS})
+    reps = max(1, -(-rows // len(df)))
+    return pd.concat([df] * reps, ignore_index=True).iloc[:rows]
+
+
+def make_distinct(rows, seed=0):
+    """Synthetic dotted values where (almost) every row is distinct"""
+    rng = np.random.default_rng(seed)
+    groups = rng.integers(0, 1000, size=(rows, 5))
+    frame = pd.DataFrame({
+        col: pd.Series(groups[:, 0] % 10).astype(str)
+        + "." + pd.Series(groups[:, 1]).astype(str).str.zfill(3)
+        + "." + pd.Series(groups[:, 2]).astype(str).str.zfill(3)
+        + "." + pd.Series(groups[:, 3]).astype(str).str.zfill(3)
+        + "." + pd.Series(groups[:, 4]).astype(str).str.zfill(3)
+        for col in DOTTED_COLUMNS
+    })
+    return frame
+
+
+def time_call(func, series, repeat):
+    """Best-of-``repeat`` wall time of ``func(series)``"""
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(series)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark numeric column cleaning")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Rows to benchmark on")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions per implementation")
+    parser.add_argument("--distinct", action="store_true",
+                        help="Use synthetic all-distinct values instead of tiling the raw CSV")
+    args = parser.parse_args()
+
+    df = make_distinct(args.rows) if args.distinct else load_scaled(args.rows)
+    print(f"Rows: {len(df):,} ({'distinct' if args.distinct else 'tiled raw data'})")
+
+    for col in DOTTED_COLUMNS:
+        t_lambda, expected = time_call(lambda_repair, df[col], args.repeat)
+        t_vector, actual = time_call(repair_dotted_numeric, df[col], args.repeat)
+
+        identical = np.array_equal(
+            expected.to_numpy(dtype="float64"), actual.to_numpy(dtype="float64"), equal_nan=True
+        )
+        print(
+            f"{col:<12} lambda {t_lambda:8.3f}s  vectorized {t_vector:8.3f}s  "
+            f"speedup {t_lambda / t_vector:5.1f}x  identical={identical}"
+        )
+        if not identical:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
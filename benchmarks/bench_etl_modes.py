@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+"""
+Compare the ETL runner's in-process and subprocess stage execution.
+
+Each measurement runs extract -> preprocess -> train_model in a fresh
+interpreter (so both modes pay their real import cost) against a temporary
+working directory, leaving data/processed and models/ untouched.
+
+Usage:
+    python benchmarks/bench_etl_modes.py --scales 1 200
+"""
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+RAW_DATA_PATH = BASE_DIR / 'data' / 'raw' / 'ODI_Cricket_Data.csv'
+MODES = ['in-process', 'subprocess']
+
+
+def run_worker(mode, raw_path, workdir):
+    """Run the three stages once with the runner's globals pointed at ``workdir``"""
+    sys.path.insert(0, str(BASE_DIR))
+    import run_etl_pipeline as etl
+
+    workdir = Path(workdir)
+    etl.PROCESSED_DIR = workdir / 'processed'
+    etl.MODELS_DIR = workdir / 'models'
+    etl.PROCESSED_DIR.mkdir(parents=True, exist_ok=True)
+
+    in_process = mode == 'in-process'
+    raw_csv_path, df = etl.extract(raw_path)
+    cleaned_data_path, df = etl.preprocess(raw_csv_path, df, in_process)
+    etl.train_model(cleaned_data_path, df, in_process)
+
+
+def make_scaled_copy(scale, directory):
+    """Write the raw CSV tiled ``scale`` times; returns its path"""
+    import pandas as pd
+
+    path = Path(directory) / f'odi_x{scale}.csv'
+    df = pd.read_csv(RAW_DATA_PATH)
+    pd.concat([df] * scale, ignore_index=True).to_csv(path, index=False)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark in-process vs subprocess ETL stages")
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 200], help="Copies of the raw data to tile")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per mode and scale (best is reported)")
+    parser.add_argument('--worker', nargs=3, metavar=('MODE', 'RAW', 'WORKDIR'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(*args.worker)
+        return
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for scale in args.scales:
+            raw_path = RAW_DATA_PATH if scale == 1 else make_scaled_copy(scale, tmp)
+            timings = {}
+            for mode in MODES:
+                best = float('inf')
+                for _ in range(args.repeat):
+                    start = time.perf_counter()
+                    subprocess.run(
+                        [sys.executable, __file__, '--worker', mode, str(raw_path), tmp],
+                        check=True, capture_output=True
+                    )
+                    best = min(best, time.perf_counter() - start)
+                timings[mode] = best
+            speedup = timings['subprocess'] / timings['in-process']
+            print(
+                f"x{scale:<5} in-process {timings['in-process']:7.2f}s  "
+                f"subprocess {timings['subprocess']:7.2f}s  speedup {speedup:4.2f}x"
+            )
+            results.append({'scale': scale, **timings, 'speedup': speedup})
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
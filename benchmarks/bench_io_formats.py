@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+"""
+Benchmark intermediate artifact formats (CSV vs Parquet vs Feather).
+
+For each scale the cleaned ODI data is tiled, written once per format (stage
+write time), then read back in a fresh interpreter the way training reads it
+(five features plus total_runs), reporting read time and peak RSS.
+
+Usage:
+    python benchmarks/bench_io_formats.py --scales 1 100 1000
+"""
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR / 'src'))
+
+from data_io import FORMATS, artifact_path, read_frame, write_frame  # noqa: E402
+
+RAW_DATA_PATH = BASE_DIR / 'data' / 'raw' / 'ODI_Cricket_Data.csv'
+TRAIN_COLUMNS = ["strike_rate", "total_balls_faced", "total_matches_played",
+                 "matches_won", "matches_lost", "total_runs"]
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MiB.
+
+    VmHWM is read from /proc where available: unlike ru_maxrss on Linux it is
+    not inherited from the (large) parent process across fork/exec.
+    """
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_reader(path):
+    """Worker: read the training projection of ``path`` and print time and peak RSS"""
+    import pandas  # noqa: F401
+    import pyarrow.feather  # noqa: F401  (library import cost is not part of the read)
+    import pyarrow.parquet  # noqa: F401
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    df = read_frame(path, columns=TRAIN_COLUMNS)
+    elapsed = time.perf_counter() - start
+    print(json.dumps({
+        'rows': len(df),
+        'read_seconds': elapsed,
+        'peak_rss_mb': peak_rss_mb(),
+        'baseline_rss_mb': baseline,
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CSV vs columnar intermediate artifacts")
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 100, 1000], help="Copies of the raw data")
+    parser.add_argument('--formats', nargs='+', default=list(FORMATS), choices=list(FORMATS))
+    parser.add_argument('--read', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.read:
+        run_reader(args.read)
+        return
+
+    import pandas as pd
+    from preprocess import preprocess_frame
+
+    cleaned = preprocess_frame(pd.read_csv(RAW_DATA_PATH))
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for scale in args.scales:
+            df = pd.concat([cleaned] * scale, ignore_index=True)
+            for fmt in args.formats:
+                path = artifact_path(tmp, f'cleaned_x{scale}', fmt)
+                start = time.perf_counter()
+                write_frame(df, path)
+                write_seconds = time.perf_counter() - start
+
+                out = subprocess.run(
+                    [sys.executable, __file__, '--read', str(path)],
+                    check=True, capture_output=True, text=True
+                )
+                read = json.loads(out.stdout.strip().splitlines()[-1])
+                result = {
+                    'scale': scale,
+                    'format': fmt,
+                    'rows': len(df),
+                    'size_mb': path.stat().st_size / 2**20,
+                    'write_seconds': write_seconds,
+                    **read,
+                }
+                results.append(result)
+                print(
+                    f"x{scale:<5} {fmt:<8} {result['size_mb']:9.1f} MiB  write {write_seconds:7.3f}s  "
+                    f"read {read['read_seconds']:7.3f}s  peak RSS {read['peak_rss_mb']:8.1f} MiB "
+                    f"(+{read['peak_rss_mb'] - read['baseline_rss_mb']:.1f})"
+                )
+                path.unlink()
+            del df
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+"""
+Measure load time and peak memory of the raw ODI CSV with default pandas
+dtypes versus the central schema (src/schema.py), for each consumer.
+
+Every load runs in a fresh interpreter so peak RSS belongs to that load alone.
+
+Usage:
+    python benchmarks/bench_schema.py --scale 1000
+"""
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR / 'src'))
+
+from bench_io_formats import peak_rss_mb  # noqa: E402
+from schema import read_csv_kwargs, usecols  # noqa: E402
+
+RAW_DATA_PATH = BASE_DIR / 'data' / 'raw' / 'ODI_Cricket_Data.csv'
+CONSUMERS = ['extract', 'train']
+
+
+def run_loader(path, consumer, variant):
+    """Worker: load ``path`` for ``consumer`` and print time, frame size and peak RSS"""
+    import pandas as pd
+
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    if variant == 'schema':
+        df = pd.read_csv(path, **read_csv_kwargs(consumer))
+    else:
+        df = pd.read_csv(path)
+        if usecols(consumer):
+            df = df[usecols(consumer)]
+    elapsed = time.perf_counter() - start
+    print(json.dumps({
+        'load_seconds': elapsed,
+        'frame_mb': df.memory_usage(deep=True).sum() / 2**20,
+        'peak_rss_delta_mb': peak_rss_mb() - baseline,
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark default vs schema dtypes")
+    parser.add_argument('--scale', type=int, default=1000, help="Copies of the raw data to tile")
+    parser.add_argument('--load', nargs=3, metavar=('PATH', 'CONSUMER', 'VARIANT'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.load:
+        run_loader(*args.load)
+        return
+
+    import pandas as pd
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / f'odi_x{args.scale}.csv'
+        df = pd.read_csv(RAW_DATA_PATH)
+        pd.concat([df] * args.scale, ignore_index=True).to_csv(path, index=False)
+        del df
+
+        for consumer in CONSUMERS:
+            for variant in ('default', 'schema'):
+                out = subprocess.run(
+                    [sys.executable, __file__, '--load', str(path), consumer, variant],
+                    check=True, capture_output=True, text=True
+                )
+                result = {'consumer': consumer, 'variant': variant,
+                          **json.loads(out.stdout.strip().splitlines()[-1])}
+                results.append(result)
+                print(
+                    f"{consumer:<8} {variant:<8} load {result['load_seconds']:6.2f}s  "
+                    f"frame {result['frame_mb']:8.1f} MiB  peak RSS +{result['peak_rss_delta_mb']:.1f} MiB"
+                )
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
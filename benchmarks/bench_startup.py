@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+"""
+Cold-start latency of the prediction entry points.
+
+Each entry point is run end to end in a fresh interpreter several times (wall
+clock, min/median), then once more under ``python -X importtime`` to break the
+startup down by top-level package. Results are appended to a JSON-lines
+history file together with the git commit, so regressions in start time show
+up as a diff against the previous run.
+
+Usage:
+    python benchmarks/bench_startup.py --repeat 5
+    python benchmarks/bench_startup.py --no-history
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+HISTORY_PATH = BASE_DIR / 'benchmarks' / 'startup_history.jsonl'
+
+PLAYER_ARGS = ['--strike-rate', '85', '--balls-faced', '12000', '--matches', '500',
+               '--wins', '300', '--losses', '200']
+ENTRY_POINTS = {
+    'predict_cli': ['src/predict_cli.py', *PLAYER_ARGS],
+    'predict_cli_pickle': ['src/predict_cli.py', *PLAYER_ARGS, '--scorer', '/nonexistent.json'],
+    'predict_py': ['src/predict.py'],
+}
+
+
+def run_once(args, importtime=False):
+    """Run one entry point; returns (wall seconds, stderr)"""
+    cmd = [sys.executable, *(['-X', 'importtime'] if importtime else []), *args]
+    start = time.perf_counter()
+    out = subprocess.run(cmd, cwd=BASE_DIR, capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    if out.returncode != 0:
+        raise RuntimeError(f"{' '.join(args)} failed:\n{out.stderr}")
+    return elapsed, out.stderr
+
+
+def import_breakdown(stderr, top=8):
+    """Top-level packages by cumulative import time (ms) from -X importtime output"""
+    packages = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # Only un-indented entries are top-level imports; their cumulative time includes children
+        if name.startswith('  '):
+            continue
+        package = name.strip().split('.')[0]
+        packages[package] = packages.get(package, 0) + int(cumulative) / 1000
+    ranked = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]
+    return {'total_ms': round(sum(packages.values()), 1),
+            'top': [{'package': name, 'ms': round(ms, 1)} for name, ms in ranked]}
+
+
+def git_commit():
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BASE_DIR,
+                             capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def last_record(path):
+    if not path.exists():
+        return None
+    lines = [line for line in path.read_text().splitlines() if line.strip()]
+    return json.loads(lines[-1]) if lines else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cold-start latency of prediction entry points")
+    parser.add_argument('--repeat', type=int, default=5, help="Cold starts per entry point")
+    parser.add_argument('--entry', nargs='+', choices=sorted(ENTRY_POINTS), help="Entry points to run")
+    parser.add_argument('--history', default=str(HISTORY_PATH), help="JSON-lines file to append results to")
+    parser.add_argument('--no-history', action='store_true', help="Do not append to the history file")
+    args = parser.parse_args()
+
+    history = Path(args.history)
+    previous = last_record(history)
+    results = {}
+    for name in args.entry or ENTRY_POINTS:
+        run_once(ENTRY_POINTS[name])  # warm the OS page cache
+        times = [run_once(ENTRY_POINTS[name])[0] for _ in range(args.repeat)]
+        _, stderr = run_once(ENTRY_POINTS[name], importtime=True)
+        results[name] = {
+            'min_ms': round(min(times) * 1000, 1),
+            'median_ms': round(statistics.median(times) * 1000, 1),
+            'imports': import_breakdown(stderr),
+        }
+
+        delta = ''
+        if previous and name in previous.get('results', {}):
+            change = results[name]['median_ms'] - previous['results'][name]['median_ms']
+            delta = f"  ({change:+.1f} ms vs {previous.get('commit') or 'previous run'})"
+        top = ', '.join(f"{t['package']} {t['ms']:.0f}ms" for t in results[name]['imports']['top'][:4])
+        print(f"{name:<20} median {results[name]['median_ms']:7.1f} ms  min {results[name]['min_ms']:7.1f} ms"
+              f"{delta}\n{'':<20} imports {results[name]['imports']['total_ms']:.0f} ms: {top}")
+
+    record = {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'python': sys.version.split()[0],
+        'repeat': args.repeat,
+        'results': results,
+    }
+    if not args.no_history:
+        history.parent.mkdir(parents=True, exist_ok=True)
+        with open(history, 'a') as f:
+            f.write(json.dumps(record) + '\n')
+        print(f"✅ Appended to {history}")
+    print(json.dumps(record, indent=2))
+
+
+if __name__ == '__main__':
+    main()
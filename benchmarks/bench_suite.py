@@ -0,0 +1,243 @@
+#!/usr/bin/env python
+"""
+Benchmark suite for the ETL, training, model-load and prediction hot paths.
+
+A synthetic dataset with the raw ODI columns (see synthetic_data.py) is
+generated at the requested scale into a temporary directory; the ETL runner's
+output globals are pointed there, so data/processed and models/ are untouched.
+Then each benchmark is timed ``--repeat`` times:
+
+    etl.extract / etl.preprocess / etl.train_model   run_etl_pipeline stages (in-process)
+    model_load.joblib / model_load.scorer            pickle vs JSON linear artifact
+    predict.single.*                                 one row: sklearn, JSON scorer, HTTP API
+    predict.batch.*                                  all rows: sklearn, JSON scorer, score_file
+
+Results are written as JSON and compared with a stored baseline (median
+ratio per benchmark); ``--fail-on-regression`` exits 1 when any benchmark is
+slower than the baseline by more than ``--tolerance``.
+
+Usage:
+    python benchmarks/bench_suite.py --rows 100000
+    python benchmarks/bench_suite.py --rows 100000 --save-baseline
+    python benchmarks/bench_suite.py --fail-on-regression --output results.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import logging
+import platform
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+sys.path.insert(0, str(BASE_DIR / 'src'))
+
+from synthetic_data import write_synthetic  # noqa: E402
+
+BASELINE_PATH = BASE_DIR / 'benchmarks' / 'baseline.json'
+DEFAULT_TOLERANCE = 0.25
+SINGLE_ROW_CALLS = 200   # calls per timed repeat for single-row benchmarks
+
+
+def measure(fn, repeat, number=1):
+    """Per-call seconds of ``fn`` over ``repeat`` timed runs of ``number`` calls"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        times.append((time.perf_counter() - start) / number)
+    return times
+
+
+def summarize(times, number=1, rows=None):
+    result = {
+        'median_s': statistics.median(times),
+        'min_s': min(times),
+        'repeat': len(times),
+        'number': number,
+    }
+    if rows:
+        result['rows'] = rows
+        result['rows_per_s'] = rows / result['median_s']
+    return result
+
+
+def start_api(model_path, workdir):
+    """Serve the Flask API on a free localhost port from a thread; returns (url, server)
+
+    Prediction logging is off and the registry and feature store point into
+    ``workdir``, so benchmark traffic never reaches the real logs/ or models/.
+    """
+    from werkzeug.serving import make_server
+
+    from app import create_app
+    app = create_app(model_path, batch_window_ms=0, cache_size=0, registry=Path(workdir) / 'registry',
+                     feature_store=str(Path(workdir) / 'features'), prediction_log='off')
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f'http://127.0.0.1:{server.server_port}', server
+
+
+def run_suite(rows, repeat, workdir, http=True):
+    """Run every benchmark against ``rows`` synthetic rows under ``workdir``"""
+    import joblib
+
+    import run_etl_pipeline as etl
+    from batch_predict import score_file
+    from data_io import read_frame
+    from linear_scorer import LinearScorer
+    from schema import FEATURES
+
+    for name in ('run_etl_pipeline', 'app', 'model_registry', 'werkzeug'):
+        logging.getLogger(name).setLevel(logging.WARNING)
+    workdir = Path(workdir)
+    etl.PROCESSED_DIR = workdir / 'processed'
+    etl.MODELS_DIR = workdir / 'models'
+    etl.PROCESSED_DIR.mkdir(parents=True, exist_ok=True)
+    raw_path = write_synthetic(workdir / 'odi_synthetic.csv', rows)
+
+    results = {}
+    quiet = contextlib.redirect_stdout(io.StringIO())
+
+    # ── ETL stages ───────────────────────────────────────────────────────────────
+    state = {}
+
+    def extract():
+        state['raw'], _ = etl.extract(raw_path)
+
+    def preprocess():
+        state['cleaned'], _ = etl.preprocess(state['raw'])
+
+    def train():
+        with quiet:
+            state['model'], _ = etl.train_model(state['cleaned'])
+
+    results['etl.extract'] = summarize(measure(extract, repeat), rows=rows)
+    results['etl.preprocess'] = summarize(measure(preprocess, repeat), rows=rows)
+    results['etl.train_model'] = summarize(measure(train, repeat), rows=rows)
+
+    # ── Model load ───────────────────────────────────────────────────────────────
+    model_path = Path(state['model'])
+    scorer_path = model_path.with_suffix('.json')
+    results['model_load.joblib'] = summarize(measure(lambda: joblib.load(model_path), repeat))
+    results['model_load.scorer'] = summarize(measure(lambda: LinearScorer.load(scorer_path), repeat))
+
+    # ── Prediction ───────────────────────────────────────────────────────────────
+    model = joblib.load(model_path)
+    scorer = LinearScorer.load(scorer_path)
+    X = read_frame(state['cleaned'], columns=FEATURES)
+    X = X.fillna(X.mean())
+    row = X.iloc[[0]]
+    record = {name: float(value) for name, value in row.iloc[0].items()}
+
+    n = SINGLE_ROW_CALLS
+    results['predict.single.sklearn'] = summarize(measure(lambda: model.predict(row), repeat, n), n)
+    results['predict.single.scorer'] = summarize(measure(lambda: scorer.predict_one(record), repeat, n), n)
+    if http:
+        import requests
+        url, server = start_api(model_path, workdir)
+        session = requests.Session()
+        session.post(f'{url}/predict', json=record).raise_for_status()
+        results['predict.single.api_http'] = summarize(
+            measure(lambda: session.post(f'{url}/predict', json=record).raise_for_status(), repeat, n), n)
+        server.shutdown()
+
+    results['predict.batch.sklearn'] = summarize(measure(lambda: model.predict(X), repeat), rows=len(X))
+    results['predict.batch.scorer'] = summarize(measure(lambda: scorer.predict(X), repeat), rows=len(X))
+    features_path = workdir / 'features.parquet'
+    X.to_parquet(features_path, index=False)
+    results['predict.batch.score_file'] = summarize(
+        measure(lambda: score_file(model, features_path, workdir / 'scored.parquet'), repeat), rows=len(X))
+    return results
+
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Median ratio against the baseline per benchmark, flagged regression/improvement/ok"""
+    comparison = {}
+    for name, result in results.items():
+        base = baseline.get('results', {}).get(name)
+        if base is None:
+            comparison[name] = {'status': 'new'}
+            continue
+        ratio = result['median_s'] / base['median_s'] if base['median_s'] else float('inf')
+        if ratio > 1 + tolerance:
+            status = 'regression'
+        elif ratio < 1 / (1 + tolerance):
+            status = 'improvement'
+        else:
+            status = 'ok'
+        comparison[name] = {'baseline_median_s': base['median_s'], 'ratio': ratio, 'status': status}
+    return comparison
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ETL, training, model load and prediction")
+    parser.add_argument('--rows', type=int, default=100_000, help="Synthetic rows to generate")
+    parser.add_argument('--repeat', type=int, default=5, help="Timed runs per benchmark")
+    parser.add_argument('--no-http', action='store_true', help="Skip the HTTP API benchmark")
+    parser.add_argument('--baseline', default=str(BASELINE_PATH), help="Baseline JSON to compare against")
+    parser.add_argument('--save-baseline', action='store_true', help="Store these results as the new baseline")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="Allowed slowdown before a benchmark counts as a regression (0.25 = 25%%)")
+    parser.add_argument('--fail-on-regression', action='store_true', help="Exit 1 if any benchmark regressed")
+    parser.add_argument('--output', help="Write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='bench_suite_') as tmp:
+        results = run_suite(args.rows, args.repeat, tmp, http=not args.no_http)
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'rows': args.rows,
+            'repeat': args.repeat,
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+        },
+        'results': results,
+    }
+
+    baseline_path = Path(args.baseline)
+    if baseline_path.exists() and not args.save_baseline:
+        baseline = json.loads(baseline_path.read_text())
+        if baseline.get('meta', {}).get('rows') != args.rows:
+            print(f"⚠️  Baseline was recorded with {baseline['meta'].get('rows')} rows, this run used {args.rows}",
+                  file=sys.stderr)
+        report['baseline'] = str(baseline_path)
+        report['comparison'] = compare(results, baseline, args.tolerance)
+
+    for name, result in results.items():
+        line = f"{name:<28} median {result['median_s'] * 1000:10.3f} ms"
+        if 'rows_per_s' in result:
+            line += f"  {result['rows_per_s']:>14,.0f} rows/s"
+        if 'comparison' in report and 'ratio' in report['comparison'][name]:
+            cmp = report['comparison'][name]
+            line += f"  x{cmp['ratio']:.2f} vs baseline ({cmp['status']})"
+        print(line, file=sys.stderr)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + '\n')
+    else:
+        print(text)
+    if args.save_baseline:
+        baseline_path.write_text(text + '\n')
+        print(f"✅ Baseline saved to {baseline_path}", file=sys.stderr)
+
+    regressions = [n for n, c in report.get('comparison', {}).items() if c['status'] == 'regression']
+    if regressions:
+        print(f"❌ Regressions: {', '.join(regressions)}", file=sys.stderr)
+        if args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
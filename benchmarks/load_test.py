@@ -0,0 +1,352 @@
+#!/usr/bin/env python
+"""
+Open-loop load generator and latency-percentile report for the /predict API.
+
+Requests are sent on a precomputed arrival schedule (Poisson or constant rate)
+whatever the server's response times are, and each latency is measured from
+the request's *scheduled* send time. A slow server therefore shows up as queueing
+in the percentiles instead of quietly lowering the offered rate (coordinated
+omission). ``--concurrency`` caps the requests in flight. Requests that wait for
+a free worker still count the wait in their latency. Service time, measured
+from the actual send, is reported separately.
+
+Payloads are a weighted mix of single records, lists of ``--batch-size``
+records and records given by ``player_name`` (looked up in the server's
+feature store), or the requests recorded in the prediction log
+(src/prediction_log.py) replayed with their original spacing.
+
+Without ``--url`` the API (src/app.py) is started locally in a subprocess on a
+free port, with the prediction log switched off, and stopped afterwards.
+Several comma-separated ``--rate`` values run one step each, e.g. to find the
+rate where p99 breaks and size the replicas in k8s/deployment.yaml.
+
+Usage:
+    python benchmarks/load_test.py --rate 50,100,200 --duration 20 --output load_report.json
+    python benchmarks/load_test.py --url http://localhost:5050 --rate 100 --mix single=8 --mix batch=2
+    python benchmarks/load_test.py --replay logs/predictions --speed 2
+"""
+import argparse
+import json
+import os
+import random
+import shlex
+import socket
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR / 'src'))
+
+from schema import FEATURES  # noqa: E402
+
+PERCENTILES = {'p50': 50, 'p95': 95, 'p99': 99, 'p999': 99.9}
+PAYLOAD_KINDS = ('single', 'batch', 'player')
+DEFAULT_RATE = '50'
+DEFAULT_DURATION = 30.0
+DEFAULT_WARMUP = 2.0
+DEFAULT_CONCURRENCY = 64
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_BATCH_SIZE = 32
+RECORD_POOL = 10_000        # distinct synthetic records
+SERVER_START_TIMEOUT = 60.0
+
+
+# ── Local server ─────────────────────────────────────────────────────────────────
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(server_args=()):
+    """Start src/app.py on a free localhost port; returns (url, process) once /health answers"""
+    port = free_port()
+    env = {**os.environ, 'PREDICTION_LOG_DIR': 'off'}
+    process = subprocess.Popen(
+        [sys.executable, str(BASE_DIR / 'src' / 'app.py'), '--host', '127.0.0.1', '--port', str(port),
+         *server_args],
+        cwd=BASE_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    url = f'http://127.0.0.1:{port}'
+    deadline = time.monotonic() + SERVER_START_TIMEOUT
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'API exited with code {process.returncode} during startup')
+        try:
+            if requests.get(f'{url}/health', timeout=1).ok:
+                return url, process
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f'API did not become healthy within {SERVER_START_TIMEOUT:.0f}s')
+
+
+def stop_server(process):
+    process.terminate()
+    try:
+        process.wait(10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+# ── Payloads ─────────────────────────────────────────────────────────────────────
+def parse_mix(specs):
+    """['single=8', 'batch=2'] -> {'single': 0.8, 'batch': 0.2}"""
+    weights = {}
+    for spec in specs or ['single=1']:
+        kind, _, weight = spec.partition('=')
+        if kind not in PAYLOAD_KINDS:
+            raise ValueError(f'Unknown payload kind {kind!r} (expected one of {", ".join(PAYLOAD_KINDS)})')
+        weights[kind] = float(weight or 1)
+    total = sum(weights.values())
+    return {kind: weight / total for kind, weight in weights.items()}
+
+
+def synthetic_records(count, seed):
+    """Records in the ranges of the Streamlit form"""
+    rng = np.random.default_rng(seed)
+    matches = rng.integers(10, 501, count)
+    won = (matches * rng.uniform(0, 0.6, count)).astype(int)
+    lost = ((matches - won) * rng.uniform(0, 1, count)).astype(int)
+    columns = [
+        np.round(rng.uniform(50, 150, count), 1),
+        rng.integers(10, 201, count) * 100,
+        matches, won, lost,
+    ]
+    return [dict(zip(FEATURES, map(float, values))) for values in zip(*columns)]
+
+
+def file_records(path, count, seed):
+    """Up to ``count`` complete feature records sampled from a CSV/Parquet file"""
+    from data_io import read_frame
+    df = read_frame(path, columns=FEATURES).dropna()
+    if len(df) > count:
+        df = df.sample(count, random_state=seed)
+    return df.astype('float64').to_dict(orient='records')
+
+
+def store_players(store_dir=None):
+    from feature_store import STORE_DIR, FeatureStore
+    store = FeatureStore(store_dir or STORE_DIR)
+    return list(store.frame().index) if store.exists() else []
+
+
+def make_payload(kind, rng, records, players, batch_size):
+    if kind == 'batch':
+        return rng.sample(records, min(batch_size, len(records)))
+    if kind == 'player':
+        return {'player_name': rng.choice(players)}
+    return rng.choice(records)
+
+
+# ── Schedules ────────────────────────────────────────────────────────────────────
+def arrival_offsets(rate, duration, process, rng):
+    """Send times (seconds from the start) of an open-loop arrival process"""
+    if process == 'constant':
+        return np.arange(0, duration, 1 / rate).tolist()
+    offsets, t = [], rng.expovariate(rate)
+    while t < duration:
+        offsets.append(t)
+        t += rng.expovariate(rate)
+    return offsets
+
+
+def generated_schedule(rate, duration, process, mix, records, players, batch_size, seed):
+    rng = random.Random(seed)
+    kinds, weights = list(mix), list(mix.values())
+    return [
+        (offset, kind, make_payload(kind, rng, records, players, batch_size))
+        for offset in arrival_offsets(rate, duration, process, rng)
+        for kind in rng.choices(kinds, weights)
+    ]
+
+
+def replay_schedule(log_dir, speed=1.0, paths=('api',), limit=None):
+    """Logged requests with their original spacing divided by ``speed``"""
+    from prediction_log import iter_records
+    schedule, first = [], None
+    for record in iter_records(log_dir, paths=list(paths)):
+        first = record['ts'] if first is None else first
+        records = [dict(zip(record['features'], row)) for row in record['rows']]
+        kind, payload = ('single', records[0]) if len(records) == 1 else ('batch', records)
+        schedule.append(((record['ts'] - first) / speed, kind, payload))
+        if limit and len(schedule) >= limit:
+            break
+    return schedule
+
+
+# ── Load generation ──────────────────────────────────────────────────────────────
+def run_load(url, schedule, concurrency, timeout):
+    """Send ``schedule`` open-loop; returns (samples, start) with one sample per request
+
+    A sample is (kind, intended, sent, done, error) in perf_counter seconds;
+    ``error`` is None, 'http_<status>', 'timeout' or 'connection'.
+    """
+    local = threading.local()
+    samples = []
+
+    def session():
+        if not hasattr(local, 'session'):
+            local.session = requests.Session()
+            local.session.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=1))
+        return local.session
+
+    def send(kind, intended, payload):
+        sent = time.perf_counter()
+        error = None
+        try:
+            response = session().post(f'{url}/predict', json=payload, timeout=timeout)
+            if not response.ok:
+                error = f'http_{response.status_code}'
+        except requests.Timeout:
+            error = 'timeout'
+        except requests.RequestException:
+            error = 'connection'
+        samples.append((kind, intended, sent, time.perf_counter(), error))
+
+    start = time.perf_counter() + 0.1
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for offset, kind, payload in schedule:
+            intended = start + offset
+            delay = intended - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(send, kind, intended, payload)
+    return samples, start
+
+
+def percentiles_ms(seconds):
+    if not len(seconds):
+        return None
+    ms = np.asarray(seconds) * 1000
+    result = {name: round(float(np.percentile(ms, q)), 3) for name, q in PERCENTILES.items()}
+    result.update(mean=round(float(ms.mean()), 3), max=round(float(ms.max()), 3))
+    return result
+
+
+def summarize(samples, start, warmup, duration):
+    """Latency percentiles, throughput and error rates of the samples after the warmup"""
+    window_start = start + warmup
+    measured = [s for s in samples if s[1] >= window_start]
+    ok = [s for s in measured if s[4] is None]
+    errors = Counter(s[4] for s in measured if s[4] is not None)
+    last_done = max((s[3] for s in measured), default=window_start)
+    by_kind = {}
+    for kind in sorted({s[0] for s in measured}):
+        group = [s for s in measured if s[0] == kind]
+        group_ok = [s for s in group if s[4] is None]
+        by_kind[kind] = {
+            'requests': len(group),
+            'error_rate': round(1 - len(group_ok) / len(group), 6),
+            'latency_ms': percentiles_ms([s[3] - s[1] for s in group_ok]),
+        }
+    window = max(duration - warmup, 1e-9)
+    return {
+        'requests': len(measured),
+        'ok': len(ok),
+        'errors': dict(errors),
+        'error_rate': round(sum(errors.values()) / len(measured), 6) if measured else 0.0,
+        'offered_rps': round(len(measured) / window, 2),
+        'throughput_rps': round(len(ok) / max(last_done - window_start, 1e-9), 2),
+        'latency_ms': percentiles_ms([s[3] - s[1] for s in ok]),
+        'service_ms': percentiles_ms([s[3] - s[2] for s in ok]),
+        'max_send_lag_ms': round(max((s[2] - s[1] for s in measured), default=0.0) * 1000, 3),
+        'by_kind': by_kind,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Open-loop load test of the /predict API")
+    parser.add_argument('--url', help="API base URL (default: start src/app.py locally)")
+    parser.add_argument('--server-args', default='',
+                        help="Extra arguments for the locally started API, e.g. \"--cache-size 0\"")
+    parser.add_argument('--rate', default=DEFAULT_RATE,
+                        help="Requests per second; comma-separated values run one step each")
+    parser.add_argument('--duration', type=float, default=DEFAULT_DURATION, help="Seconds per rate step")
+    parser.add_argument('--warmup', type=float, default=DEFAULT_WARMUP,
+                        help="Seconds at the start of each step left out of the report")
+    parser.add_argument('--arrival', choices=['poisson', 'constant'], default='poisson', help="Arrival process")
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY, help="Maximum requests in flight")
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT, help="Per-request timeout in seconds")
+    parser.add_argument('--mix', action='append', metavar='KIND=WEIGHT',
+                        help="Payload mix over single, batch and player (repeatable; default single=1)")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help="Records per batch payload")
+    parser.add_argument('--data', help="CSV/Parquet of feature rows to sample payloads from (default: synthetic)")
+    parser.add_argument('--store', help="Feature store with the player names for player payloads")
+    parser.add_argument('--replay', metavar='LOG_DIR',
+                        help="Replay the API requests of this prediction log instead of generating load")
+    parser.add_argument('--speed', type=float, default=1.0, help="Replay speed-up factor")
+    parser.add_argument('--limit', type=int, help="Replay at most this many logged requests")
+    parser.add_argument('--seed', type=int, default=42, help="Seed for arrivals and payloads")
+    parser.add_argument('--output', help="Write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    mix = parse_mix(args.mix)
+    records = file_records(args.data, RECORD_POOL, args.seed) if args.data else synthetic_records(RECORD_POOL, args.seed)
+    players = store_players(args.store) if 'player' in mix else []
+    if 'player' in mix and not players:
+        parser.error("player payloads need a feature store (run src/feature_store.py update or pass --store)")
+
+    url, process = (args.url.rstrip('/'), None) if args.url else start_server(shlex.split(args.server_args))
+    steps = []
+    try:
+        if args.replay:
+            schedule = replay_schedule(args.replay, args.speed, limit=args.limit)
+            if not schedule:
+                parser.error(f"No API requests logged in {args.replay}")
+            duration = schedule[-1][0]
+            plans = [('replay', schedule, duration)]
+        else:
+            plans = [
+                (float(rate), generated_schedule(float(rate), args.duration, args.arrival, mix, records, players,
+                                                 args.batch_size, args.seed + i), args.duration)
+                for i, rate in enumerate(args.rate.split(','))
+            ]
+        for rate, schedule, duration in plans:
+            warmup = min(args.warmup, duration / 2)
+            samples, start = run_load(url, schedule, args.concurrency, args.timeout)
+            step = {'rate': rate, 'duration_s': duration, **summarize(samples, start, warmup, duration)}
+            steps.append(step)
+            latency = step['latency_ms'] or {}
+            print(f"rate {rate!s:>8}  {step['throughput_rps']:>9,.1f} req/s  "
+                  f"p50 {latency.get('p50', float('nan')):8.2f}  p99 {latency.get('p99', float('nan')):8.2f}  "
+                  f"p999 {latency.get('p999', float('nan')):8.2f} ms  errors {step['error_rate']:.2%}",
+                  file=sys.stderr)
+    finally:
+        if process is not None:
+            stop_server(process)
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'url': url,
+            'server': 'external' if args.url else 'local',
+            'arrival': 'replay' if args.replay else args.arrival,
+            'concurrency': args.concurrency,
+            'warmup_s': args.warmup,
+            'mix': None if args.replay else mix,
+            'batch_size': args.batch_size,
+            'latency': 'from the scheduled send time (includes queueing); service_ms from the actual send',
+        },
+        'steps': steps,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + '\n')
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
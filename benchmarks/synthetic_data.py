@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+"""
+Generate synthetic ODI player data with the columns and quirks of
+data/raw/ODI_Cricket_Data.csv, at any scale.
+
+Strike rate and average are written the way the raw export stores them
+(decimal point dropped, digits grouped by dots, e.g. "9.170.381.212.161.530";
+some averages are plain "1781.25" or "0"), and percentage as "477,93%", so the
+whole cleaning path is exercised. Output is deterministic for a given seed.
+
+Usage:
+    python benchmarks/synthetic_data.py --rows 1000000 --output /tmp/odi_1m.csv
+"""
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+TEAMS = [
+    "India", "West Indies", "Sri Lanka", "Pakistan", "England", "Australia", "South Africa",
+    "New Zealand", "Bangladesh", "Zimbabwe", "Scotland", "Netherlands", "Afghanistan", "Ireland",
+    "Kenya", "Canada", "United Arab Emirates", "Nepal", "Oman", "Namibia", "Hong Kong",
+    "Bermuda", "Papua New Guinea", "United States of America", "East Africa",
+]
+FIRST = ["A", "B", "C", "D", "F", "G", "H", "J", "K", "M", "N", "P", "R", "S", "T", "V", "W", "Y"]
+LAST = [
+    "Kohli", "Sangakkara", "Ponting", "Jayawardene", "Kallis", "Dravid", "Inzamam", "Gayle",
+    "Ganguly", "Tendulkar", "de Villiers", "Dhoni", "Root", "Williamson", "Babar", "Sharma",
+    "Taylor", "Smith", "Khan", "Ali", "Jones", "Brown", "Hossain", "Masakadza", "Coetzer",
+]
+
+
+def _dotted(values):
+    """Raw-export encoding: drop the decimal point, group digits by three with dots"""
+    out = []
+    for value in values:
+        digits = f"{value:.16g}".replace(".", "").lstrip("0") or "0"
+        out.append(f"{int(digits):,}".replace(",", "."))
+    return out
+
+
+def synthetic_odi(rows, seed=42):
+    """DataFrame with the raw ODI columns, ``rows`` long"""
+    rng = np.random.default_rng(seed)
+
+    matches = rng.integers(1, 581, rows)
+    won = (matches * rng.uniform(0.2, 0.65, rows)).astype(np.int64)
+    lost = np.minimum(matches - won, (matches * rng.uniform(0.2, 0.6, rows)).astype(np.int64))
+    balls = np.maximum(1, (matches * rng.gamma(1.2, 20, rows)).astype(np.int64))
+    strike_rate = rng.normal(80, 15, rows).clip(20, 180) + rng.random(rows)
+    runs = np.maximum(0, np.rint(balls * strike_rate / 100 + rng.normal(0, 30, rows))).astype(np.int64)
+    wickets = np.where(rng.random(rows) < 0.7, 0, rng.integers(0, 344, rows))
+    overs = np.where(wickets > 0, wickets * rng.integers(3, 40, rows), 0)
+    dismissals = np.maximum(1, (matches * rng.uniform(0.5, 0.95, rows)).astype(np.int64))
+    average = runs / dismissals
+
+    # Mix the average encodings seen in the raw export
+    kind = rng.random(rows)
+    average_text = np.where(
+        kind < 0.45, "0",
+        np.where(kind < 0.6, np.char.mod("%.2f", average), np.array(_dotted(average), dtype=object))
+    )
+
+    return pd.DataFrame({
+        "player_name": [f"{FIRST[i % len(FIRST)]} {LAST[j]}" for i, j in
+                        zip(rng.integers(0, len(FIRST), rows), rng.integers(0, len(LAST), rows))],
+        "role": "Batter",
+        "total_runs": runs,
+        "strike_rate": _dotted(strike_rate),
+        "total_balls_faced": balls,
+        "total_wickets_taken": wickets,
+        "total_runs_conceded": overs * rng.integers(3, 7, rows),
+        "total_overs_bowled": overs,
+        "total_matches_played": matches,
+        "matches_played_as_batter": matches,
+        "matches_played_as_bowler": 0,
+        "matches_won": won,
+        "matches_lost": lost,
+        "player_of_match_awards": rng.poisson(0.5, rows),
+        "team": rng.choice(TEAMS, rows),
+        "average": average_text,
+        "percentage": [f"{p:.2f}".replace(".", ",") + "%" for p in rng.uniform(0, 500, rows)],
+    })
+
+
+def write_synthetic(path, rows, seed=42):
+    """Write ``rows`` synthetic rows to a CSV at ``path``; returns the path"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    synthetic_odi(rows, seed).to_csv(path, index=False)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic ODI player data")
+    parser.add_argument("--rows", type=int, default=100_000, help="Number of rows")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    parser.add_argument("--output", required=True, help="CSV file to write")
+    args = parser.parse_args()
+    path = write_synthetic(args.output, args.rows, args.seed)
+    print(f"✅ Wrote {args.rows:,} synthetic rows to {path}")
+
+
+if __name__ == "__main__":
+    main()
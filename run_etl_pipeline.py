@@ -5,7 +5,10 @@ This script performs the same functions as the Airflow DAG but can run without A
 """
 import os
 import sys
-import pandas as pd
+import json
+import time
+import hashlib
+import argparse
 import subprocess
 from pathlib import Path
 import logging
@@ -21,95 +24,283 @@ logger = logging.getLogger(__name__)
 BASE_DIR = Path(__file__).resolve().parent
 RAW_DATA_PATH = BASE_DIR / 'data' / 'raw' / 'ODI_Cricket_Data.csv'
 PROCESSED_DIR = BASE_DIR / 'data' / 'processed'
-PREPROCESS_SCRIPT = BASE_DIR / 'src' / 'preprocess.py'
-TRAIN_SCRIPT = BASE_DIR / 'src' / 'train_model.py'
+SRC_DIR = BASE_DIR / 'src'
+PREPROCESS_SCRIPT = SRC_DIR / 'preprocess.py'
+TRAIN_SCRIPT = SRC_DIR / 'train_model.py'
+MODELS_DIR = BASE_DIR / 'models'
+STATE_PATH = PROCESSED_DIR / '.etl_state.json'
+DEFAULT_FORMAT = 'parquet'  # intermediate artifact format (see src/data_io.py)
+FORMAT_SUFFIXES = {'parquet': '.parquet', 'feather': '.feather', 'csv': '.csv'}
 
 # Ensure directories exist
 os.makedirs(PROCESSED_DIR, exist_ok=True)
 
-def extract():
-    """Extract data from source and save to intermediate location"""
-    logger.info(f"Extracting data from {RAW_DATA_PATH}")
-    
-    # Check if the raw data file exists
-    if not RAW_DATA_PATH.exists():
-        logger.error(f"Raw data file not found: {RAW_DATA_PATH}")
-        sys.exit(1)
-    
-    # Define output path
-    raw_csv_path = PROCESSED_DIR / 'raw.csv'
-    
-    # Read and save data
-    df = pd.read_csv(RAW_DATA_PATH)
-    df.to_csv(raw_csv_path, index=False)
-    logger.info(f"✅ Data extracted from {RAW_DATA_PATH} to {raw_csv_path}")
-    return str(raw_csv_path)
-
-def preprocess(raw_csv_path):
-    """Run the preprocessing script"""
-    logger.info(f"Preprocessing data from {raw_csv_path}")
-    
-    # Define output path
-    cleaned_data_path = str(PROCESSED_DIR / 'cleaned_data.csv')
-    
-    # Run the preprocessing script
-    cmd = [
-        sys.executable,
-        str(PREPROCESS_SCRIPT),
-        '--input', raw_csv_path,
-        '--output', cleaned_data_path
-    ]
-    
+# Stage modules (preprocess, train_model) are imported from src/ in in-process mode
+sys.path.insert(0, str(SRC_DIR))
+
+# Inputs and code each stage depends on, and the files it produces
+STAGE_DEPS = {
+    'extract': [RAW_DATA_PATH, SRC_DIR / 'schema.py'],
+    'preprocess': [PREPROCESS_SCRIPT, SRC_DIR / 'cleaning.py', SRC_DIR / 'data_io.py', SRC_DIR / 'schema.py'],
+    'train_model': [
+        TRAIN_SCRIPT,
+        SRC_DIR / 'schema.py',
+        SRC_DIR / 'cleaning.py',
+        SRC_DIR / 'data_io.py',
+        SRC_DIR / 'export_model.py',
+        SRC_DIR / 'linear_scorer.py',
+        SRC_DIR / 'batch_predict.py',
+        SRC_DIR / 'model_registry.py',
+        SRC_DIR / 'drift.py',
+    ],
+}
+
+def stage_outs(name, fmt=DEFAULT_FORMAT):
+    """Files a stage produces when intermediates are written as ``fmt``"""
+    if name == 'extract':
+        return [PROCESSED_DIR / f'raw{FORMAT_SUFFIXES[fmt]}']
+    if name == 'preprocess':
+        return [PROCESSED_DIR / f'cleaned_data{FORMAT_SUFFIXES[fmt]}']
+    return [MODELS_DIR / 'cricket_model.pkl', MODELS_DIR / 'cricket_model.json', MODELS_DIR / 'cricket_model.profile.json']
+
+
+class PipelineState:
+    """Stage fingerprints and (mtime, size)-keyed file hashes persisted between runs"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            data = {}
+        self.files = data.get('files', {})
+        self.stages = data.get('stages', {})
+
+    def save(self):
+        tmp_path = self.path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump({'files': self.files, 'stages': self.stages}, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    @staticmethod
+    def _stat(path):
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return [st.st_mtime_ns, st.st_size]
+
+    def file_hash(self, path):
+        """md5 of a file, recomputed only when its mtime or size changed"""
+        key = str(path)
+        stat = self._stat(path)
+        if stat is None:
+            return 'missing'
+        cached = self.files.get(key)
+        if cached and cached['stat'] == stat:
+            return cached['md5']
+        digest = hashlib.md5()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        self.files[key] = {'stat': stat, 'md5': digest.hexdigest()}
+        return self.files[key]['md5']
+
+    def fingerprint(self, name, upstream):
+        payload = {
+            'upstream': upstream,
+            'deps': {str(p.relative_to(BASE_DIR)): self.file_hash(p) for p in STAGE_DEPS[name]},
+        }
+        return hashlib.md5(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+    def is_fresh(self, name, fingerprint, outs):
+        record = self.stages.get(name)
+        if not record or record['fingerprint'] != fingerprint:
+            return False
+        return all(
+            self._stat(p) is not None and self._stat(p) == record['outs'].get(str(p))
+            for p in outs
+        )
+
+    def mark_done(self, name, fingerprint, outs):
+        self.stages[name] = {
+            'fingerprint': fingerprint,
+            'outs': {str(p): self._stat(p) for p in outs},
+        }
+        self.save()
+
+
+def run_stage(state, name, upstream, outs, func, *args, force=False):
+    """Run ``func`` unless the stage fingerprint is unchanged; returns (fingerprint, output, timing)"""
+    start = time.perf_counter()
+    fingerprint = state.fingerprint(name, upstream)
+    if not force and state.is_fresh(name, fingerprint, outs):
+        elapsed = time.perf_counter() - start
+        logger.info(f"⏭  {name}: unchanged, skipped (cache hit, {elapsed:.3f}s)")
+        return fingerprint, (str(outs[0]), None), ('cached', elapsed)
+
+    result = func(*args)
+    state.mark_done(name, fingerprint, outs)
+    elapsed = time.perf_counter() - start
+    logger.info(f"⏱  {name}: ran in {elapsed:.3f}s")
+    return fingerprint, result, ('ran', elapsed)
+
+def _run_script(cmd, description):
+    """Run a stage script in a fresh interpreter and log its output"""
     try:
         result = subprocess.run(cmd, capture_output=True, text=True, check=True)
         logger.info(result.stdout)
         
         if result.stderr:
             logger.warning(f"STDERR: {result.stderr}")
-        
-        logger.info(f"✅ Data preprocessed and saved to {cleaned_data_path}")
-        return cleaned_data_path
     except subprocess.CalledProcessError as e:
-        logger.error(f"Preprocessing failed: {e}")
+        logger.error(f"{description} failed: {e}")
         logger.error(f"STDOUT: {e.stdout}")
         logger.error(f"STDERR: {e.stderr}")
         sys.exit(1)
 
-def train_model(cleaned_data_path):
-    """Run the model training script"""
+def extract(raw_data_path=None, fmt=DEFAULT_FORMAT):
+    """Extract data from source and save to intermediate location; returns (path, DataFrame)"""
+    raw_data_path = Path(raw_data_path or RAW_DATA_PATH)
+    logger.info(f"Extracting data from {raw_data_path}")
+    
+    # Check if the raw data file exists
+    if not raw_data_path.exists():
+        logger.error(f"Raw data file not found: {raw_data_path}")
+        sys.exit(1)
+    
+    # Define output path
+    raw_path = stage_outs('extract', fmt)[0]
+    
+    # Read and save data (pandas is imported lazily so no-op runs stay fast)
+    import pandas as pd
+    from data_io import write_frame
+    from schema import read_csv_kwargs
+    df = pd.read_csv(raw_data_path, **read_csv_kwargs('extract'))
+    write_frame(df, raw_path)
+    logger.info(f"✅ Data extracted from {raw_data_path} to {raw_path}")
+    return str(raw_path), df
+
+def preprocess(raw_path, df=None, in_process=True, fmt=DEFAULT_FORMAT):
+    """Preprocess the extracted data; returns (path, DataFrame or None)"""
+    logger.info(f"Preprocessing data from {raw_path}")
+    
+    # Define output path
+    cleaned_data_path = str(stage_outs('preprocess', fmt)[0])
+    
+    if in_process:
+        # Reuse the DataFrame from extract when it is still in memory
+        from data_io import read_frame, write_frame
+        from preprocess import preprocess_frame
+        from schema import dtypes
+        if df is None:
+            df = read_frame(raw_path, dtype=dtypes('extract'))
+        df = preprocess_frame(df)
+        write_frame(df, cleaned_data_path)
+    else:
+        # Run the preprocessing script
+        cmd = [
+            sys.executable,
+            str(PREPROCESS_SCRIPT),
+            '--input', raw_path,
+            '--output', cleaned_data_path
+        ]
+        _run_script(cmd, "Preprocessing")
+        df = None
+    
+    logger.info(f"✅ Data preprocessed and saved to {cleaned_data_path}")
+    return cleaned_data_path, df
+
+def train_model(cleaned_data_path, df=None, in_process=True):
+    """Train and save the model; returns (model path, None)"""
     logger.info(f"Training model with data from {cleaned_data_path}")
     
-    # Run the training script
-    cmd = [sys.executable, str(TRAIN_SCRIPT)]
+    if in_process:
+        import train_model as trainer
+        from data_io import read_frame
+        from schema import dtypes, usecols
+        if df is None:
+            # Only the feature and target columns are read (column projection)
+            df = read_frame(cleaned_data_path, columns=usecols('train'), dtype=dtypes('train'))
+        model, mae = trainer.train(df)
+        model_path = trainer.save_model(model, MODELS_DIR, mae=mae, data_path=cleaned_data_path)
+    else:
+        # Run the training script
+        cmd = [
+            sys.executable,
+            str(TRAIN_SCRIPT),
+            '--input', cleaned_data_path,
+            '--model-dir', str(MODELS_DIR)
+        ]
+        _run_script(cmd, "Model training")
+        model_path = MODELS_DIR / 'cricket_model.pkl'
     
-    try:
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        logger.info(result.stdout)
-        
-        if result.stderr:
-            logger.warning(f"STDERR: {result.stderr}")
-        
-        logger.info("✅ Model trained successfully")
-    except subprocess.CalledProcessError as e:
-        logger.error(f"Model training failed: {e}")
-        logger.error(f"STDOUT: {e.stdout}")
-        logger.error(f"STDERR: {e.stderr}")
-        sys.exit(1)
+    logger.info("✅ Model trained successfully")
+    return str(model_path), None
+
+def export_metrics(timings, rows, metrics_file=None, pushgateway=None):
+    """Publish per-stage duration and row counts of this run for alerting"""
+    from metrics import ETL_LAST_SUCCESS, ETL_STAGE_ROWS, ETL_STAGE_SECONDS, export_etl_metrics
+    for name, (status, elapsed) in timings.items():
+        ETL_STAGE_SECONDS.labels(name, status).set(elapsed)
+    for name, count in rows.items():
+        ETL_STAGE_ROWS.labels(name).set(count)
+    ETL_LAST_SUCCESS.set_to_current_time()
+    export_etl_metrics(metrics_file, pushgateway)
+    logger.info(f"📈 Stage metrics exported to {', '.join(filter(None, [metrics_file, pushgateway]))}")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Standalone ETL pipeline runner")
+    parser.add_argument('--force', action='store_true', help="Re-run every stage even if nothing changed")
+    parser.add_argument('--mode', choices=['in-process', 'subprocess'], default='in-process',
+                        help="Run stages as in-process functions sharing DataFrames, or as isolated scripts")
+    parser.add_argument('--format', choices=list(FORMAT_SUFFIXES), default=DEFAULT_FORMAT,
+                        help="Format of the intermediate artifacts in data/processed")
+    parser.add_argument('--metrics-file', default=os.environ.get('ETL_METRICS_FILE'),
+                        help="Write per-stage Prometheus metrics to this textfile (node-exporter collector)")
+    parser.add_argument('--pushgateway', default=os.environ.get('PUSHGATEWAY_URL'),
+                        help="Push per-stage Prometheus metrics to this Pushgateway address")
+    return parser.parse_args()
 
 def main():
-    """Run the full ETL pipeline"""
-    logger.info("Starting ETL pipeline")
+    """Run the full ETL pipeline, skipping stages whose inputs and code are unchanged"""
+    args = parse_args()
+    in_process = args.mode == 'in-process'
+    logger.info(f"Starting ETL pipeline ({args.mode})")
+    pipeline_start = time.perf_counter()
+    state = PipelineState(STATE_PATH)
+    timings = {}
+    rows = {}
     
     # Extract
-    raw_csv_path = extract()
+    fingerprint, (raw_path, df), timings['extract'] = run_stage(
+        state, 'extract', None, stage_outs('extract', args.format),
+        extract, RAW_DATA_PATH, args.format, force=args.force)
+    if df is not None:
+        rows['extract'] = len(df)
     
     # Preprocess
-    cleaned_data_path = preprocess(raw_csv_path)
+    fingerprint, (cleaned_data_path, df), timings['preprocess'] = run_stage(
+        state, 'preprocess', fingerprint, stage_outs('preprocess', args.format),
+        preprocess, raw_path, df, in_process, args.format, force=args.force)
+    if df is not None:
+        rows['preprocess'] = rows['train_model'] = len(df)
     
     # Train model
-    train_model(cleaned_data_path)
+    fingerprint, _, timings['train_model'] = run_stage(
+        state, 'train_model', fingerprint, stage_outs('train_model'),
+        train_model, cleaned_data_path, df, in_process, force=args.force)
     
-    logger.info("✅ ETL pipeline completed successfully")
+    hits = sum(1 for status, _ in timings.values() if status == 'cached')
+    summary = ", ".join(f"{name} {status} {elapsed:.3f}s" for name, (status, elapsed) in timings.items())
+    logger.info(f"Stage summary: {summary}")
+    logger.info(
+        f"✅ ETL pipeline completed successfully in {time.perf_counter() - pipeline_start:.3f}s "
+        f"({hits}/{len(timings)} stages cached)"
+    )
+    if args.metrics_file or args.pushgateway:
+        export_metrics(timings, rows, args.metrics_file, args.pushgateway)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,448 @@
+# app.py
+"""
+Prediction API used by app_streamlit.py (``predict_via_api``).
+
+Concurrent /predict requests are combined by a MicroBatcher into a single
+``model.predict`` call; the batching window and maximum batch size trade a
+little latency for throughput.
+
+Models come from the registry (model_registry.py) when it has a CURRENT
+version: a new version promoted there is loaded in the background and swapped
+in without a restart. Pinned registry versions can take a share of the
+traffic (A/B) or score every request in the background for comparison only
+(shadow). With ``--model`` a single pickled model is served instead.
+
+A record may name a ``player_name`` instead of (or in addition to) giving the
+features; missing features are then taken from the feature store
+(feature_store.py), the same values the model was trained on. /players/search
+and /predict/players use the player index (player_index.py) to find players
+and to score named players or a whole team in one vectorized call.
+
+Every request's feature rows also update a DriftMonitor (drift.py) over the
+served model's training profile; /drift reports PSI/KS per feature.
+
+Requests and their predictions are appended to the prediction log
+(prediction_log.py, ``logs/predictions/requests-api-<pid>.jsonl``) by a background
+writer; set PREDICTION_LOG_DIR=off or pass ``--prediction-log off`` to disable.
+
+Usage:
+    python src/app.py --port 5050 --batch-window-ms 2 --max-batch-size 256
+    python src/app.py --ab v0003=0.1 --shadow v0004
+"""
+import argparse
+import logging
+import math
+import os
+import random
+import threading
+import time
+from pathlib import Path
+
+import joblib
+import pandas as pd
+from flask import Flask, Response, jsonify, request
+
+from metrics import MODEL_LOAD_SECONDS, latest, observe_latency, record_batch, record_cache, record_drift
+from micro_batcher import DEFAULT_MAX_BATCH_SIZE, DEFAULT_MAX_WAIT_MS, MicroBatcher
+from model_registry import REGISTRY_DIR, ModelRegistry, ModelWatcher
+from drift import DriftMonitor, profile_path
+from feature_store import KEY as PLAYER_KEY
+from feature_store import STORE_DIR, FeatureStore
+from player_index import DEFAULT_LIMIT, current_index
+from prediction_cache import DEFAULT_MAX_SIZE, PredictionCache, parse_quantize
+from prediction_log import PredictionLogger, log_dir_from_env, resolve_log_dir
+from schema import FEATURES
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# ── Configuration ────────────────────────────────────────────────────────────────
+BASE_DIR        = Path(__file__).resolve().parent
+MODEL_PATH      = Path(os.environ.get("MODEL_PATH", BASE_DIR.parent / "models" / "cricket_model.pkl"))
+PORT            = int(os.environ.get("PORT", 5050))
+BATCH_WINDOW_MS = float(os.environ.get("BATCH_WINDOW_MS", DEFAULT_MAX_WAIT_MS))
+MAX_BATCH_SIZE  = int(os.environ.get("MAX_BATCH_SIZE", DEFAULT_MAX_BATCH_SIZE))
+CACHE_SIZE      = int(os.environ.get("CACHE_SIZE", DEFAULT_MAX_SIZE))
+CACHE_TTL       = float(os.environ.get("CACHE_TTL", 0)) or None
+CACHE_QUANTIZE  = [s for s in os.environ.get("CACHE_QUANTIZE", "").split(",") if s]
+AB_VERSIONS     = [s for s in os.environ.get("AB_VERSIONS", "").split(",") if s]
+SHADOW_VERSIONS = [s for s in os.environ.get("SHADOW_VERSIONS", "").split(",") if s]
+FEATURE_STORE   = os.environ.get("FEATURE_STORE", str(STORE_DIR))
+PREDICTION_LOG  = log_dir_from_env()
+REQUEST_TIMEOUT = 10.0
+STATIC_VERSION  = "static"
+
+
+class BadRequest(ValueError):
+    """Raised for payloads that cannot be turned into feature rows"""
+
+
+def to_rows(payload, feature_store=None):
+    """Convert one record or a list of records into feature rows in model order
+
+    Features missing from a record with a ``player_name`` are looked up in
+    ``feature_store``; returns the completed records and the rows.
+    """
+    records = payload if isinstance(payload, list) else [payload]
+    if not records:
+        raise BadRequest("Empty request")
+    rows = []
+    for i, record in enumerate(records):
+        if not isinstance(record, dict):
+            raise BadRequest("Each record must be a JSON object")
+        missing = [name for name in FEATURES if name not in record]
+        if missing and PLAYER_KEY in record and feature_store is not None:
+            if not isinstance(record[PLAYER_KEY], str):
+                raise BadRequest(f"{PLAYER_KEY} must be a string")
+            stored = feature_store.get(record[PLAYER_KEY])
+            if stored is None:
+                raise BadRequest(f"Unknown player: {record[PLAYER_KEY]}")
+            record = records[i] = {**{name: stored[name] for name in missing}, **record}
+            missing = []
+        if missing:
+            raise BadRequest(f"Missing features: {', '.join(missing)}")
+        try:
+            row = [float(record[name]) for name in FEATURES]
+        except (TypeError, ValueError):
+            raise BadRequest("Feature values must be numeric")
+        if not all(math.isfinite(value) for value in row):
+            raise BadRequest("Feature values must be finite numbers")
+        rows.append(row)
+    return records, rows
+
+
+def players_query(payload):
+    """Validate a /predict/players body; returns (players, team, role)"""
+    if not isinstance(payload, dict):
+        raise BadRequest("Request body must be a JSON object")
+    names, team, role = payload.get("players"), payload.get("team"), payload.get("role")
+    if names is not None and not (isinstance(names, list) and all(isinstance(name, str) for name in names)):
+        raise BadRequest("players must be a list of player names")
+    for key, value in (("team", team), ("role", role)):
+        if value is not None and not isinstance(value, str):
+            raise BadRequest(f"{key} must be a string")
+    if names is None and not (team or role):
+        raise BadRequest("Give players, team or role")
+    return names, team, role
+
+
+def parse_ab(specs):
+    """Turn ["v0003=0.1", ...] into {"v0003": 0.1, ...}"""
+    weights = {}
+    for spec in specs or []:
+        version, _, weight = spec.partition("=")
+        weights[version] = float(weight or 0)
+        if not 0 <= weights[version] <= 1:
+            raise ValueError(f"A/B weight must be between 0 and 1: {spec}")
+    if sum(weights.values()) > 1:
+        raise ValueError("A/B weights add up to more than 1")
+    return weights
+
+
+class ShadowStats:
+    """Running agreement between shadow versions and the served predictions"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def record(self, version, served, shadow):
+        diff = [abs(float(a) - float(b)) for a, b in zip(served, shadow)]
+        with self._lock:
+            entry = self._stats.setdefault(version, {"rows": 0, "sum_abs_diff": 0.0, "max_abs_diff": 0.0})
+            entry["rows"] += len(diff)
+            entry["sum_abs_diff"] += sum(diff)
+            entry["max_abs_diff"] = max(entry["max_abs_diff"], max(diff, default=0.0))
+
+    def error(self, version):
+        with self._lock:
+            entry = self._stats.setdefault(version, {"rows": 0, "sum_abs_diff": 0.0, "max_abs_diff": 0.0})
+            entry["errors"] = entry.get("errors", 0) + 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                version: {**entry, "mean_abs_diff": entry["sum_abs_diff"] / entry["rows"] if entry["rows"] else 0.0}
+                for version, entry in self._stats.items()
+            }
+
+
+def create_app(model_path=None, batch_window_ms=BATCH_WINDOW_MS, max_batch_size=MAX_BATCH_SIZE,
+               cache_size=CACHE_SIZE, cache_ttl=CACHE_TTL, cache_quantize=CACHE_QUANTIZE,
+               registry=None, ab=AB_VERSIONS, shadow=SHADOW_VERSIONS, feature_store=FEATURE_STORE,
+               prediction_log=PREDICTION_LOG):
+    """Build the Flask app around the served model(s), shared MicroBatchers and a prediction cache
+
+    Without ``model_path`` the registry's CURRENT version is served and hot-swapped;
+    ``ab``/``shadow`` name registry versions kept resident next to it.
+    """
+    ab_weights = parse_ab(ab)
+    store = FeatureStore(feature_store) if feature_store else None
+    log_dir = resolve_log_dir(prediction_log)
+    plog = PredictionLogger(log_dir, source="api") if log_dir else None
+    registry = ModelRegistry(registry or REGISTRY_DIR)
+    if model_path is None and registry.current() is None:
+        model_path = MODEL_PATH
+
+    # Drift monitor over the served version's training profile (None without a profile)
+    drift = {"monitor": None}
+
+    def load_drift_monitor(version):
+        path = profile_path(model_path) if model_path is not None else registry.root / version / "profile.json"
+        drift["monitor"] = DriftMonitor.from_file(path, version) if path.exists() else None
+
+    cache = None
+    if cache_size > 0:
+        cache = PredictionCache(
+            max_size=cache_size,
+            ttl=cache_ttl,
+            quantize=parse_quantize(cache_quantize),
+            watch_paths=[model_path] if model_path else [],
+        )
+
+    if model_path is not None:
+        if ab_weights or shadow:
+            raise ValueError("A/B and shadow scoring need models from the registry, not --model")
+        start = time.perf_counter()
+        static_model = (STATIC_VERSION, joblib.load(model_path))
+        MODEL_LOAD_SECONDS.labels("file").observe(time.perf_counter() - start)
+        watcher = None
+        current = lambda: static_model  # noqa: E731
+        load_drift_monitor(STATIC_VERSION)
+        logger.info(f"Model loaded from {model_path}")
+    else:
+        def on_swap(old, new):
+            MODEL_LOAD_SECONDS.labels("registry").observe(watcher.load_seconds)
+            load_drift_monitor(new)
+            # Predictions are cached per version, so a swap only needs to free the old entries
+            if cache is not None:
+                cache.clear()
+
+        if ab_weights or shadow:
+            # Registry retention must not delete an arm while it is being served
+            registry.pin(*ab_weights, *shadow)
+        watcher = ModelWatcher(registry, pinned=[*ab_weights, *shadow], on_swap=on_swap)
+        watcher.start()
+        current = watcher.current
+        logger.info(f"Serving registry {registry.root} (current {watcher.current()[0]})")
+
+    def predict_current(X):
+        _, model = current()   # resolved per batch: a swap takes effect on the next batch
+        record_batch("api", len(X))
+        return model.predict(pd.DataFrame(X, columns=FEATURES))
+
+    def pinned_predictor(version):
+        model = watcher.get(version)
+        return lambda X: model.predict(pd.DataFrame(X, columns=FEATURES))
+
+    batcher = MicroBatcher(predict_current, max_batch_size=max_batch_size, max_wait_ms=batch_window_ms)
+    pinned_batchers = {
+        version: MicroBatcher(pinned_predictor(version), max_batch_size=max_batch_size, max_wait_ms=batch_window_ms)
+        for version in {*ab_weights, *shadow}
+    }
+    shadow_stats = ShadowStats()
+
+    app = Flask(__name__)
+    app.config["MODEL_PATH"] = str(model_path or registry.root)
+    app.config["BATCHER"] = batcher
+    app.config["MODEL_WATCHER"] = watcher
+    app.config["PREDICTION_LOG"] = plog
+
+    @app.route("/metrics", methods=["GET"])
+    def metrics():
+        if drift["monitor"] is not None:
+            record_drift(drift["monitor"].scores())
+        body, content_type = latest()
+        return Response(body, content_type=content_type)
+
+    @app.route("/drift", methods=["GET"])
+    def drift_report():
+        monitor = drift["monitor"]
+        if monitor is None:
+            return jsonify({"status": "error", "error": "The served model has no training profile"}), 404
+        report = monitor.scores()
+        record_drift(report)
+        return jsonify({**report, "status": "success"})
+
+    @app.route("/drift/reset", methods=["POST"])
+    def drift_reset():
+        if drift["monitor"] is not None:
+            drift["monitor"].reset()
+        return jsonify({"status": "success"})
+
+    @app.route("/health", methods=["GET"])
+    def health():
+        return jsonify({
+            "status": "healthy",
+            "model_path": str(model_path or registry.root),
+            "models": watcher.stats() if watcher else {"current": STATIC_VERSION},
+            "ab": ab_weights,
+            "shadow": shadow_stats.snapshot(),
+            "batching": batcher.stats(),
+            "cache": cache.stats() if cache else None,
+            "prediction_log": plog.stats() if plog else None,
+        })
+
+    def choose_version():
+        """Current version, or an A/B version with its configured probability"""
+        draw = random.random()
+        for version, weight in ab_weights.items():
+            if draw < weight:
+                return version, pinned_batchers[version]
+            draw -= weight
+        return current()[0], batcher
+
+    def predict_rows(rows):
+        """Serve cached rows directly and send only the misses through the batcher"""
+        version, target = choose_version()
+        if cache is None:
+            return version, [float(p) for p in target.predict(rows, timeout=REQUEST_TIMEOUT)]
+        keys = [(version, *cache.key(row)) for row in rows]
+        predictions = [cache.get(key) for key in keys]
+        misses = [i for i, value in enumerate(predictions) if value is None]
+        record_cache("api", cache, len(rows) - len(misses), len(misses))
+        if misses:
+            computed = target.predict([rows[i] for i in misses], timeout=REQUEST_TIMEOUT)
+            for i, value in zip(misses, computed):
+                predictions[i] = float(value)
+                cache.put(keys[i], predictions[i])
+        return version, predictions
+
+    def score_shadows(rows, served):
+        """Submit ``rows`` to every shadow version without waiting for the results"""
+        for version in shadow:
+            def done(future, version=version):
+                if future.exception() is not None:
+                    shadow_stats.error(version)
+                else:
+                    shadow_stats.record(version, served, future.result())
+            pinned_batchers[version].submit(rows).add_done_callback(done)
+
+    def player_index():
+        if store is None or not store.exists():
+            raise BadRequest("No feature store configured; run feature_store.py update first")
+        return current_index(store)
+
+    @app.route("/players/search", methods=["GET"])
+    def search_players():
+        try:
+            index = player_index()
+        except BadRequest as e:
+            return jsonify({"status": "error", "error": str(e)}), 400
+        matches = index.search(request.args.get("q", ""), request.args.get("team"), request.args.get("role"),
+                               request.args.get("limit", DEFAULT_LIMIT, type=int))
+        return jsonify({"players": [{"player_name": name, "score": score} for name, score in matches],
+                        "status": "success"})
+
+    @app.route("/predict/players", methods=["POST"])
+    def predict_players():
+        """Score {"players": [...]} or every player of {"team": ..., "role": ...} in one predict call"""
+        payload = request.get_json(silent=True)
+        try:
+            names, team, role = players_query({} if payload is None else payload)
+            index = player_index()
+            rows = index.select(names, team, role)
+        except BadRequest as e:
+            return jsonify({"status": "error", "error": str(e)}), 400
+        except KeyError as e:
+            return jsonify({"status": "error", "error": f"Unknown player(s): {e.args[0]}"}), 404
+
+        version, model = current()
+        if drift["monitor"] is not None and len(rows):
+            drift["monitor"].observe_frame(index.features[rows])
+        with observe_latency("api_players"):
+            predictions = index.predict(model, rows) if len(rows) else []
+        record_batch("api_players", len(rows))
+        if plog is not None and len(rows):
+            plog.log("api_players", index.features[rows], predictions, version, players=index.names[rows])
+        return jsonify({
+            "predictions": [
+                {"player_name": name, "team": team, "predicted_runs": round(float(p), 2)}
+                for name, team, p in zip(index.names[rows], index.teams[rows], predictions)
+            ],
+            "model_version": version,
+            "status": "success",
+        })
+
+    @app.route("/predict", methods=["POST"])
+    def predict():
+        payload = request.get_json(silent=True)
+        if payload is None:
+            return jsonify({"status": "error", "error": "Request body must be JSON"}), 400
+        try:
+            records, rows = to_rows(payload, store)
+        except BadRequest as e:
+            return jsonify({"status": "error", "error": str(e)}), 400
+        monitor = drift["monitor"]
+        if monitor is not None:
+            monitor.observe_rows(rows)
+
+        try:
+            with observe_latency("api"):
+                version, predictions = predict_rows(rows)
+        except Exception as e:
+            logger.exception("Prediction failed")
+            return jsonify({"status": "error", "error": str(e)}), 500
+        if shadow:
+            score_shadows(rows, predictions)
+        if plog is not None:
+            plog.log("api", rows, predictions, version)
+
+        if isinstance(payload, list):
+            return jsonify({
+                "predictions": [round(float(p), 2) for p in predictions],
+                "model_version": version,
+                "status": "success",
+            })
+        return jsonify({
+            "predicted_runs": round(float(predictions[0]), 2),
+            "input_data": records[0],
+            "model_version": version,
+            "status": "success",
+        })
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-batching prediction API")
+    parser.add_argument("--model", help="Serve this pickled model instead of the registry's CURRENT version "
+                                        f"(default when the registry is empty: {MODEL_PATH})")
+    parser.add_argument("--registry", default=str(REGISTRY_DIR), help="Model registry directory")
+    parser.add_argument("--ab", action="append", default=AB_VERSIONS, metavar="VERSION=WEIGHT",
+                        help="Send a share of requests to a registry version, e.g. v0003=0.1 (repeatable)")
+    parser.add_argument("--shadow", action="append", default=SHADOW_VERSIONS, metavar="VERSION",
+                        help="Also score every request with this version, for comparison only (repeatable)")
+    parser.add_argument("--host", default="0.0.0.0", help="Interface to bind")
+    parser.add_argument("--port", type=int, default=PORT, help="Port to listen on")
+    parser.add_argument("--batch-window-ms", type=float, default=BATCH_WINDOW_MS,
+                        help="How long to wait for more requests before predicting (0 disables waiting)")
+    parser.add_argument("--max-batch-size", type=int, default=MAX_BATCH_SIZE,
+                        help="Maximum rows per predict call (1 disables batching)")
+    parser.add_argument("--cache-size", type=int, default=CACHE_SIZE,
+                        help="Prediction cache entries (0 disables the cache)")
+    parser.add_argument("--cache-ttl", type=float, default=CACHE_TTL, help="Seconds a cached prediction stays valid")
+    parser.add_argument("--quantize", action="append", default=CACHE_QUANTIZE, metavar="FEATURE=STEP",
+                        help="Round a feature to STEP in cache keys, e.g. strike_rate=0.1 (repeatable)")
+    parser.add_argument("--feature-store", default=FEATURE_STORE,
+                        help="Feature store used to resolve records given by player_name")
+    parser.add_argument("--prediction-log", default=PREDICTION_LOG,
+                        help="Directory of the request/prediction log ('off' disables logging)")
+    args = parser.parse_args()
+
+    app = create_app(args.model, args.batch_window_ms, args.max_batch_size,
+                     args.cache_size, args.cache_ttl, args.quantize,
+                     registry=args.registry, ab=args.ab, shadow=args.shadow,
+                     feature_store=args.feature_store, prediction_log=args.prediction_log)
+    logger.info(
+        f"Serving on {args.host}:{args.port} "
+        f"(batch window {args.batch_window_ms} ms, max batch {args.max_batch_size})"
+    )
+    app.run(host=args.host, port=args.port, threaded=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+# batch_predict.py
+"""
+Chunked batch scoring for whole player populations.
+
+The input file (CSV or Parquet) is streamed in fixed-size chunks, each chunk
+goes through a single vectorized ``model.predict`` call and the results are
+appended to the output file straight away, so memory stays flat whatever the
+input size. With a PredictionLogger every scored chunk is also appended to the
+prediction log (prediction_log.py).
+"""
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from metrics import observe_latency, record_batch
+from schema import FEATURES, usecols
+
+# ── Constants ────────────────────────────────────────────────────────────────────
+PREDICTION_COLUMN  = "predicted_runs"
+DEFAULT_CHUNK_SIZE = 100_000
+PARQUET_SUFFIXES   = {".parquet", ".pq"}
+
+
+def is_parquet(path):
+    """Whether ``path`` should be treated as Parquet (by extension)"""
+    return Path(path).suffix.lower() in PARQUET_SUFFIXES
+
+
+def iter_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE, columns=None):
+    """Yield DataFrames of at most ``chunk_size`` rows from a CSV or Parquet file"""
+    if is_parquet(path):
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(path)
+        for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=columns):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, usecols=columns, chunksize=chunk_size)
+
+
+class _CsvWriter:
+    """Append chunks to a CSV file, writing the header once"""
+
+    def __init__(self, path):
+        self.path = path
+        self.header = True
+
+    def write(self, df):
+        df.to_csv(self.path, mode="w" if self.header else "a", header=self.header, index=False)
+        self.header = False
+
+    def close(self):
+        if self.header:
+            # Empty input: still leave a file with just the header behind
+            pd.DataFrame(columns=FEATURES + [PREDICTION_COLUMN]).to_csv(self.path, index=False)
+
+
+class _ParquetWriter:
+    """Append chunks as row groups of a single Parquet file"""
+
+    def __init__(self, path):
+        self.path = path
+        self.writer = None
+
+    def write(self, df):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        if self.writer is None:
+            self.writer = pq.ParquetWriter(self.path, table.schema)
+        self.writer.write_table(table)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+def open_writer(path):
+    """Return an incremental writer for ``path`` based on its extension"""
+    return _ParquetWriter(path) if is_parquet(path) else _CsvWriter(path)
+
+
+def predict_frame(model, df):
+    """Score one chunk with a single vectorized predict call"""
+    return model.predict(df[FEATURES])
+
+
+def score_file(model, input_path, output_path, chunk_size=DEFAULT_CHUNK_SIZE, prediction_log=None):
+    """Stream ``input_path`` through ``model`` into ``output_path``; return run stats"""
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    writer = open_writer(output_path)
+    rows, chunks = 0, 0
+    start = time.perf_counter()
+    try:
+        for chunk in iter_chunks(input_path, chunk_size, columns=usecols("predict")):
+            with observe_latency("batch"):
+                predictions = predict_frame(model, chunk)
+            record_batch("batch", len(chunk))
+            scored = chunk[FEATURES].assign(**{PREDICTION_COLUMN: predictions})
+            writer.write(scored)
+            if prediction_log is not None:
+                # Blocks while the log's buffer is full instead of dropping chunks
+                prediction_log.log("batch", scored[FEATURES].to_numpy(dtype="float64"), predictions,
+                                   block=True, source=str(input_path))
+            rows += len(chunk)
+            chunks += 1
+    finally:
+        writer.close()
+    elapsed = time.perf_counter() - start
+
+    return {
+        "rows": rows,
+        "chunks": chunks,
+        "seconds": elapsed,
+        "rows_per_second": rows / elapsed if elapsed > 0 else float("inf"),
+        "output": str(output_path),
+    }
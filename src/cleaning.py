@@ -0,0 +1,83 @@
+# cleaning.py
+"""
+Vectorized cleaning for the European-formatted numeric columns of the ODI data.
+
+The raw export stores values such as strike_rate "9.170.381.212.161.530",
+average "1.969.142.857.142.850" and percentage "477,93%". The repairs here
+factorize each column first, so every distinct value is cleaned once, and then
+run NumPy/pandas ops over the whole set of uniques instead of a Python call
+per row.
+"""
+import numpy as np
+import pandas as pd
+
+# ── Column groups ────────────────────────────────────────────────────────────────
+DOTTED_COLUMNS  = ["strike_rate", "average"]
+PERCENT_COLUMNS = ["percentage"]
+
+_DOT = ord(".")
+
+
+def _strip_extra_dots(values):
+    """Drop every '.' except the last one from an object array of strings"""
+    try:
+        raw = values.astype("S")
+    except UnicodeEncodeError:
+        # Non-ASCII input cannot be viewed as bytes; fall back to a regex
+        return pd.Series(values, dtype=object).astype(str).str.replace(
+            r"\.(?=[^.]*\.)", "", regex=True
+        ).to_numpy(dtype=object)
+
+    n, width = len(raw), raw.dtype.itemsize
+    if n == 0 or width == 0:
+        return raw.astype(object)
+    chars = raw.view(np.uint8).reshape(n, width)
+
+    # Mark all dots, then un-mark the last dot of each row
+    drop = chars == _DOT
+    last = width - 1 - np.argmax(drop[:, ::-1], axis=1)
+    drop[np.arange(n), last] = False
+
+    # Shift every kept byte left by the number of dropped bytes before it
+    shift = np.cumsum(drop, axis=1, dtype=np.int32).ravel()
+    kept  = np.flatnonzero(~drop)
+    out   = np.zeros(n * width, dtype=np.uint8)
+    out[kept - shift[kept]] = chars.ravel()[kept]
+    return out.view(f"S{width}").astype(object)
+
+
+def repair_dotted_numeric(series):
+    """Keep only the last '.' of each value and convert the column to float"""
+    if pd.api.types.is_numeric_dtype(series):
+        return series.astype("float64")
+    codes, uniques = pd.factorize(series, use_na_sentinel=False)
+    repaired = _strip_extra_dots(uniques.to_numpy(dtype=object))
+    values = pd.to_numeric(repaired, errors="coerce").astype("float64")
+    return pd.Series(values[codes], index=series.index, name=series.name)
+
+
+def parse_percentage(series):
+    """Convert values like '477,93%' (comma decimal, dot thousands) to float"""
+    if pd.api.types.is_numeric_dtype(series):
+        return series.astype("float64")
+    codes, uniques = pd.factorize(series, use_na_sentinel=False)
+    text = (
+        pd.Series(uniques.to_numpy(dtype=object).astype(str))
+          .str.strip()
+          .str.rstrip("%")
+          .str.replace(".", "", regex=False)
+          .str.replace(",", ".", regex=False)
+    )
+    values = pd.to_numeric(text, errors="coerce").to_numpy(dtype="float64")
+    return pd.Series(values[codes], index=series.index, name=series.name)
+
+
+def clean_numeric_columns(df, dotted=DOTTED_COLUMNS, percent=PERCENT_COLUMNS):
+    """Repair every European-formatted numeric column present in ``df`` in place"""
+    for col in dotted:
+        if col in df.columns:
+            df[col] = repair_dotted_numeric(df[col])
+    for col in percent:
+        if col in df.columns:
+            df[col] = parse_percentage(df[col])
+    return df
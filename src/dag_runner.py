@@ -0,0 +1,173 @@
+# dag_runner.py
+"""
+Background execution of dashboard DAG runs.
+
+Runs are executed on a bounded thread pool, so a request handler only queues
+work and returns. Each DAG has at most one active run and one queued run: a
+trigger while a run is queued coalesces into it instead of starting another
+overlapping pipeline. Process output is written line by line to the run's log
+in a LogStore as it is produced, so it can be followed while the run is in
+progress, and the store's retention policy is applied when a run finishes.
+All run state is kept behind one lock; readers get copies. With a RunHistory
+every state change is also written to SQLite, and finished runs are read from
+there, so history outlives the process.
+"""
+import itertools
+import subprocess
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+# ── Defaults ─────────────────────────────────────────────────────────────────────
+DEFAULT_MAX_WORKERS = 2
+DEFAULT_HISTORY     = 50    # finished runs kept per DAG
+
+QUEUED, RUNNING, SUCCESS, FAILED = "Queued", "Running", "Success", "Failed"
+
+
+def _now():
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+
+class DagRunner:
+    """Queue, de-duplicate and run DAG commands on a bounded pool of worker threads"""
+
+    def __init__(self, command_for, log_store, max_workers=DEFAULT_MAX_WORKERS, cwd=None,
+                 history=DEFAULT_HISTORY, store=None):
+        self.command_for = command_for
+        self.log_store = log_store
+        self.store = store
+        self.cwd = cwd
+        self.history = history
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="dag-run")
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._runs = {}        # run_id -> run record
+        self._active = {}      # dag_id -> run_id running or submitted to the pool
+        self._pending = {}     # dag_id -> run_id waiting for the active run
+        self._finished = {}    # dag_id -> deque of finished run_ids, newest last
+
+    # ── Triggering ───────────────────────────────────────────────────────────────
+    def trigger(self, dag_id):
+        """Queue a run of ``dag_id``; returns (run record, created)
+
+        If a run of the DAG is already waiting, that run is returned and nothing
+        new is queued.
+        """
+        with self._lock:
+            if dag_id in self._pending:
+                return dict(self._runs[self._pending[dag_id]]), False
+            stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            run_id = f"{dag_id}__{stamp}_{next(self._ids)}"
+            self._runs[run_id] = {
+                'run_id': run_id,
+                'dag_id': dag_id,
+                'status': QUEUED,
+                'queued_at': _now(),
+                'started_at': None,
+                'finished_at': None,
+                'returncode': None,
+            }
+            run = dict(self._runs[run_id])
+            self._save(run)
+            if dag_id in self._active:
+                self._pending[dag_id] = run_id
+            else:
+                self._submit(dag_id, run_id)
+            return run, True
+
+    def _submit(self, dag_id, run_id):
+        """Hand a run to the pool (called with the lock held)"""
+        self._active[dag_id] = run_id
+        self._executor.submit(self._execute, run_id)
+
+    # ── Execution ────────────────────────────────────────────────────────────────
+    def _save(self, run):
+        if self.store is not None:
+            self.store.save(run)
+
+    def _update(self, run_id, **fields):
+        with self._lock:
+            self._runs[run_id].update(fields)
+            run = dict(self._runs[run_id])
+        self._save(run)
+        return run
+
+    def _execute(self, run_id):
+        run = self._update(run_id, status=RUNNING, started_at=_now())
+        returncode, status = None, FAILED
+        try:
+            with self.log_store.writer(run_id) as log:
+                try:
+                    process = subprocess.Popen(
+                        self.command_for(run['dag_id']), cwd=self.cwd, text=True, bufsize=1,
+                        stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                    )
+                except OSError as e:
+                    log.write(f"Error running DAG: {e}\n")
+                else:
+                    # Stream output to disk line by line while the run is in progress
+                    for line in process.stdout:
+                        log.write(line)
+                    returncode = process.wait()
+                    status = SUCCESS if returncode == 0 else FAILED
+        finally:
+            self._update(run_id, status=status, returncode=returncode, finished_at=_now())
+            self._finish(run['dag_id'], run_id)
+
+    def _finish(self, dag_id, run_id):
+        """Record a finished run and start the DAG's queued run, if any"""
+        with self._lock:
+            finished = self._finished.setdefault(dag_id, deque())
+            finished.append(run_id)
+            while len(finished) > self.history:
+                self._runs.pop(finished.popleft(), None)
+            del self._active[dag_id]
+            if dag_id in self._pending:
+                self._submit(dag_id, self._pending.pop(dag_id))
+            keep = {i for i in (self._active.get(dag_id), self._pending.get(dag_id)) if i}
+        self.log_store.enforce_retention(dag_id, active=keep)
+
+    # ── Queries ──────────────────────────────────────────────────────────────────
+    def get(self, run_id):
+        with self._lock:
+            run = self._runs.get(run_id)
+            if run:
+                return dict(run)
+        return self.store.get(run_id) if self.store is not None else None
+
+    def _unfinished(self, dag_id):
+        """Queued and active runs of ``dag_id``, newest first (called with the lock held)"""
+        ids = [self._pending.get(dag_id), self._active.get(dag_id)]
+        return [dict(self._runs[i]) for i in ids if i is not None]
+
+    def runs(self, dag_id, limit=None):
+        """Runs of ``dag_id``, newest first: queued, active, then finished"""
+        with self._lock:
+            runs = self._unfinished(dag_id)
+            if self.store is None:
+                runs += [dict(self._runs[i]) for i in reversed(self._finished.get(dag_id, ()))]
+                return runs[:limit]
+        seen = {run['run_id'] for run in runs}
+        stored = self.store.runs(dag_id, limit=(limit or self.history) + len(seen))
+        return (runs + [run for run in stored if run['run_id'] not in seen])[:limit]
+
+    def latest(self, dag_id):
+        runs = self.runs(dag_id, limit=1)
+        return runs[0] if runs else None
+
+    def latest_per_dag(self):
+        """{dag_id: newest run} for every DAG that has run"""
+        if self.store is not None:
+            return self.store.latest_per_dag()   # every state change is already saved
+        latest = {}
+        with self._lock:
+            for dag_id in set(self._finished) | set(self._active) | set(self._pending):
+                runs = self._unfinished(dag_id) or [dict(self._runs[self._finished[dag_id][-1]])]
+                latest[dag_id] = runs[0]
+        return latest
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,70 @@
+# data_io.py
+"""
+Read and write the intermediate data artifacts in a typed columnar format.
+
+The format is chosen from the file extension: Parquet (``.parquet``) or Arrow
+IPC/Feather (``.feather``/``.arrow``) keep dtypes and support column projection
+and memory-mapped reads; ``.csv`` is still accepted for export and for the raw
+input.
+"""
+from pathlib import Path
+
+import pandas as pd
+
+# ── Formats ──────────────────────────────────────────────────────────────────────
+FORMATS = {
+    "parquet": ".parquet",
+    "feather": ".feather",
+    "csv": ".csv",
+}
+DEFAULT_FORMAT = "parquet"
+
+
+def format_of(path):
+    """Format name for ``path`` based on its extension"""
+    suffix = Path(path).suffix.lower()
+    if suffix in (".parquet", ".pq"):
+        return "parquet"
+    if suffix in (".feather", ".arrow"):
+        return "feather"
+    return "csv"
+
+
+def artifact_path(directory, name, fmt=DEFAULT_FORMAT):
+    """``directory/name`` with the extension of ``fmt``"""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format {fmt!r}; expected one of {', '.join(FORMATS)}")
+    return Path(directory) / f"{name}{FORMATS[fmt]}"
+
+
+def read_frame(path, columns=None, dtype=None):
+    """Read a DataFrame, loading only ``columns`` when given (memory-mapped for columnar files).
+
+    ``dtype`` only applies to CSV; columnar files already carry their types.
+    """
+    fmt = format_of(path)
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        table = pq.read_table(path, columns=columns, memory_map=True)
+        return table.to_pandas(split_blocks=True, self_destruct=True)
+    if fmt == "feather":
+        import pyarrow.feather as feather
+
+        table = feather.read_table(path, columns=columns, memory_map=True)
+        return table.to_pandas(split_blocks=True, self_destruct=True)
+    return pd.read_csv(path, usecols=columns, dtype=dtype)
+
+
+def write_frame(df, path):
+    """Write ``df`` in the format implied by the extension of ``path``"""
+    fmt = format_of(path)
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    if fmt == "parquet":
+        df.to_parquet(path, index=False)
+    elif fmt == "feather":
+        # Uncompressed Arrow IPC so reads can be memory-mapped without a decode step
+        df.reset_index(drop=True).to_feather(path, compression="uncompressed")
+    else:
+        df.to_csv(path, index=False)
+    return str(path)
@@ -0,0 +1,284 @@
+# drift.py
+"""
+Training-time feature profiles and a streaming drift monitor for serving inputs.
+
+A profile holds, per feature, a fixed-size histogram whose bin edges are the
+training quantiles (so every bin starts with roughly equal mass), plus the
+count, mean (the value missing inputs were imputed with), std, min and max.
+It is written as JSON next to the model (``cricket_model.profile.json``) and
+in each registry version (``profile.json``).
+
+``DriftMonitor`` keeps the same histograms for live traffic: one bisect and one
+counter increment per feature and row, so memory is O(bins) per feature and a
+single-row request costs a few microseconds. ``scores()`` compares the live and
+training histograms on demand with the population stability index (PSI) and
+the Kolmogorov-Smirnov distance between the binned CDFs.
+
+Usage:
+    python src/drift.py --profile models/cricket_model.profile.json --input new_players.csv
+"""
+import argparse
+import bisect
+import json
+import math
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from schema import FEATURES
+
+# ── Defaults ─────────────────────────────────────────────────────────────────────
+DEFAULT_BINS   = 20
+DEFAULT_SAMPLE_SIZE = 200_000   # values per feature kept for streamed bin edges
+PSI_EPSILON    = 1e-4     # floor for empty bins in the PSI log ratio
+PSI_WARN       = 0.1      # commonly used thresholds: < 0.1 stable, > 0.25 major shift
+PSI_ALERT      = 0.25
+PROFILE_SUFFIX = ".profile.json"
+
+
+def profile_path(model_path):
+    """``models/cricket_model.pkl`` -> ``models/cricket_model.profile.json``"""
+    model_path = Path(model_path)
+    return model_path.with_name(model_path.stem + PROFILE_SUFFIX)
+
+
+# ── Training profile ─────────────────────────────────────────────────────────────
+def build_profile(X, bins=DEFAULT_BINS):
+    """Quantile-binned histogram and summary statistics of every feature column of ``X``"""
+    features = {}
+    for name in FEATURES:
+        values = np.asarray(X[name], dtype="float64")
+        present = values[~np.isnan(values)]
+        if len(present):
+            inner = np.unique(np.quantile(present, np.arange(1, bins) / bins))
+        else:
+            inner = np.array([])
+        counts = np.bincount(np.searchsorted(inner, present, side="right"), minlength=len(inner) + 1)
+        features[name] = {
+            "edges": inner.tolist(),
+            "counts": counts.tolist(),
+            "count": int(len(present)),
+            "missing": int(len(values) - len(present)),
+            "mean": float(present.mean()) if len(present) else None,
+            "std": float(present.std()) if len(present) else None,
+            "min": float(present.min()) if len(present) else None,
+            "max": float(present.max()) if len(present) else None,
+        }
+    return {"features": features, "bins": bins}
+
+
+class ProfileBuilder:
+    """``build_profile`` over a stream of chunks, in two passes
+
+    Pass 1 (``add_edges``) keeps a uniform sample of at most ``sample_size``
+    values per feature (each value gets a random key; the lowest keys are kept)
+    and takes the bin edges from its quantiles, exact when the data fits in the
+    sample. Pass 2 (``add``) counts the rows into those bins and merges count,
+    mean, variance, min and max per chunk, so memory stays bounded whatever the
+    input size.
+    """
+
+    def __init__(self, bins=DEFAULT_BINS, sample_size=DEFAULT_SAMPLE_SIZE, seed=0):
+        self.bins = bins
+        self.sample_size = sample_size
+        self._rng = np.random.default_rng(seed)
+        self._samples = {name: (np.empty(0), np.empty(0)) for name in FEATURES}   # (keys, values)
+        self._stats = None
+
+    def add_edges(self, X):
+        """Pass 1: merge one chunk into the per-feature samples"""
+        for name in FEATURES:
+            values = np.asarray(X[name], dtype="float64")
+            present = values[~np.isnan(values)]
+            keys = np.concatenate([self._samples[name][0], self._rng.random(len(present))])
+            values = np.concatenate([self._samples[name][1], present])
+            if len(keys) > self.sample_size:
+                kept = np.argpartition(keys, self.sample_size - 1)[:self.sample_size]
+                keys, values = keys[kept], values[kept]
+            self._samples[name] = (keys, values)
+
+    def _start_counting(self):
+        self._stats = {}
+        for name in FEATURES:
+            sample = self._samples[name][1]
+            edges = np.unique(np.quantile(sample, np.arange(1, self.bins) / self.bins)) if len(sample) else np.array([])
+            self._stats[name] = {"edges": edges, "counts": np.zeros(len(edges) + 1, dtype=np.int64),
+                                 "count": 0, "missing": 0, "mean": 0.0, "m2": 0.0,
+                                 "min": np.inf, "max": -np.inf}
+        self._samples = None
+
+    def add(self, X):
+        """Pass 2: count one chunk into the bins and merge its moments"""
+        if self._stats is None:
+            self._start_counting()
+        for name in FEATURES:
+            entry = self._stats[name]
+            values = np.asarray(X[name], dtype="float64")
+            present = values[~np.isnan(values)]
+            entry["missing"] += len(values) - len(present)
+            if not len(present):
+                continue
+            entry["counts"] += np.bincount(np.searchsorted(entry["edges"], present, side="right"),
+                                           minlength=len(entry["edges"]) + 1)
+            # Chan et al. merge of (count, mean, M2)
+            n, m = entry["count"], len(present)
+            mean = present.mean()
+            delta = mean - entry["mean"]
+            entry["m2"] += ((present - mean) ** 2).sum() + delta * delta * n * m / (n + m)
+            entry["mean"] += delta * m / (n + m)
+            entry["count"] = n + m
+            entry["min"] = min(entry["min"], float(present.min()))
+            entry["max"] = max(entry["max"], float(present.max()))
+
+    def profile(self):
+        """The profile in ``build_profile`` form"""
+        if self._stats is None:
+            self._start_counting()
+        features = {}
+        for name, entry in self._stats.items():
+            count = entry["count"]
+            features[name] = {
+                "edges": entry["edges"].tolist(),
+                "counts": entry["counts"].tolist(),
+                "count": int(count),
+                "missing": int(entry["missing"]),
+                "mean": float(entry["mean"]) if count else None,
+                "std": float(math.sqrt(entry["m2"] / count)) if count else None,
+                "min": entry["min"] if count else None,
+                "max": entry["max"] if count else None,
+            }
+        return {"features": features, "bins": self.bins}
+
+
+def save_profile(profile, path):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(profile, indent=2))
+    return path
+
+
+def load_profile(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+# ── Drift scores ─────────────────────────────────────────────────────────────────
+def psi(expected, actual, epsilon=PSI_EPSILON):
+    """Population stability index between two histograms over the same bins"""
+    e_total, a_total = sum(expected), sum(actual)
+    if not e_total or not a_total:
+        return None
+    score = 0.0
+    for e, a in zip(expected, actual):
+        p, q = max(e / e_total, epsilon), max(a / a_total, epsilon)
+        score += (q - p) * math.log(q / p)
+    return score
+
+
+def ks(expected, actual):
+    """Largest gap between the binned CDFs of two histograms"""
+    e_total, a_total = sum(expected), sum(actual)
+    if not e_total or not a_total:
+        return None
+    gap = e_cum = a_cum = 0.0
+    for e, a in zip(expected, actual):
+        e_cum += e / e_total
+        a_cum += a / a_total
+        gap = max(gap, abs(e_cum - a_cum))
+    return gap
+
+
+def status_of(score):
+    if score is None:
+        return "no data"
+    return "alert" if score >= PSI_ALERT else "warn" if score >= PSI_WARN else "ok"
+
+
+# ── Streaming monitor ────────────────────────────────────────────────────────────
+class DriftMonitor:
+    """Live histograms over the training profile's bins, scored against it on demand"""
+
+    def __init__(self, profile, version=None):
+        self.profile = profile
+        self.version = version
+        self._edges = [profile["features"][name]["edges"] for name in FEATURES]
+        self._lock = threading.Lock()
+        self.reset()
+
+    @classmethod
+    def from_file(cls, path, version=None):
+        return cls(load_profile(path), version)
+
+    def reset(self):
+        with self._lock:
+            self._counts = [[0] * (len(edges) + 1) for edges in self._edges]
+            self._missing = [0] * len(FEATURES)
+            self._rows = 0
+
+    def observe_rows(self, rows):
+        """Count feature rows (sequences in FEATURES order) on the request path"""
+        edges, counts, missing = self._edges, self._counts, self._missing
+        with self._lock:
+            for row in rows:
+                for i, value in enumerate(row):
+                    if value != value:   # NaN
+                        missing[i] += 1
+                    else:
+                        counts[i][bisect.bisect_right(edges[i], value)] += 1
+            self._rows += len(rows)
+
+    def observe_frame(self, X):
+        """Count a DataFrame/array batch with one vectorized pass per feature"""
+        X = np.asarray(X[FEATURES] if hasattr(X, "columns") else X, dtype="float64")
+        with self._lock:
+            for i, edges in enumerate(self._edges):
+                column = X[:, i]
+                present = column[~np.isnan(column)]
+                self._missing[i] += len(column) - len(present)
+                binned = np.bincount(np.searchsorted(edges, present, side="right"), minlength=len(edges) + 1)
+                self._counts[i] = [a + int(b) for a, b in zip(self._counts[i], binned)]
+            self._rows += len(X)
+
+    def scores(self):
+        """Per-feature PSI, KS, live vs. training mean and status"""
+        with self._lock:
+            counts = [list(c) for c in self._counts]
+            missing, rows = list(self._missing), self._rows
+        result = {}
+        for i, name in enumerate(FEATURES):
+            train = self.profile["features"][name]
+            live = counts[i]
+            score = psi(train["counts"], live)
+            live_total = sum(live)
+            result[name] = {
+                "psi": score,
+                "ks": ks(train["counts"], live),
+                "status": status_of(score),
+                "live_rows": live_total,
+                "live_missing": missing[i],
+                "train_mean": train["mean"],
+                "live_bin_share": [round(c / live_total, 4) for c in live] if live_total else None,
+            }
+        return {"rows": rows, "model_version": self.version, "features": result}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Drift of a file of feature rows against a training profile")
+    parser.add_argument("--profile", required=True, help="Training profile JSON (next to the model)")
+    parser.add_argument("--input", required=True, help="CSV/Parquet file with the feature columns")
+    args = parser.parse_args()
+
+    from batch_predict import iter_chunks
+    monitor = DriftMonitor.from_file(args.profile)
+    for chunk in iter_chunks(args.input, columns=FEATURES):
+        monitor.observe_frame(chunk)
+    report = monitor.scores()
+    for name, entry in report["features"].items():
+        psi_text = "n/a" if entry["psi"] is None else f"{entry['psi']:.4f}"
+        ks_text = "n/a" if entry["ks"] is None else f"{entry['ks']:.4f}"
+        print(f"{name:<22} PSI {psi_text:>8}  KS {ks_text:>7}  {entry['status']}")
+
+
+if __name__ == "__main__":
+    main()
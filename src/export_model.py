@@ -0,0 +1,125 @@
+# export_model.py
+"""
+Export the trained LinearRegression to the compact JSON artifact read by
+linear_scorer.LinearScorer, and verify that both give the same predictions.
+
+Usage:
+    python src/export_model.py                 # export models/cricket_model.pkl
+    python src/export_model.py --check         # export, then run the parity check
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+import joblib
+import numpy as np
+
+from linear_scorer import ARTIFACT_PATH, LinearScorer
+from schema import FEATURES, read_csv_kwargs
+
+# ── Paths ────────────────────────────────────────────────────────────────────────
+BASE_DIR      = Path(__file__).resolve().parent
+MODEL_PATH    = BASE_DIR.parent / "models" / "cricket_model.pkl"
+RAW_DATA_PATH = BASE_DIR.parent / "data" / "raw" / "ODI_Cricket_Data.csv"
+
+
+def is_linear(model):
+    """True if ``model`` (or the last step of a Pipeline) is a fitted linear model"""
+    estimator = model.steps[-1][1] if hasattr(model, "steps") else model
+    return hasattr(estimator, "coef_") and hasattr(estimator, "intercept_")
+
+
+def linear_terms(model):
+    """(features, coef, intercept) of a linear model or a sweep Pipeline of one
+
+    Pipelines from sweep.py may put a passthrough column selection and a
+    StandardScaler in front of the regressor; both are folded into the
+    coefficients so the artifact still scores the raw FEATURES.
+    """
+    if not is_linear(model):
+        raise TypeError(f"{type(model).__name__} is not a fitted linear model")
+    steps = [step for _, step in model.steps] if hasattr(model, "steps") else [model]
+    estimator = steps[-1]
+    coef = np.ravel(estimator.coef_).astype(float)
+    intercept = float(np.ravel(estimator.intercept_)[0])
+    features = list(getattr(estimator, "feature_names_in_", FEATURES))
+
+    for step in reversed(steps[:-1]):
+        if hasattr(step, "scale_"):          # StandardScaler
+            scale = np.where(step.scale_ == 0, 1.0, step.scale_)
+            coef = coef / scale
+            intercept -= float(np.dot(step.mean_, coef))
+        elif hasattr(step, "transformers_"):  # passthrough column selection
+            selected = list(step.get_feature_names_out())
+            features = list(step.feature_names_in_)
+            full = np.zeros(len(features))
+            for name, c in zip(selected, coef):
+                full[features.index(name)] = c
+            coef = full
+        else:
+            raise TypeError(f"Cannot fold pipeline step {type(step).__name__} into a linear artifact")
+    return features, coef, intercept
+
+
+def export_linear_model(model, path=ARTIFACT_PATH):
+    """Write the feature order, coefficients and intercept of ``model`` to JSON"""
+    features, coef, intercept = linear_terms(model)
+    estimator = model.steps[-1][1] if hasattr(model, "steps") else model
+    payload = {
+        "model_type": type(estimator).__name__,
+        "features": [str(name) for name in features],
+        "coef": [float(c) for c in coef],
+        "intercept": intercept,
+    }
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(payload, f, indent=2)
+    return path
+
+
+def check_parity(model, scorer, X, rtol=1e-9, atol=1e-6):
+    """Compare ``scorer`` against ``model.predict`` on ``X``; return the max abs error"""
+    expected = model.predict(X)
+    batch    = scorer.predict(X)
+    single   = np.array([scorer.predict_one(row) for row in X[scorer.features].to_numpy()])
+    for name, actual in (("batch", batch), ("single-row", single)):
+        if not np.allclose(expected, actual, rtol=rtol, atol=atol):
+            worst = float(np.max(np.abs(expected - actual)))
+            raise AssertionError(f"{name} scorer differs from model.predict (max abs error {worst})")
+    return float(max(np.max(np.abs(expected - batch)), np.max(np.abs(expected - single))))
+
+
+def load_check_data(path=RAW_DATA_PATH):
+    """Cleaned feature matrix from the raw data, imputed the same way as in training"""
+    import pandas as pd
+    from cleaning import clean_numeric_columns
+
+    df = clean_numeric_columns(pd.read_csv(path, **read_csv_kwargs("train")))
+    return df[FEATURES].fillna(df[FEATURES].mean())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the linear model to a NumPy-only artifact")
+    parser.add_argument("--model", default=str(MODEL_PATH), help="Path to the joblib model")
+    parser.add_argument("--output", default=str(ARTIFACT_PATH), help="Path of the JSON artifact")
+    parser.add_argument("--check", action="store_true", help="Verify parity with model.predict on the raw data")
+    args = parser.parse_args()
+
+    model = joblib.load(args.model)
+    path = export_linear_model(model, args.output)
+    print(f"✅ Linear model exported to: {path}")
+
+    if args.check:
+        scorer = LinearScorer.load(path)
+        try:
+            max_error = check_parity(model, scorer, load_check_data())
+        except AssertionError as e:
+            print(f"❌ Parity check failed: {e}")
+            sys.exit(1)
+        print(f"✅ Parity check passed (max abs error {max_error:.3g})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+# feature_store.py
+"""
+Per-player feature store shared by training and serving.
+
+One row per ``player_name`` in ``data/features/player_features.parquet`` with
+the cleaned model features (mean-imputed where the raw value was missing), the
+target, team/role and derived features (runs per ball, balls per match, win
+ratio, win/loss ratio). ``missing`` is a bitmask of the features that were
+imputed, so imputed values can be refreshed when the means move, and
+``row_hash`` fingerprints the raw row a player's features came from.
+
+``update`` is incremental: incoming raw rows whose hash matches the stored one
+are skipped, and only new or changed rows are cleaned and derived; existing
+players keep their position, new ones are appended. Training reads the
+features and target straight from the store (same rows, order and imputation
+as ``train_model.prepare`` on the same raw data), and the API and UI look
+players up by name, so both sides use identical values.
+
+Usage:
+    python src/feature_store.py update --input data/raw/ODI_Cricket_Data.csv
+    python src/feature_store.py show "V Kohli"
+"""
+import argparse
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from cleaning import clean_numeric_columns
+from data_io import read_frame
+from schema import FEATURES, RAW_COLUMNS, TARGET, dtypes
+
+# ── Paths ────────────────────────────────────────────────────────────────────────
+BASE_DIR   = Path(__file__).resolve().parent
+STORE_DIR  = Path(os.environ.get("FEATURE_STORE", BASE_DIR.parent / "data" / "features"))
+STORE_FILE = "player_features.parquet"
+META_FILE  = "meta.json"
+
+# ── Columns ──────────────────────────────────────────────────────────────────────
+KEY        = "player_name"
+ATTRIBUTES = ["team", "role"]
+DERIVED    = ["runs_per_ball", "balls_per_match", "win_ratio", "win_loss_ratio"]
+COLUMNS    = [KEY, *ATTRIBUTES, *FEATURES, TARGET, *DERIVED, "missing", "row_hash"]
+MISSING_BIT = {name: 1 << i for i, name in enumerate(FEATURES)}
+
+
+def _ratio(numerator, denominator):
+    """Element-wise ratio with NaN where the denominator is 0 or missing"""
+    numerator = np.asarray(numerator, dtype="float64")
+    denominator = np.asarray(denominator, dtype="float64")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(denominator > 0, numerator / denominator, np.nan)
+
+
+def derive(df):
+    """Derived features of cleaned rows (those whose inputs are present in ``df``)"""
+    out = pd.DataFrame(index=df.index)
+    if TARGET in df and "total_balls_faced" in df:
+        out["runs_per_ball"] = _ratio(df[TARGET], df["total_balls_faced"])
+    if "total_balls_faced" in df and "total_matches_played" in df:
+        out["balls_per_match"] = _ratio(df["total_balls_faced"], df["total_matches_played"])
+    if "matches_won" in df and "total_matches_played" in df:
+        out["win_ratio"] = _ratio(df["matches_won"], df["total_matches_played"])
+    if "matches_won" in df and "matches_lost" in df:
+        out["win_loss_ratio"] = _ratio(df["matches_won"], df["matches_lost"])
+    return out
+
+
+def row_hashes(raw):
+    """uint64 fingerprint of each raw row (over the raw columns it has)
+
+    Counts hash as float64 and text as object, so the same row read from CSV
+    (int64/object) or with the schema dtypes (float32/category) hashes the same.
+    """
+    columns = [col for col in RAW_COLUMNS if col in raw.columns]
+    normalized = {
+        col: raw[col].astype("float64") if pd.api.types.is_numeric_dtype(raw[col]) else raw[col].astype(object)
+        for col in columns
+    }
+    return pd.util.hash_pandas_object(pd.DataFrame(normalized), index=False).to_numpy()
+
+
+def build_rows(raw, hashes=None):
+    """Store rows (imputation still pending) for cleaned copies of ``raw``"""
+    df = clean_numeric_columns(raw.copy())
+    rows = pd.DataFrame({KEY: df[KEY].astype(object).to_numpy()}, index=df.index)
+    for col in ATTRIBUTES:
+        rows[col] = df[col].astype(object).to_numpy() if col in df else None
+    missing = np.zeros(len(df), dtype="int64")
+    for name in FEATURES:
+        values = pd.to_numeric(df[name], errors="coerce").astype("float64")
+        missing |= np.where(values.isna().to_numpy(), MISSING_BIT[name], 0)
+        rows[name] = values
+    rows[TARGET] = pd.to_numeric(df[TARGET], errors="coerce").astype("float64")
+    rows = pd.concat([rows, derive(rows)], axis=1)
+    rows["missing"] = missing
+    rows["row_hash"] = row_hashes(raw) if hashes is None else hashes
+    return rows[COLUMNS]
+
+
+class FeatureStore:
+    """The player feature table on disk, cached in memory and reloaded when the file changes"""
+
+    def __init__(self, root=STORE_DIR):
+        self.root = Path(root)
+        self.path = self.root / STORE_FILE
+        self.meta_path = self.root / META_FILE
+        self._lock = threading.Lock()
+        self._frame = None
+        self._mtime = None
+
+    # ── Reads ────────────────────────────────────────────────────────────────────
+    def exists(self):
+        return self.path.exists()
+
+    def frame(self):
+        """The whole table indexed by player name (shared, do not modify)"""
+        try:
+            mtime = self.path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return pd.DataFrame(columns=COLUMNS).set_index(KEY)
+        with self._lock:
+            if mtime != self._mtime:
+                self._frame = read_frame(self.path).set_index(KEY)
+                self._mtime = mtime
+            return self._frame
+
+    def meta(self):
+        try:
+            return json.loads(self.meta_path.read_text())
+        except FileNotFoundError:
+            return {}
+
+    def get(self, name):
+        """All stored features of one player, or None"""
+        frame = self.frame()
+        if name not in frame.index:
+            return None
+        return {KEY: name, **frame.loc[name].to_dict()}
+
+    def features(self, names):
+        """Model feature rows for ``names`` in FEATURES order; raises KeyError for unknown players"""
+        frame = self.frame()
+        unknown = [name for name in names if name not in frame.index]
+        if unknown:
+            raise KeyError(", ".join(map(str, unknown)))
+        return frame.loc[list(names), FEATURES]
+
+    def training_data(self):
+        """(X, y) for training: imputed features and target of every player"""
+        frame = self.frame()
+        return frame[FEATURES].reset_index(drop=True), frame[TARGET].reset_index(drop=True)
+
+    # ── Updates ──────────────────────────────────────────────────────────────────
+    def update(self, raw):
+        """Merge raw rows into the store, cleaning only new or changed players; returns counts"""
+        start = time.perf_counter()
+        raw = raw.drop_duplicates(subset=[KEY], keep="last").reset_index(drop=True)
+        current = self.frame().reset_index() if self.exists() else pd.DataFrame(columns=COLUMNS)
+        stored = pd.Series(current["row_hash"].to_numpy(), index=current[KEY].to_numpy())
+
+        hashes = row_hashes(raw)
+        known = stored.reindex(raw[KEY].astype(object).to_numpy())
+        is_known = known.notna().to_numpy()
+        changed = ~is_known | (known.to_numpy() != hashes)
+        rows = build_rows(raw[changed].reset_index(drop=True), hashes[changed])
+
+        # Replace changed players in place, append new ones
+        position = pd.Series(np.arange(len(current)), index=current[KEY].to_numpy())
+        existing = is_known[changed]
+        merged = current.copy()
+        if existing.any():
+            at = position[rows.loc[existing, KEY]].to_numpy()
+            for col in COLUMNS[1:]:
+                merged.loc[at, col] = rows.loc[existing, col].to_numpy()
+        merged = pd.concat([merged, rows[~existing]], ignore_index=True) if len(merged) else rows[~existing]
+        merged = merged.reset_index(drop=True)
+
+        means = self._impute(merged)
+        self._write(merged, means)
+        counts = {
+            "received": len(raw),
+            "unchanged": int((~changed).sum()),
+            "updated": int(existing.sum()),
+            "inserted": int((~existing).sum()),
+            "rows": len(merged),
+            "seconds": round(time.perf_counter() - start, 4),
+        }
+        return counts
+
+    @staticmethod
+    def _impute(frame):
+        """Mean of each feature over non-imputed values, written into the imputed cells"""
+        missing = frame["missing"].astype("int64").to_numpy()
+        means = {}
+        for name, bit in MISSING_BIT.items():
+            imputed = (missing & bit) != 0
+            values = frame[name].astype("float64")
+            means[name] = float(values[~imputed].mean()) if (~imputed).any() else 0.0
+            if imputed.any():
+                frame.loc[imputed, name] = means[name]
+        return means
+
+    def _write(self, frame, means):
+        self.root.mkdir(parents=True, exist_ok=True)
+        frame = frame.astype({name: "float64" for name in [*FEATURES, TARGET, *DERIVED]})
+        frame = frame.astype({"missing": "int64", "row_hash": "uint64"})
+        tmp_path = self.path.with_suffix(".tmp")
+        frame[COLUMNS].to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, self.path)
+        meta = {"rows": len(frame), "means": means, "updated_at": time.strftime("%Y-%m-%dT%H:%M:%S")}
+        self.meta_path.write_text(json.dumps(meta, indent=2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain the per-player feature store")
+    parser.add_argument("--store", default=str(STORE_DIR), help="Feature store directory")
+    commands = parser.add_subparsers(dest="command", required=True)
+    update = commands.add_parser("update", help="Merge new or changed raw rows into the store")
+    update.add_argument("--input", required=True, help="Raw CSV/Parquet/Feather rows")
+    show = commands.add_parser("show", help="Print the stored features of a player")
+    show.add_argument("player", help="Player name")
+    args = parser.parse_args()
+
+    store = FeatureStore(args.store)
+    if args.command == "update":
+        counts = store.update(read_frame(args.input, dtype=dtypes("extract")))
+        print(f"✅ Feature store {store.path}: {counts}")
+    else:
+        record = store.get(args.player)
+        if record is None:
+            parser.exit(1, f"❌ Unknown player: {args.player}\n")
+        print(json.dumps(record, indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+# linear_scorer.py
+"""
+Dependency-light scorer for the exported LinearRegression model.
+
+The artifact written by export_model.py is a small JSON file holding the
+feature order, ``coef_`` and ``intercept_``. Loading it needs neither sklearn
+nor pandas: single rows are scored with a plain Python dot product and batches
+with one NumPy matrix-vector product. NumPy itself is only imported on the first
+batch call, so single-row entry points such as predict_cli.py start quickly.
+"""
+import json
+from pathlib import Path
+
+# ── Paths ────────────────────────────────────────────────────────────────────────
+BASE_DIR      = Path(__file__).resolve().parent
+ARTIFACT_PATH = BASE_DIR.parent / "models" / "cricket_model.json"
+
+
+class LinearScorer:
+    """Evaluate ``intercept + x · coef`` for the exported model"""
+
+    def __init__(self, features, coef, intercept):
+        if len(features) != len(coef):
+            raise ValueError(f"{len(features)} features but {len(coef)} coefficients")
+        self.features  = list(features)
+        self.coef      = [float(c) for c in coef]
+        self.intercept = float(intercept)
+        self._coef_np  = None
+
+    @classmethod
+    def load(cls, path=ARTIFACT_PATH):
+        """Load a scorer from a JSON artifact"""
+        with open(path) as f:
+            payload = json.load(f)
+        return cls(payload["features"], payload["coef"], payload["intercept"])
+
+    def predict_one(self, row):
+        """Score a single row given as a mapping of feature name to value or a sequence"""
+        if hasattr(row, "keys"):
+            row = [row[name] for name in self.features]
+        total = self.intercept
+        for value, weight in zip(row, self.coef):
+            total += float(value) * weight
+        return total
+
+    def predict(self, X):
+        """Score a 2-D batch (array-like in feature order, or a DataFrame)"""
+        import numpy as np
+
+        if self._coef_np is None:
+            self._coef_np = np.asarray(self.coef, dtype=np.float64)
+        if hasattr(X, "columns"):
+            X = X[self.features].to_numpy(dtype=np.float64)
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if X.shape[1] != len(self.coef):
+            raise ValueError(f"Expected {len(self.coef)} features, got {X.shape[1]}")
+        return X @ self._coef_np + self.intercept
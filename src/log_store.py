@@ -0,0 +1,238 @@
+# log_store.py
+"""
+Bounded, paged on-disk storage for DAG run logs.
+
+A run's log is a sequence of segment files named after the logical byte offset
+they start at (``<run_id>.<offset>.log``). When the open segment reaches
+``segment_bytes`` a new one is started, and only the newest ``max_segments``
+are kept, so a run never uses more than roughly segment_bytes * max_segments
+of disk and its tail is always available. A sidecar index
+(``<run_id>.idx``, one little-endian uint64 per page) records the logical
+offset at which every ``page_lines``-th line starts, so any page is one seek.
+
+Nothing is held in memory beyond the page or byte range being served, and
+``enforce_retention`` deletes all but the newest runs of a DAG (and runs older
+than ``max_age_days``).
+"""
+import os
+import re
+import struct
+import threading
+import time
+from pathlib import Path
+
+# ── Defaults ─────────────────────────────────────────────────────────────────────
+DEFAULT_PAGE_LINES    = 200
+DEFAULT_SEGMENT_BYTES = 8 * 1024 * 1024
+DEFAULT_MAX_SEGMENTS  = 4
+DEFAULT_KEEP_RUNS     = 20     # per DAG
+DEFAULT_MAX_AGE_DAYS  = 14
+DEFAULT_READ_LIMIT    = 64 * 1024
+
+INDEX_RECORD = struct.Struct("<Q")
+
+
+class LogWriter:
+    """Append lines to a run's log, rotating segments and maintaining the page index"""
+
+    def __init__(self, store, run_id):
+        self.store = store
+        self.run_id = run_id
+        self.offset = 0
+        self.lines = 0
+        self._index = open(store.index_path(run_id), "ab", buffering=0)
+        self._segment = None
+        self._segment_bytes = 0
+        self._open_segment()
+
+    def _open_segment(self):
+        if self._segment is not None:
+            self._segment.close()
+        self._segment = open(self.store.segment_path(self.run_id, self.offset), "wb", buffering=0)
+        self._segment_bytes = 0
+        # Drop the oldest segments beyond the per-run cap
+        for _, path in self.store.segments(self.run_id)[:-self.store.max_segments]:
+            path.unlink(missing_ok=True)
+
+    def write(self, text):
+        """Append ``text`` (one or more lines) to the log"""
+        for line in text.splitlines(keepends=True):
+            if self.lines % self.store.page_lines == 0:
+                self._index.write(INDEX_RECORD.pack(self.offset))
+            data = line.encode("utf-8", errors="replace")
+            self._segment.write(data)
+            self.offset += len(data)
+            self._segment_bytes += len(data)
+            if line.endswith("\n"):
+                self.lines += 1
+                if self._segment_bytes >= self.store.segment_bytes:
+                    self._open_segment()
+
+    def close(self):
+        self._segment.close()
+        self._index.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class LogStore:
+    """Directory of run logs with tail, byte-range and page reads"""
+
+    def __init__(self, root, page_lines=DEFAULT_PAGE_LINES, segment_bytes=DEFAULT_SEGMENT_BYTES,
+                 max_segments=DEFAULT_MAX_SEGMENTS, keep_runs=DEFAULT_KEEP_RUNS, max_age_days=DEFAULT_MAX_AGE_DAYS):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.page_lines = page_lines
+        self.segment_bytes = segment_bytes
+        self.max_segments = max(1, max_segments)
+        self.keep_runs = keep_runs
+        self.max_age_days = max_age_days
+        self._retention_lock = threading.Lock()
+
+    # ── Paths ────────────────────────────────────────────────────────────────────
+    def index_path(self, run_id):
+        return self.root / f"{run_id}.idx"
+
+    def segment_path(self, run_id, offset):
+        return self.root / f"{run_id}.{offset:012d}.log"
+
+    def segments(self, run_id):
+        """[(logical start offset, path)] of the run's remaining segments, oldest first"""
+        pattern = re.compile(re.escape(run_id) + r"\.(\d{12})\.log$")
+        found = []
+        for path in self.root.glob(f"{glob_escape(run_id)}.*.log"):
+            match = pattern.match(path.name)
+            if match:
+                found.append((int(match.group(1)), path))
+        return sorted(found)
+
+    def writer(self, run_id):
+        return LogWriter(self, run_id)
+
+    def exists(self, run_id):
+        return self.index_path(run_id).exists()
+
+    # ── Reads ────────────────────────────────────────────────────────────────────
+    def bounds(self, run_id):
+        """(first available logical offset, end offset) of the run's log"""
+        segments = self.segments(run_id)
+        if not segments:
+            return 0, 0
+        start, last = segments[0][0], segments[-1]
+        try:
+            end = last[0] + last[1].stat().st_size
+        except FileNotFoundError:
+            end = last[0]
+        return start, end
+
+    def read_range(self, run_id, offset=0, limit=DEFAULT_READ_LIMIT, whole_lines=True):
+        """Up to ``limit`` bytes from logical ``offset``; returns (text, offset read from, next offset)
+
+        An offset that fell into a dropped segment is moved to the oldest kept
+        byte. With ``whole_lines`` a trailing partial line is left for the next read.
+        """
+        segments = self.segments(run_id)
+        start, end = self.bounds(run_id)
+        offset = min(max(offset, start), end)
+        chunks, remaining, position = [], limit, offset
+        for base, path in segments:
+            if remaining <= 0:
+                break
+            try:
+                size = path.stat().st_size
+                if position >= base + size:
+                    continue
+                with open(path, "rb") as f:
+                    f.seek(position - base)
+                    data = f.read(remaining)
+            except FileNotFoundError:
+                continue   # rotated away while reading
+            chunks.append(data)
+            position += len(data)
+            remaining -= len(data)
+        data = b"".join(chunks)
+        if whole_lines and b"\n" in data and not data.endswith(b"\n"):
+            data = data[:data.rindex(b"\n") + 1]
+        return data.decode("utf-8", errors="replace"), offset, offset + len(data)
+
+    def tail(self, run_id, lines=DEFAULT_PAGE_LINES, max_bytes=DEFAULT_READ_LIMIT):
+        """The last ``lines`` lines (bounded by ``max_bytes``); returns (text, start offset, end offset)"""
+        start, end = self.bounds(run_id)
+        begin = max(start, end - max_bytes)
+        text, begin, end = self.read_range(run_id, begin, end - begin, whole_lines=False)
+        kept = text.splitlines(keepends=True)
+        if begin > start and kept:
+            kept = kept[1:]   # first line is probably cut
+        kept = kept[-lines:]
+        tail_text = "".join(kept)
+        return tail_text, end - len(tail_text.encode("utf-8", errors="replace")), end
+
+    def page_count(self, run_id):
+        """(first page still on disk, number of pages)"""
+        try:
+            count = self.index_path(run_id).stat().st_size // INDEX_RECORD.size
+        except FileNotFoundError:
+            return 0, 0
+        start, _ = self.bounds(run_id)
+        first = 0
+        with open(self.index_path(run_id), "rb") as f:
+            # Binary search for the first page whose start was not rotated away
+            lo, hi = 0, count
+            while lo < hi:
+                mid = (lo + hi) // 2
+                f.seek(mid * INDEX_RECORD.size)
+                if INDEX_RECORD.unpack(f.read(INDEX_RECORD.size))[0] < start:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            first = lo
+        return first, count
+
+    def read_page(self, run_id, page, max_bytes=4 * DEFAULT_READ_LIMIT):
+        """Lines [page * page_lines, (page + 1) * page_lines); None if the page is gone"""
+        first, count = self.page_count(run_id)
+        if not first <= page < count:
+            return None
+        with open(self.index_path(run_id), "rb") as f:
+            f.seek(page * INDEX_RECORD.size)
+            begin = INDEX_RECORD.unpack(f.read(INDEX_RECORD.size))[0]
+            record = f.read(INDEX_RECORD.size)
+        stop = INDEX_RECORD.unpack(record)[0] if record else self.bounds(run_id)[1]
+        text, _, _ = self.read_range(run_id, begin, min(stop - begin, max_bytes), whole_lines=False)
+        return text
+
+    # ── Retention ────────────────────────────────────────────────────────────────
+    def delete(self, run_id):
+        for _, path in self.segments(run_id):
+            path.unlink(missing_ok=True)
+        self.index_path(run_id).unlink(missing_ok=True)
+
+    def enforce_retention(self, dag_id, active=()):
+        """Delete runs of ``dag_id`` beyond ``keep_runs`` or older than ``max_age_days``"""
+        with self._retention_lock:
+            indexes = sorted(self.root.glob(f"{glob_escape(dag_id)}__*.idx"),
+                             key=lambda p: p.stat().st_mtime, reverse=True)
+            cutoff = time.time() - self.max_age_days * 86400 if self.max_age_days else None
+            removed = []
+            for position, path in enumerate(indexes):
+                run_id = path.name[:-len(".idx")]
+                if run_id in active:
+                    continue
+                too_many = self.keep_runs and position >= self.keep_runs
+                too_old = cutoff is not None and path.stat().st_mtime < cutoff
+                if too_many or too_old:
+                    self.delete(run_id)
+                    removed.append(run_id)
+            return removed
+
+    def disk_usage(self):
+        return sum(entry.stat().st_size for entry in os.scandir(self.root) if entry.is_file())
+
+
+def glob_escape(name):
+    """Escape glob metacharacters in a run or DAG id"""
+    return re.sub(r"([*?\[])", r"[\1]", name)
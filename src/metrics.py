@@ -0,0 +1,139 @@
+# metrics.py
+"""
+Prometheus metrics for the prediction paths and the ETL pipeline.
+
+Serving metrics live in the default registry and are exposed by the API's
+/metrics route, or by ``serve_metrics`` for processes without a web server of
+their own (the Streamlit UI). ETL metrics live in a separate registry, because
+a pipeline run is a one-shot job: they are written to a node-exporter textfile
+and/or pushed to a Pushgateway at the end of the run.
+
+The cache hit rate is available directly as a gauge, and as
+``rate(cricket_prediction_cache_lookups_total{result="hit"}[5m])`` over the
+sum of both results.
+"""
+import time
+from contextlib import contextmanager
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    push_to_gateway,
+    start_http_server,
+    write_to_textfile,
+)
+
+# ── Buckets ──────────────────────────────────────────────────────────────────────
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+LOAD_BUCKETS    = (0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+BATCH_BUCKETS   = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 10_000, 100_000, 1_000_000)
+
+# ── Serving ──────────────────────────────────────────────────────────────────────
+MODEL_LOAD_SECONDS = Histogram(
+    "cricket_model_load_seconds", "Time to load a model into memory",
+    ["source"], buckets=LOAD_BUCKETS,
+)
+PREDICTION_LATENCY = Histogram(
+    "cricket_prediction_latency_seconds", "Latency of one prediction request or call",
+    ["path"], buckets=LATENCY_BUCKETS,
+)
+PREDICTION_BATCH_ROWS = Histogram(
+    "cricket_prediction_batch_rows", "Rows per model.predict call",
+    ["path"], buckets=BATCH_BUCKETS,
+)
+PREDICTION_ROWS = Counter(
+    "cricket_prediction_rows", "Rows scored",
+    ["path"],
+)
+CACHE_LOOKUPS = Counter(
+    "cricket_prediction_cache_lookups", "Prediction cache lookups by result",
+    ["cache", "result"],
+)
+CACHE_HIT_RATIO = Gauge(
+    "cricket_prediction_cache_hit_ratio", "Hit rate of the prediction cache since start",
+    ["cache"],
+)
+
+# ── Drift ────────────────────────────────────────────────────────────────────────
+FEATURE_DRIFT_PSI = Gauge(
+    "cricket_feature_drift_psi", "PSI of live prediction inputs against the training profile",
+    ["feature"],
+)
+FEATURE_DRIFT_KS = Gauge(
+    "cricket_feature_drift_ks", "KS distance of live prediction inputs from the training profile",
+    ["feature"],
+)
+
+# ── ETL ──────────────────────────────────────────────────────────────────────────
+ETL_REGISTRY = CollectorRegistry()
+ETL_STAGE_SECONDS = Gauge(
+    "cricket_etl_stage_duration_seconds", "Duration of the last run of an ETL stage",
+    ["stage", "status"], registry=ETL_REGISTRY,
+)
+ETL_STAGE_ROWS = Gauge(
+    "cricket_etl_stage_rows", "Rows produced by the last run of an ETL stage",
+    ["stage"], registry=ETL_REGISTRY,
+)
+ETL_LAST_SUCCESS = Gauge(
+    "cricket_etl_last_success_timestamp_seconds", "Unix time of the last successful ETL run",
+    registry=ETL_REGISTRY,
+)
+
+_server_started = False
+
+
+@contextmanager
+def observe_latency(path):
+    """Time the body into PREDICTION_LATENCY{path}"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        PREDICTION_LATENCY.labels(path).observe(time.perf_counter() - start)
+
+
+def record_batch(path, rows):
+    PREDICTION_BATCH_ROWS.labels(path).observe(rows)
+    PREDICTION_ROWS.labels(path).inc(rows)
+
+
+def record_cache(name, cache, hits, misses):
+    """Count ``hits``/``misses`` for one request and refresh the hit-rate gauge"""
+    if hits:
+        CACHE_LOOKUPS.labels(name, "hit").inc(hits)
+    if misses:
+        CACHE_LOOKUPS.labels(name, "miss").inc(misses)
+    CACHE_HIT_RATIO.labels(name).set(cache.stats()["hit_rate"])
+
+
+def record_drift(report):
+    """Publish the per-feature scores of a DriftMonitor report"""
+    for name, entry in report["features"].items():
+        if entry["psi"] is not None:
+            FEATURE_DRIFT_PSI.labels(name).set(entry["psi"])
+            FEATURE_DRIFT_KS.labels(name).set(entry["ks"])
+
+
+def latest():
+    """(body, content type) of the default registry for a /metrics route"""
+    return generate_latest(), CONTENT_TYPE_LATEST
+
+
+def serve_metrics(port, addr="0.0.0.0"):
+    """Expose the default registry on its own HTTP port (once per process)"""
+    global _server_started
+    if not _server_started:
+        start_http_server(port, addr=addr)
+        _server_started = True
+
+
+def export_etl_metrics(textfile=None, pushgateway=None, job="cricket_etl"):
+    """Write the ETL registry to a textfile and/or push it to a Pushgateway"""
+    if textfile:
+        write_to_textfile(str(textfile), ETL_REGISTRY)
+    if pushgateway:
+        push_to_gateway(pushgateway, job=job, registry=ETL_REGISTRY)
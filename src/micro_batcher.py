@@ -0,0 +1,134 @@
+# micro_batcher.py
+"""
+Micro-batching for the prediction server.
+
+Requests submitted from many server threads are queued; a single worker thread
+drains the queue, waits at most ``max_wait_ms`` for more requests to arrive
+(up to ``max_batch_size`` rows), scores them with one ``predict_fn`` call and
+hands each caller back its own slice of the result. A single request larger
+than ``max_batch_size`` is scored in slices; if a batched call raises, its
+requests are retried one by one so a bad row only fails its own request.
+"""
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+# ── Defaults ─────────────────────────────────────────────────────────────────────
+DEFAULT_MAX_BATCH_SIZE = 256
+DEFAULT_MAX_WAIT_MS    = 2.0
+
+
+class _Pending:
+    """One submitted request waiting for its predictions"""
+
+    __slots__ = ("rows", "future")
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.future = Future()
+
+
+class MicroBatcher:
+    """Combine concurrent ``submit`` calls into batched ``predict_fn`` calls"""
+
+    def __init__(self, predict_fn, max_batch_size=DEFAULT_MAX_BATCH_SIZE, max_wait_ms=DEFAULT_MAX_WAIT_MS):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+
+        self.batches = 0
+        self.rows = 0
+        self._queue = queue.Queue()
+        self._stopped = threading.Event()
+        self._worker = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._worker.start()
+
+    def submit(self, rows):
+        """Queue a 2-D block of feature rows; returns a Future of a 1-D prediction array"""
+        if self._stopped.is_set():
+            raise RuntimeError("MicroBatcher is closed")
+        pending = _Pending(np.asarray(rows, dtype=np.float64).reshape(len(rows), -1))
+        self._queue.put(pending)
+        return pending.future
+
+    def predict(self, rows, timeout=None):
+        """Blocking convenience wrapper around ``submit``"""
+        return self.submit(rows).result(timeout=timeout)
+
+    def stats(self):
+        return {
+            "batches": self.batches,
+            "rows": self.rows,
+            "mean_batch_size": self.rows / self.batches if self.batches else 0.0,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000.0,
+        }
+
+    def close(self):
+        """Stop the worker after the queued requests have been served"""
+        self._stopped.set()
+        self._queue.put(None)
+        self._worker.join()
+
+    # ── Worker ───────────────────────────────────────────────────────────────────
+    def _collect(self, first):
+        """Gather requests until the batch is full or the window has elapsed"""
+        batch, size = [first], len(first.rows)
+        deadline = time.monotonic() + self.max_wait
+        while size < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                # Re-queue the sentinel so the main loop sees it after this batch
+                self._queue.put(None)
+                break
+            batch.append(item)
+            size += len(item.rows)
+        return batch
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = self._collect(first)
+            try:
+                X = batch[0].rows if len(batch) == 1 else np.concatenate([p.rows for p in batch])
+                predictions = self._predict(X)
+            except Exception as e:
+                if len(batch) == 1:
+                    batch[0].future.set_exception(e)
+                else:
+                    self._run_each(batch)
+                continue
+
+            offset = 0
+            for pending in batch:
+                n = len(pending.rows)
+                pending.future.set_result(predictions[offset:offset + n])
+                offset += n
+
+    def _predict(self, X):
+        """Score ``X`` in slices of at most ``max_batch_size`` rows"""
+        parts = []
+        for start in range(0, len(X), self.max_batch_size):
+            parts.append(np.asarray(self.predict_fn(X[start:start + self.max_batch_size])))
+            self.batches += 1
+        self.rows += len(X)
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+    def _run_each(self, batch):
+        """Score the requests of a failed batch one by one, so only the bad ones fail"""
+        for pending in batch:
+            try:
+                pending.future.set_result(self._predict(pending.rows))
+            except Exception as e:
+                pending.future.set_exception(e)
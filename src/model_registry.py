@@ -0,0 +1,303 @@
+# model_registry.py
+"""
+Versioned local model registry and a hot-swapping loader for the servers.
+
+Layout (under models/registry by default):
+
+    v0001/model.pkl        joblib model
+    v0001/model.json       linear artifact (linear models only)
+    v0001/profile.json     training feature distributions (drift.py)
+    v0001/metadata.json    MAE, features, model type, training data hash, ...
+    CURRENT                name of the version being served
+    PINNED                 versions kept by retention (A/B and shadow arms)
+
+Versions are never modified after registration; promoting one only rewrites
+CURRENT, atomically (temp file + os.replace). Registering prunes the oldest
+versions beyond ``keep`` (MODEL_REGISTRY_KEEP, default 10; 0 keeps all) but
+never CURRENT or a pinned version. ModelWatcher polls CURRENT from
+a background thread, loads the new version off the request path and then
+swaps a single reference, so requests in flight finish on the model they
+started with and none are blocked. Pinned versions stay resident next to the
+current one for A/B or shadow scoring.
+"""
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# ── Defaults ─────────────────────────────────────────────────────────────────────
+BASE_DIR              = Path(__file__).resolve().parent
+REGISTRY_DIR          = Path(os.environ.get("MODEL_REGISTRY", BASE_DIR.parent / "models" / "registry"))
+CURRENT_POINTER       = "CURRENT"
+PINNED_LIST           = "PINNED"
+DEFAULT_KEEP          = int(os.environ.get("MODEL_REGISTRY_KEEP", 10))   # versions kept on register
+DEFAULT_POLL_INTERVAL = 2.0   # seconds between CURRENT checks
+
+
+def file_hash(path, chunk_size=1 << 20):
+    """md5 of a file, read in chunks"""
+    digest = hashlib.md5()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _write_atomic(path, text):
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(text)
+    os.replace(tmp, path)
+
+
+class ModelRegistry:
+    """Directory of immutable model versions plus a CURRENT pointer"""
+
+    def __init__(self, root=REGISTRY_DIR):
+        self.root = Path(root)
+
+    @property
+    def pointer_path(self):
+        return self.root / CURRENT_POINTER
+
+    def versions(self):
+        """Registered versions, oldest first"""
+        if not self.root.exists():
+            return []
+        return sorted(p.name for p in self.root.iterdir()
+                      if p.is_dir() and p.name.startswith("v") and (p / "metadata.json").exists())
+
+    def current(self):
+        """Version named by CURRENT, or None"""
+        try:
+            return self.pointer_path.read_text().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def set_current(self, version):
+        if not (self.root / version / "metadata.json").exists():
+            raise KeyError(f"Unknown model version: {version}")
+        _write_atomic(self.pointer_path, version + "\n")
+        logger.info(f"Model version {version} is now current")
+
+    def pinned(self):
+        """Versions protected from retention"""
+        try:
+            return sorted(set((self.root / PINNED_LIST).read_text().split()))
+        except FileNotFoundError:
+            return []
+
+    def pin(self, *versions):
+        for version in versions:
+            if not (self.root / version / "metadata.json").exists():
+                raise KeyError(f"Unknown model version: {version}")
+        _write_atomic(self.root / PINNED_LIST, "".join(f"{v}\n" for v in sorted({*self.pinned(), *versions})))
+
+    def unpin(self, *versions):
+        _write_atomic(self.root / PINNED_LIST, "".join(f"{v}\n" for v in self.pinned() if v not in versions))
+
+    def prune(self, keep=DEFAULT_KEEP):
+        """Delete the oldest versions beyond the newest ``keep``, except CURRENT and pinned ones"""
+        if not keep:
+            return []
+        protected = {self.current(), *self.pinned()}
+        removed = [version for version in self.versions()[:-keep] if version not in protected]
+        for version in removed:
+            # Drop metadata.json first so a half-deleted version is never listed
+            (self.root / version / "metadata.json").unlink(missing_ok=True)
+            shutil.rmtree(self.root / version, ignore_errors=True)
+            logger.info(f"Removed model version {version}")
+        return removed
+
+    def metadata(self, version):
+        with open(self.root / version / "metadata.json") as f:
+            return json.load(f)
+
+    def _allocate(self):
+        """Create and return the next version directory (safe against concurrent writers)"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        existing = [int(name[1:]) for name in self.versions() if name[1:].isdigit()]
+        number = max(existing, default=0) + 1
+        while True:
+            path = self.root / f"v{number:04d}"
+            try:
+                path.mkdir()
+                return path
+            except FileExistsError:
+                number += 1
+
+    def register(self, model, mae=None, data_path=None, set_current=True, keep=DEFAULT_KEEP, **extra):
+        """Store ``model`` as a new version with its metadata, then prune to ``keep``; returns the version"""
+        import joblib
+        import sklearn
+        from export_model import export_linear_model, is_linear
+        from schema import FEATURES
+
+        path = self._allocate()
+        joblib.dump(model, path / "model.pkl")
+        if is_linear(model):
+            export_linear_model(model, path / "model.json")
+        if getattr(model, "feature_profile_", None) is not None:
+            (path / "profile.json").write_text(json.dumps(model.feature_profile_, indent=2))
+
+        metadata = {
+            "version": path.name,
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "model_type": type(model).__name__,
+            "features": [str(f) for f in getattr(model, "feature_names_in_", FEATURES)],
+            "mae": None if mae is None else float(mae),
+            "data_path": None if data_path is None else str(data_path),
+            "data_hash": None if data_path is None else file_hash(data_path),
+            "sklearn_version": sklearn.__version__,
+            **extra,
+        }
+        # metadata.json is written last: a version without it is not listed
+        _write_atomic(path / "metadata.json", json.dumps(metadata, indent=2))
+        logger.info(f"Registered model version {path.name}")
+        if set_current:
+            self.set_current(path.name)
+        self.prune(keep)
+        return path.name
+
+    def load(self, version):
+        """Load a version for scoring: the linear artifact if present, else the pickle"""
+        path = self.root / version
+        if (path / "model.json").exists():
+            from linear_scorer import LinearScorer
+            return LinearScorer.load(path / "model.json")
+        import joblib
+        return joblib.load(path / "model.pkl")
+
+
+class ModelWatcher:
+    """Keep the CURRENT model (and pinned versions) loaded and hot-swap on change"""
+
+    def __init__(self, registry, pinned=(), interval=DEFAULT_POLL_INTERVAL, on_swap=None):
+        self.registry = registry if isinstance(registry, ModelRegistry) else ModelRegistry(registry)
+        self.pinned = list(pinned)
+        self.interval = interval
+        self.on_swap = on_swap
+        self.swaps = 0
+        self.load_seconds = None
+
+        self._current = (None, None)   # (version, model), replaced as one tuple
+        self._resident = {}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Load CURRENT and the pinned versions, then start polling"""
+        for version in self.pinned:
+            self._resident[version] = self.registry.load(version)
+        self.check()
+        if self._current[0] is None:
+            raise FileNotFoundError(f"No current model in registry {self.registry.root}")
+        self._thread = threading.Thread(target=self._poll, name="model-watcher", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def current(self):
+        """(version, model) currently being served"""
+        return self._current
+
+    def get(self, version):
+        """A resident model by version (pinned, or the current one)"""
+        current_version, model = self._current
+        if version == current_version:
+            return model
+        return self._resident[version]
+
+    def check(self):
+        """Swap in the CURRENT version if it changed; returns True on a swap"""
+        version = self.registry.current()
+        if version is None or version == self._current[0]:
+            return False
+        with self._lock:   # one loader at a time; readers never take this lock
+            old_version = self._current[0]
+            if version == old_version:
+                return False
+            start = time.perf_counter()
+            model = self._resident[version] if version in self._resident else self.registry.load(version)
+            self.load_seconds = time.perf_counter() - start
+            self._current = (version, model)
+            self.swaps += old_version is not None
+        logger.info(f"Serving model version {version} (was {old_version}, loaded in {self.load_seconds:.3f}s)")
+        if self.on_swap is not None:
+            self.on_swap(old_version, version)
+        return True
+
+    def stats(self):
+        return {
+            "current": self._current[0],
+            "resident": sorted({self._current[0], *self._resident}),
+            "swaps": self.swaps,
+            "last_load_seconds": self.load_seconds,
+        }
+
+    def _poll(self):
+        while not self._stopped.wait(self.interval):
+            try:
+                self.check()
+            except Exception:
+                # Keep serving the current model if the new one cannot be loaded
+                logger.exception("Failed to load the new current model")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="List or promote registered model versions")
+    parser.add_argument("--registry", default=str(REGISTRY_DIR), help="Registry directory")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="Show versions with their metadata")
+    promote = sub.add_parser("promote", help="Point CURRENT at a version (also used to roll back)")
+    promote.add_argument("version")
+    pin = sub.add_parser("pin", help="Keep versions through retention (A/B and shadow arms)")
+    pin.add_argument("versions", nargs="+")
+    unpin = sub.add_parser("unpin", help="Let retention remove versions again")
+    unpin.add_argument("versions", nargs="+")
+    prune = sub.add_parser("prune", help="Delete old versions except CURRENT and pinned ones")
+    prune.add_argument("--keep", type=int, default=DEFAULT_KEEP, help="Newest versions kept")
+    args = parser.parse_args()
+
+    registry = ModelRegistry(args.registry)
+    if args.command == "promote":
+        registry.set_current(args.version)
+        print(f"✅ {args.version} is now current")
+        return
+    if args.command == "pin":
+        registry.pin(*args.versions)
+        print(f"✅ Pinned {', '.join(registry.pinned())}")
+        return
+    if args.command == "unpin":
+        registry.unpin(*args.versions)
+        print(f"✅ Pinned {', '.join(registry.pinned()) or 'nothing'}")
+        return
+    if args.command == "prune":
+        removed = registry.prune(args.keep)
+        print(f"✅ Removed {len(removed)} version(s){': ' + ', '.join(removed) if removed else ''}")
+        return
+
+    current, pinned = registry.current(), registry.pinned()
+    for version in registry.versions():
+        meta = registry.metadata(version)
+        mae = "n/a" if meta.get("mae") is None else f"{meta['mae']:.2f}"
+        marker = "*" if version == current else "p" if version in pinned else " "
+        print(f"{marker} {version}  {meta['created_at']}  {meta['model_type']:<28} MAE {mae:>8}  "
+              f"data {str(meta.get('data_hash'))[:8]}")
+
+
+if __name__ == "__main__":
+    main()
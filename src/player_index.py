@@ -0,0 +1,276 @@
+# player_index.py
+"""
+In-memory lookup index over the player table, for predicting by player name.
+
+Built once from the feature store (feature_store.py) and pickled next to it;
+it is rebuilt only when the store file changes, so the raw CSV is never
+rescanned to answer a lookup. The index holds:
+
+    exact    dict from name (and its case/space-normalized form) to row id
+    prefix   sorted normalized names and name tokens, searched with bisect, so
+             "kohli" finds "V Kohli" as well as "v k" does
+    fuzzy    trigram posting lists; candidates are scored by trigram overlap
+             with np.bincount and the best are re-ranked with difflib
+    filters  boolean masks per team and role
+    features the model features of every player as one float64 matrix
+
+so predicting for a named player or a whole team is one lookup plus one
+vectorized ``model.predict`` over the selected rows.
+
+Usage:
+    python src/player_index.py kohli --team India
+    python src/predict.py --player "V Kohli" --team "Sri Lanka"
+"""
+import argparse
+import bisect
+import difflib
+import os
+import pickle
+import re
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from feature_store import KEY, STORE_DIR, FeatureStore
+from schema import FEATURES
+
+# ── Paths ────────────────────────────────────────────────────────────────────────
+INDEX_FILE = "player_index.pkl"
+FORMAT_VERSION = 1
+
+DEFAULT_LIMIT  = 10
+FUZZY_CUTOFF   = 0.3    # minimum trigram similarity of a fuzzy match
+FUZZY_RERANK   = 4      # candidates re-ranked with difflib per requested result
+
+
+def normalize(text):
+    """Lower-case and collapse whitespace"""
+    return re.sub(r"\s+", " ", str(text)).strip().lower()
+
+
+def trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _sorted_keys(pairs):
+    """(sorted keys, row ids in the same order) from (key, row id) pairs"""
+    pairs = sorted(pairs)
+    return [key for key, _ in pairs], np.array([row for _, row in pairs], dtype=np.int32)
+
+
+class PlayerIndex:
+    """Exact, prefix and fuzzy player-name search with team/role filters"""
+
+    def __init__(self, names, teams, roles, features, source=None):
+        self.names = np.asarray(names, dtype=object)
+        self.teams = np.asarray(teams, dtype=object)
+        self.roles = np.asarray(roles, dtype=object)
+        self.features = np.ascontiguousarray(features, dtype="float64")
+        self.source = source
+        normalized = [normalize(name) for name in self.names]
+
+        # ── Exact ────────────────────────────────────────────────────────────────
+        self.exact = {}
+        for row, (name, key) in enumerate(zip(self.names, normalized)):
+            self.exact.setdefault(name, row)
+            self.exact.setdefault(key, row)
+
+        # ── Prefix ───────────────────────────────────────────────────────────────
+        self.name_keys, self.name_rows = _sorted_keys((key, row) for row, key in enumerate(normalized))
+        self.token_keys, self.token_rows = _sorted_keys(
+            (token, row) for row, key in enumerate(normalized) for token in key.split(" ")[1:]
+        )
+
+        # ── Fuzzy ────────────────────────────────────────────────────────────────
+        postings = {}
+        self.trigram_counts = np.zeros(len(self.names), dtype=np.int32)
+        for row, key in enumerate(normalized):
+            grams = trigrams(key)
+            self.trigram_counts[row] = len(grams)
+            for gram in grams:
+                postings.setdefault(gram, []).append(row)
+        self.postings = {gram: np.array(rows, dtype=np.int32) for gram, rows in postings.items()}
+
+        # ── Filters ──────────────────────────────────────────────────────────────
+        self.team_masks = {normalize(team): self.teams == team for team in pd.unique(self.teams)}
+        self.role_masks = {normalize(role): self.roles == role for role in pd.unique(self.roles)}
+
+    @classmethod
+    def from_store(cls, store):
+        frame = store.frame()
+        return cls(frame.index, frame["team"], frame["role"], frame[FEATURES].to_numpy(),
+                   source=store_fingerprint(store))
+
+    def __len__(self):
+        return len(self.names)
+
+    # ── Lookups ──────────────────────────────────────────────────────────────────
+    def mask(self, team=None, role=None):
+        """Boolean row mask for the team/role filters (None when unfiltered)"""
+        mask = None
+        for value, masks in ((team, self.team_masks), (role, self.role_masks)):
+            if value is None:
+                continue
+            selected = masks.get(normalize(value))
+            selected = selected if selected is not None else np.zeros(len(self), dtype=bool)
+            mask = selected if mask is None else mask & selected
+        return mask
+
+    def lookup(self, name):
+        """Row id of an exact (case- and space-insensitive) name match, or None"""
+        row = self.exact.get(name)
+        return self.exact.get(normalize(name)) if row is None else row
+
+    def prefix(self, text, team=None, role=None, limit=DEFAULT_LIMIT):
+        """Row ids whose name, or any later name token, starts with ``text``"""
+        key, mask = normalize(text), self.mask(team, role)
+        rows = []
+        for keys, ids in ((self.name_keys, self.name_rows), (self.token_keys, self.token_rows)):
+            start = bisect.bisect_left(keys, key)
+            stop = bisect.bisect_left(keys, key + "\uffff", lo=start)
+            for row in ids[start:stop]:
+                if (mask is None or mask[row]) and row not in rows:
+                    rows.append(int(row))
+                    if len(rows) >= limit:
+                        return rows
+        return rows
+
+    def fuzzy(self, text, team=None, role=None, limit=DEFAULT_LIMIT, cutoff=FUZZY_CUTOFF):
+        """[(row id, score)] of names most similar to ``text``, best first"""
+        key = normalize(text)
+        grams = trigrams(key)
+        lists = [self.postings[gram] for gram in grams if gram in self.postings]
+        if not lists:
+            return []
+        overlap = np.bincount(np.concatenate(lists), minlength=len(self))
+        similarity = overlap / (len(grams) + self.trigram_counts - overlap)
+        mask = self.mask(team, role)
+        if mask is not None:
+            similarity = np.where(mask, similarity, 0.0)
+        count = min(limit * FUZZY_RERANK, len(self))
+        candidates = np.argpartition(-similarity, count - 1)[:count]
+        candidates = candidates[similarity[candidates] >= cutoff]
+        scored = [
+            (int(row), difflib.SequenceMatcher(None, key, normalize(self.names[row])).ratio())
+            for row in candidates
+        ]
+        scored.sort(key=lambda item: -item[1])
+        return scored[:limit]
+
+    def search(self, text, team=None, role=None, limit=DEFAULT_LIMIT):
+        """Exact match first, then prefix matches, then fuzzy matches; returns [(name, score)]"""
+        mask = self.mask(team, role)
+        results, seen = [], set()
+
+        def add(row, score):
+            if row not in seen and (mask is None or mask[row]):
+                seen.add(row)
+                results.append((row, score))
+
+        row = self.lookup(text)
+        if row is not None:
+            add(row, 1.0)
+        for row in self.prefix(text, team, role, limit):
+            add(row, 1.0)
+        if len(results) < limit:
+            for row, score in self.fuzzy(text, team, role, limit):
+                add(row, score)
+        return [(self.names[row], round(score, 3)) for row, score in results[:limit]]
+
+    def select(self, names=None, team=None, role=None):
+        """Row ids of exactly named players (KeyError for unknown ones) or of a team/role"""
+        if names is not None:
+            rows = [self.lookup(name) for name in names]
+            unknown = [name for name, row in zip(names, rows) if row is None]
+            if unknown:
+                raise KeyError(", ".join(map(str, unknown)))
+            return np.array(rows, dtype=np.int64)
+        mask = self.mask(team, role)
+        return np.arange(len(self)) if mask is None else np.flatnonzero(mask)
+
+    # ── Prediction ───────────────────────────────────────────────────────────────
+    def frame(self, rows):
+        """Player, team, role and feature columns of ``rows``"""
+        df = pd.DataFrame(self.features[rows], columns=FEATURES)
+        df.insert(0, "role", self.roles[rows])
+        df.insert(0, "team", self.teams[rows])
+        df.insert(0, KEY, self.names[rows])
+        return df
+
+    def predict(self, model, rows):
+        """Predictions for ``rows`` in one vectorized call"""
+        return model.predict(pd.DataFrame(self.features[rows], columns=FEATURES))
+
+    # ── Persistence ──────────────────────────────────────────────────────────────
+    def save(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            pickle.dump((FORMAT_VERSION, self), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def load(path):
+        with open(path, "rb") as f:
+            version, index = pickle.load(f)
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported player index format {version}")
+        return index
+
+
+def store_fingerprint(store):
+    st = store.path.stat()
+    return [str(store.path), st.st_mtime_ns, st.st_size]
+
+
+def load_index(store=None, path=None):
+    """The persisted index, rebuilt (and saved) only when the feature store changed"""
+    store = store or FeatureStore()
+    path = Path(path or store.root / INDEX_FILE)
+    if not store.exists():
+        raise FileNotFoundError(f"Feature store not found at {store.path}; run feature_store.py update first")
+    if path.exists():
+        try:
+            index = PlayerIndex.load(path)
+            if index.source == store_fingerprint(store):
+                return index
+        except (OSError, ValueError, pickle.UnpicklingError, AttributeError, EOFError):
+            pass
+    index = PlayerIndex.from_store(store)
+    index.save(path)
+    return index
+
+
+_loaded = {}
+
+
+def current_index(store):
+    """``load_index`` kept in memory, reloaded when the feature store changes"""
+    index = _loaded.get(store.path)
+    if index is None or index.source != store_fingerprint(store):
+        index = _loaded[store.path] = load_index(store)
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search players by name (exact, prefix, fuzzy)")
+    parser.add_argument("text", help="Name or part of a name")
+    parser.add_argument("--team", help="Only players of this team")
+    parser.add_argument("--role", help="Only players with this role")
+    parser.add_argument("--limit", type=int, default=DEFAULT_LIMIT, help="Maximum results")
+    parser.add_argument("--store", default=str(STORE_DIR), help="Feature store directory")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    index = load_index(FeatureStore(args.store))
+    print(f"Index of {len(index):,} players ready in {(time.perf_counter() - start) * 1000:.1f} ms")
+    for name, score in index.search(args.text, args.team, args.role, args.limit):
+        print(f"{score:5.3f}  {name}")
+
+
+if __name__ == "__main__":
+    main()
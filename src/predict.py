@@ -1,20 +1,104 @@
 # predict.py
 
+import argparse
+import os
+import time
+
 import joblib
 import pandas as pd
 from pathlib import Path
 
+from prometheus_client import REGISTRY, write_to_textfile
+
+from batch_predict import DEFAULT_CHUNK_SIZE, score_file
+from feature_store import KEY, STORE_DIR, FeatureStore
+from metrics import MODEL_LOAD_SECONDS
+from prediction_log import PredictionLogger, log_dir_from_env, resolve_log_dir
+from schema import FEATURES
+
 # ── Paths ────────────────────────────────────────────────────────────────────────
 BASE_DIR   = Path(__file__).resolve().parent
-MODEL_PATH = BASE_DIR / "models" / "cricket_model.pkl"
-
-# ── Load Model ───────────────────────────────────────────────────────────────────
-model = joblib.load(MODEL_PATH)
-
-# ── Example Prediction ───────────────────────────────────────────────────────────
-new_player = pd.DataFrame(
-    [[85.0, 12000, 500, 300, 200]],
-    columns=["strike_rate", "total_balls_faced", "total_matches_played", "matches_won", "matches_lost"]
-)
-predicted_runs = model.predict(new_player)
-print(f"Predicted Total Runs: {predicted_runs[0]:.2f}")
+MODEL_PATH = Path(os.environ.get("MODEL_PATH", BASE_DIR.parent / "models" / "cricket_model.pkl"))
+LOG_QUEUE_SIZE = 4   # chunks buffered for the prediction log before scoring waits
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Predict total runs for one example player or a whole file")
+    parser.add_argument("--model", default=str(MODEL_PATH), help="Path to the trained model")
+    parser.add_argument("--input", help="CSV/Parquet file with the five feature columns (enables batch mode)")
+    parser.add_argument("--output", help="CSV/Parquet file to write predictions to (batch mode)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Rows per predict call")
+    parser.add_argument("--metrics-file", help="Write Prometheus metrics of the run to this textfile (batch mode)")
+    parser.add_argument("--player", action="append", help="Predict for this player from the feature store (repeatable)")
+    parser.add_argument("--team", help="Predict for every player of this team")
+    parser.add_argument("--role", help="Only players with this role (with --team or alone)")
+    parser.add_argument("--store", default=str(STORE_DIR), help="Feature store directory (player mode)")
+    parser.add_argument("--prediction-log", default=log_dir_from_env(),
+                        help="Directory of the request/prediction log ('off' disables logging)")
+    return parser.parse_args()
+
+
+def predict_players(model, names=None, team=None, role=None, store_dir=STORE_DIR):
+    """Predictions for named players or a whole team/role: one index lookup and one predict call"""
+    from player_index import load_index
+    index = load_index(FeatureStore(store_dir))
+    try:
+        rows = index.select(names, team, role)
+    except KeyError as e:
+        # Suggest the closest names for a typo
+        hints = {name: [match for match, _ in index.search(name, limit=3)] for name in e.args[0].split(", ")}
+        raise SystemExit(f"❌ Unknown player(s): {hints}")
+    result = index.frame(rows)
+    result["predicted_runs"] = index.predict(model, rows)
+    return result
+
+
+def main():
+    args = parse_args()
+
+    # ── Load Model ───────────────────────────────────────────────────────────────
+    start = time.perf_counter()
+    model = joblib.load(args.model)
+    MODEL_LOAD_SECONDS.labels("file").observe(time.perf_counter() - start)
+    log_dir = resolve_log_dir(args.prediction_log)
+    prediction_log = PredictionLogger(log_dir, source="batch", queue_size=LOG_QUEUE_SIZE) if log_dir else None
+    try:
+        run(args, model, prediction_log)
+    finally:
+        if prediction_log is not None:
+            prediction_log.close()
+
+
+def run(args, model, prediction_log=None):
+    # ── Batch Prediction ─────────────────────────────────────────────────────────
+    if args.input:
+        output = args.output or str(Path(args.input).with_name(Path(args.input).stem + "_predictions.csv"))
+        stats = score_file(model, args.input, output, chunk_size=args.chunk_size, prediction_log=prediction_log)
+        print(
+            f"✅ Scored {stats['rows']:,} rows in {stats['chunks']} chunks "
+            f"({stats['seconds']:.2f}s, {stats['rows_per_second']:,.0f} rows/s) -> {stats['output']}"
+        )
+        if args.metrics_file:
+            write_to_textfile(args.metrics_file, REGISTRY)
+        return
+
+    # ── Players from the feature store ───────────────────────────────────────────
+    if args.player or args.team or args.role:
+        result = predict_players(model, args.player, args.team, args.role, args.store)
+        if prediction_log is not None:
+            prediction_log.log("players", result[FEATURES].to_numpy(), result["predicted_runs"].to_numpy(),
+                               block=True, players=result[KEY].to_numpy())
+        print(result[[KEY, "team", "predicted_runs"]].round(2).to_string(index=False))
+        return
+
+    # ── Example Prediction ───────────────────────────────────────────────────────
+    new_player = pd.DataFrame(
+        [[85.0, 12000, 500, 300, 200]],
+        columns=FEATURES
+    )
+    predicted_runs = model.predict(new_player)
+    print(f"Predicted Total Runs: {predicted_runs[0]:.2f}")
+
+
+if __name__ == "__main__":
+    main()
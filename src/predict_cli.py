@@ -0,0 +1,80 @@
+# predict_cli.py
+"""
+Fast-start command-line prediction for a single player.
+
+Only the standard library and linear_scorer are imported up front: the JSON
+artifact (models/cricket_model.json) is scored with a plain Python dot
+product, so neither NumPy, pandas nor sklearn is loaded. joblib/pandas are
+imported lazily only when the artifact is missing (e.g. the sweep picked a
+non-linear model) and the pickled model has to be used instead.
+
+Usage:
+    python src/predict_cli.py --strike-rate 90 --balls-faced 10000 --matches 200 --wins 120 --losses 80
+"""
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+from linear_scorer import ARTIFACT_PATH, LinearScorer
+
+# ── Paths ────────────────────────────────────────────────────────────────────────
+BASE_DIR    = Path(__file__).resolve().parent
+MODEL_PATH  = Path(os.environ.get("MODEL_PATH", BASE_DIR.parent / "models" / "cricket_model.pkl"))
+SCORER_PATH = Path(os.environ.get("SCORER_PATH", ARTIFACT_PATH))
+
+# CLI flag -> model feature (kept local so schema/pandas are not imported)
+ARGUMENTS = {
+    "strike_rate": "strike_rate",
+    "balls_faced": "total_balls_faced",
+    "matches": "total_matches_played",
+    "wins": "matches_won",
+    "losses": "matches_lost",
+}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Predict a player's total runs")
+    parser.add_argument("--strike-rate", type=float, required=True, help="Batting strike rate")
+    parser.add_argument("--balls-faced", type=float, required=True, help="Total balls faced")
+    parser.add_argument("--matches", type=float, required=True, help="Total matches played")
+    parser.add_argument("--wins", type=float, required=True, help="Matches won")
+    parser.add_argument("--losses", type=float, required=True, help="Matches lost")
+    parser.add_argument("--scorer", default=str(SCORER_PATH), help="Exported linear artifact (JSON)")
+    parser.add_argument("--model", default=str(MODEL_PATH), help="Pickled model used when there is no artifact")
+    parser.add_argument("--json", action="store_true", help="Print the result as JSON")
+    return parser.parse_args(argv)
+
+
+def predict(row, scorer_path=SCORER_PATH, model_path=MODEL_PATH):
+    """Predict total runs for ``row`` (feature name -> value)"""
+    if Path(scorer_path).exists():
+        return LinearScorer.load(scorer_path).predict_one(row)
+
+    import joblib
+    import pandas as pd
+
+    model = joblib.load(model_path)
+    return float(model.predict(pd.DataFrame([row]))[0])
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    row = {feature: getattr(args, arg) for arg, feature in ARGUMENTS.items()}
+
+    try:
+        predicted_runs = predict(row, args.scorer, args.model)
+    except FileNotFoundError as e:
+        print(f"❌ Model not found: {e.filename}", file=sys.stderr)
+        return 1
+
+    if args.json:
+        print(json.dumps({"predicted_runs": predicted_runs, "input_data": row}))
+    else:
+        print(f"Predicted Total Runs: {predicted_runs:.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+# prediction_cache.py
+"""
+LRU/TTL cache for predictions, keyed on the five input features.
+
+Keys can be quantized per feature (e.g. strike_rate rounded to 0.1) so nearly
+identical player profiles share an entry; a cached value is then the
+prediction of the first profile that filled it. The cache clears itself when
+any watched model file changes (mtime/size), and keeps hit/miss/eviction
+counters. All methods are thread-safe, so one instance can sit in front of the
+model in-process or inside the API server.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from schema import FEATURES
+
+# ── Defaults ─────────────────────────────────────────────────────────────────────
+DEFAULT_MAX_SIZE       = 4096
+DEFAULT_CHECK_INTERVAL = 1.0   # seconds between model file stat() calls
+
+
+def parse_quantize(specs):
+    """Turn ["strike_rate=0.1", ...] into {"strike_rate": 0.1, ...}"""
+    steps = {}
+    for spec in specs or []:
+        name, _, step = spec.partition("=")
+        if name not in FEATURES:
+            raise ValueError(f"Unknown feature for quantization: {name}")
+        steps[name] = float(step)
+        if steps[name] <= 0:
+            raise ValueError(f"Quantization step must be positive: {spec}")
+    return steps
+
+
+class PredictionCache:
+    """Thread-safe LRU cache with optional TTL, key quantization and model watching"""
+
+    def __init__(self, max_size=DEFAULT_MAX_SIZE, ttl=None, quantize=None, watch_paths=(),
+                 check_interval=DEFAULT_CHECK_INTERVAL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.steps = [(quantize or {}).get(name) for name in FEATURES]
+        self.watch_paths = [str(p) for p in watch_paths]
+        self.check_interval = check_interval
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._fingerprint = self._model_fingerprint()
+        self._next_check = time.monotonic() + check_interval
+
+    # ── Keys & invalidation ──────────────────────────────────────────────────────
+    def key(self, row):
+        """Cache key for a feature mapping or a sequence in FEATURES order"""
+        if hasattr(row, "keys"):
+            row = [row[name] for name in FEATURES]
+        return tuple(
+            float(value) if step is None else round(float(value) / step) * step
+            for value, step in zip(row, self.steps)
+        )
+
+    def _model_fingerprint(self):
+        fingerprint = []
+        for path in self.watch_paths:
+            try:
+                st = os.stat(path)
+                fingerprint.append((st.st_mtime_ns, st.st_size))
+            except FileNotFoundError:
+                fingerprint.append(None)
+        return tuple(fingerprint)
+
+    def _check_model(self, now):
+        """Clear the cache if a watched model file changed (called with the lock held)"""
+        if not self.watch_paths or now < self._next_check:
+            return
+        self._next_check = now + self.check_interval
+        fingerprint = self._model_fingerprint()
+        if fingerprint != self._fingerprint:
+            self._fingerprint = fingerprint
+            self._entries.clear()
+            self.invalidations += 1
+
+    # ── Lookup ───────────────────────────────────────────────────────────────────
+    def get(self, key):
+        """Return the cached prediction for ``key`` or None"""
+        now = time.monotonic()
+        with self._lock:
+            self._check_model(now)
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires = entry
+            if expires is not None and expires <= now:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        expires = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._entries[key] = (value, expires)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, row, compute):
+        """Cached ``compute(row)``; ``compute`` runs outside the lock on a miss"""
+        key = self.key(row)
+        value = self.get(key)
+        if value is None:
+            value = compute(row)
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.invalidations += 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
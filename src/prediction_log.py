@@ -0,0 +1,328 @@
+# prediction_log.py
+"""
+Append-only prediction log with a background writer, rotation and replay.
+
+Serving paths call ``PredictionLogger.log`` with the feature rows they scored
+and the predictions; the call only appends a tuple to a bounded queue and
+never blocks (when the queue is full the record is dropped and counted). A
+writer thread serializes queued records as one JSON line per request or batch
+chunk:
+
+    {"ts": 1718000000.123, "path": "api", "model_version": "v0003",
+     "features": [...], "rows": [[...], ...], "predictions": [...]}
+
+Every process writes its own file, ``requests-<source>-<pid>.jsonl`` (source
+e.g. api, streamlit, batch), so the API, the UI and batch jobs can share one
+log directory without rotating each other's files away. Lines are flushed
+after every drained batch and fsynced at most every ``fsync_interval``
+seconds. The active file is rotated when it exceeds ``max_bytes`` or is older
+than ``max_age`` seconds; rotated files are gzip-compressed by the writer
+thread (``requests-<source>-<pid>-<timestamp>.jsonl.gz``) and only the newest
+``keep`` of each source are kept. Files left behind by processes that are no
+longer running are rotated by the next logger started with the same source.
+
+``iter_records``/``iter_frames`` replay every file of the directory merged in
+timestamp order, e.g. as evaluation or training input.
+
+Usage:
+    python src/prediction_log.py replay --output replayed.parquet
+    python src/prediction_log.py stats
+"""
+import argparse
+import gzip
+import heapq
+import json
+import logging
+import os
+import queue
+import re
+import shutil
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+from schema import FEATURES
+
+logger = logging.getLogger(__name__)
+
+# ── Defaults ─────────────────────────────────────────────────────────────────────
+BASE_DIR            = Path(__file__).resolve().parent
+DEFAULT_LOG_DIR     = BASE_DIR.parent / "logs" / "predictions"
+ACTIVE_FILE         = re.compile(r"^requests-(?P<source>\w+)-(?P<pid>\d+)\.jsonl$")
+DEFAULT_MAX_BYTES   = 64 * 1024 * 1024
+DEFAULT_MAX_AGE     = 3600.0     # seconds before the active file is rotated
+DEFAULT_KEEP        = 48         # rotated files kept
+DEFAULT_QUEUE_SIZE  = 10_000     # records buffered before new ones are dropped
+DEFAULT_FSYNC_EVERY = 1.0        # seconds between fsyncs
+DISABLED            = {"", "0", "off", "none", "false"}
+
+
+def resolve_log_dir(value):
+    """``value`` as a log directory, or None when it switches logging off ("off", "", ...)"""
+    return None if value is None or str(value).strip().lower() in DISABLED else value
+
+
+def log_dir_from_env(default=DEFAULT_LOG_DIR):
+    """PREDICTION_LOG_DIR, or ``default``; None when logging is switched off"""
+    return resolve_log_dir(os.environ.get("PREDICTION_LOG_DIR", str(default)))
+
+
+def _tolist(values):
+    return values.tolist() if hasattr(values, "tolist") else list(values)
+
+
+class PredictionLogger:
+    """Non-blocking request/response logger backed by a single writer thread"""
+
+    def __init__(self, directory=DEFAULT_LOG_DIR, source="serving", max_bytes=DEFAULT_MAX_BYTES,
+                 max_age=DEFAULT_MAX_AGE, keep=DEFAULT_KEEP, queue_size=DEFAULT_QUEUE_SIZE,
+                 fsync_interval=DEFAULT_FSYNC_EVERY):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.source = re.sub(r"\W+", "_", source)
+        self.path = self.directory / f"requests-{self.source}-{os.getpid()}.jsonl"
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.keep = keep
+        self.fsync_interval = fsync_interval
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._stats = {"logged": 0, "dropped": 0, "written": 0, "rotations": 0, "write_errors": 0}
+        self._stats_lock = threading.Lock()   # logged/dropped are counted from many request threads
+        self._file = None
+        self._opened_at = None
+        self._last_fsync = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name="prediction-log", daemon=True)
+        self._thread.start()
+
+    # ── Request path ─────────────────────────────────────────────────────────────
+    def log(self, path, rows, predictions, model_version=None, block=False, **extra):
+        """Queue one request/chunk for writing; returns False if it was dropped
+
+        ``rows`` (sequences in FEATURES order, or a 2-D array) and
+        ``predictions`` must not be modified afterwards; they are serialized
+        later on the writer thread. Request paths never block and drop records
+        when the buffer is full; offline callers pass ``block=True`` to wait.
+        """
+        try:
+            self._queue.put((time.time(), path, model_version, rows, predictions, extra), block=block)
+            queued = True
+        except queue.Full:
+            queued = False
+        with self._stats_lock:
+            self._stats["logged" if queued else "dropped"] += 1
+        return queued
+
+    def stats(self):
+        return {**self._stats, "queued": self._queue.qsize(), "file": str(self.path)}
+
+    def close(self, timeout=10.0):
+        """Write everything queued, fsync and stop the writer thread"""
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    # ── Writer thread ────────────────────────────────────────────────────────────
+    def _open(self):
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._opened_at = time.time()
+
+    def _encode(self, item):
+        """One JSON line, or "" (counted as a write error) if the record cannot be serialized"""
+        try:
+            return self._encode_record(*item)
+        except Exception:
+            logger.exception("Cannot serialize a prediction log record")
+            self._stats["write_errors"] += 1
+            return ""
+
+    @staticmethod
+    def _encode_record(ts, path, model_version, rows, predictions, extra):
+        record = {
+            "ts": round(ts, 6),
+            "path": path,
+            "model_version": model_version,
+            "features": FEATURES,
+            "rows": _tolist(rows),
+            "predictions": [float(p) for p in _tolist(predictions)],
+            **{key: _tolist(value) if hasattr(value, "tolist") else value for key, value in extra.items()},
+        }
+        return json.dumps(record, separators=(",", ":")) + "\n"
+
+    def _run(self):
+        try:
+            self._rotate_orphans()
+        except Exception:
+            logger.exception("Cannot rotate prediction logs of stopped processes")
+        stopping = False
+        while not stopping:
+            try:
+                items = [self._queue.get(timeout=self.fsync_interval)]
+            except queue.Empty:
+                items = []
+            # Drain whatever else is queued so it goes out in one write
+            while len(items) < 1000:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stopping = None in items
+            # The thread must outlive any error: blocking callers wait on it to drain the queue
+            try:
+                self._write([item for item in items if item is not None], force_sync=stopping)
+            except Exception:
+                logger.exception("Prediction log write failed")
+                self._stats["write_errors"] += 1
+        if self._file is not None:
+            self._file.close()
+
+    def _write(self, items, force_sync=False):
+        if self._file is None:
+            self._open()
+        lines = [line for line in map(self._encode, items) if line]
+        if lines:
+            self._file.write("".join(lines))
+            self._file.flush()
+            self._stats["written"] += len(lines)
+        now = time.monotonic()
+        if force_sync or now - self._last_fsync >= self.fsync_interval:
+            os.fsync(self._file.fileno())
+            self._last_fsync = now
+        if self._file.tell() >= self.max_bytes or (
+                self._file.tell() and time.time() - self._opened_at >= self.max_age):
+            self._rotate()
+
+    def _rotate(self):
+        """Close the active file, compress it under a timestamped name and prune old ones"""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        self._file = None
+        self._compress(self.path)
+        self._open()
+
+    def _compress(self, path):
+        """Move an active file aside, gzip it and apply the retention limit"""
+        stamp = datetime.now().strftime("%Y%m%dT%H%M%S%f")
+        rotating = path.with_name(f"{path.stem}-{stamp}.jsonl.rotating")
+        os.replace(path, rotating)   # atomic: only one process can take over a file
+        with open(rotating, "rb") as src, gzip.open(rotating.with_suffix(".gz"), "wb", compresslevel=6) as dst:
+            shutil.copyfileobj(src, dst)
+        rotating.unlink()
+        self._stats["rotations"] += 1
+        if self.keep:
+            # Per source: a batch job that rotates often must not prune the API's history
+            for old in rotated_files(self.directory, self.source)[:-self.keep]:
+                old.unlink(missing_ok=True)
+
+    def _rotate_orphans(self):
+        """Compress active files of this source whose process is no longer running"""
+        for path in self.directory.glob(f"requests-{self.source}-*.jsonl"):
+            match = ACTIVE_FILE.match(path.name)
+            if match is None or path == self.path or _pid_alive(int(match["pid"])):
+                continue
+            try:
+                self._compress(path)
+            except FileNotFoundError:
+                pass   # taken over by another starting process
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass   # running, as another user
+    return True
+
+
+# ── Replay ───────────────────────────────────────────────────────────────────────
+def rotated_files(directory, source="*"):
+    """Compressed rotated logs of every process (or of one ``source``), oldest first"""
+    return sorted(Path(directory).glob(f"requests-{source}-*.jsonl.gz"), key=lambda path: path.stat().st_mtime_ns)
+
+
+def log_files(directory=DEFAULT_LOG_DIR):
+    """Every log file: rotated ones (also those still being compressed) and the active ones"""
+    directory = Path(directory)
+    active = [path for path in directory.glob("requests-*.jsonl") if ACTIVE_FILE.match(path.name)]
+    return rotated_files(directory) + sorted(directory.glob("requests-*.jsonl.rotating")) + sorted(active)
+
+
+def _read_file(file):
+    opener = gzip.open if file.suffix == ".gz" else open
+    with opener(file, "rt", encoding="utf-8") as f:
+        for line in f:
+            if not line.endswith("\n"):
+                break   # partial last line of an active file
+            yield json.loads(line)
+
+
+def iter_records(directory=DEFAULT_LOG_DIR, paths=None, since=None):
+    """Stream logged records (dicts) of all files in timestamp order
+
+    Optionally only from serving ``paths`` / after ``since``. Each file is
+    already in order, so they are merged lazily, one record per file in memory.
+    """
+    merged = heapq.merge(*(_read_file(file) for file in log_files(directory)), key=lambda record: record["ts"])
+    for record in merged:
+        if paths and record["path"] not in paths:
+            continue
+        if since and record["ts"] < since:
+            continue
+        yield record
+
+
+def iter_frames(directory=DEFAULT_LOG_DIR, chunk_rows=100_000, **filters):
+    """Stream the logged rows as DataFrames of FEATURES plus predicted_runs, path and ts"""
+    import pandas as pd
+
+    columns = FEATURES + ["predicted_runs", "path", "ts"]
+    buffer = []
+    for record in iter_records(directory, **filters):
+        for row, prediction in zip(record["rows"], record["predictions"]):
+            buffer.append([*row, prediction, record["path"], record["ts"]])
+        if len(buffer) >= chunk_rows:
+            yield pd.DataFrame(buffer, columns=columns)
+            buffer = []
+    if buffer:
+        yield pd.DataFrame(buffer, columns=columns)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or replay the prediction log")
+    parser.add_argument("--dir", default=str(DEFAULT_LOG_DIR), help="Prediction log directory")
+    commands = parser.add_subparsers(dest="command", required=True)
+    replay = commands.add_parser("replay", help="Write the logged rows to a CSV/Parquet file")
+    replay.add_argument("--output", required=True, help="CSV/Parquet file to write")
+    replay.add_argument("--path", action="append", help="Only rows from this serving path (repeatable)")
+    replay.add_argument("--chunk-rows", type=int, default=100_000, help="Rows written per chunk")
+    commands.add_parser("stats", help="Count logged records and rows per serving path")
+    args = parser.parse_args()
+
+    if args.command == "stats":
+        counts = {}
+        for record in iter_records(args.dir):
+            entry = counts.setdefault(record["path"], {"records": 0, "rows": 0})
+            entry["records"] += 1
+            entry["rows"] += len(record["rows"])
+        files = log_files(args.dir)
+        print(json.dumps({"files": len(files), "bytes": sum(f.stat().st_size for f in files), "paths": counts},
+                         indent=2))
+        return
+
+    # Each chunk is written as soon as it is read, so memory stays flat whatever the log size
+    from batch_predict import open_writer
+    writer, rows = open_writer(args.output), 0
+    try:
+        for frame in iter_frames(args.dir, args.chunk_rows, paths=args.path):
+            writer.write(frame)
+            rows += len(frame)
+    finally:
+        writer.close()
+    print(f"✅ Replayed {rows:,} logged rows to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
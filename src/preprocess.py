@@ -0,0 +1,38 @@
+# preprocess.py
+"""
+Clean the extracted ODI data for training.
+
+Usage:
+    python src/preprocess.py --input data/processed/raw.parquet --output data/processed/cleaned_data.parquet
+
+Input and output formats (CSV, Parquet, Feather) follow the file extensions.
+"""
+import argparse
+
+from cleaning import clean_numeric_columns
+from data_io import read_frame, write_frame
+from schema import dtypes
+
+
+def preprocess_frame(df, subset=None):
+    """Repair the European-formatted numeric columns and drop duplicate rows (over ``subset`` columns)"""
+    df = clean_numeric_columns(df)
+    df = df.drop_duplicates(subset=subset).reset_index(drop=True)
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Preprocess the ODI cricket data")
+    parser.add_argument("--input", required=True, help="Path to the extracted raw data")
+    parser.add_argument("--output", required=True, help="Path to write the cleaned data")
+    args = parser.parse_args()
+
+    df = read_frame(args.input, dtype=dtypes("extract"))
+    rows_in = len(df)
+    df = preprocess_frame(df)
+    write_frame(df, args.output)
+    print(f"✅ Preprocessed {rows_in} rows -> {len(df)} rows saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
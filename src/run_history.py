@@ -0,0 +1,96 @@
+# run_history.py
+"""
+Persistent DAG run history in an embedded SQLite database.
+
+One row per run, upserted on every state change, so history survives dashboard
+restarts. Rows are ordered by an autoincrement ``seq`` (trigger order); the
+indexes on (dag_id, seq) and (dag_id, started_at) keep "latest run of every
+DAG" and per-DAG history queries cheap with thousands of runs. Runs left
+Queued/Running by a process that died are marked Failed when the store opens.
+"""
+import sqlite3
+import threading
+from pathlib import Path
+
+COLUMNS = ('run_id', 'dag_id', 'status', 'queued_at', 'started_at', 'finished_at', 'returncode')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    seq         INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id      TEXT NOT NULL UNIQUE,
+    dag_id      TEXT NOT NULL,
+    status      TEXT NOT NULL,
+    queued_at   TEXT,
+    started_at  TEXT,
+    finished_at TEXT,
+    returncode  INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_runs_dag_seq ON runs (dag_id, seq);
+CREATE INDEX IF NOT EXISTS idx_runs_dag_started ON runs (dag_id, started_at);
+CREATE INDEX IF NOT EXISTS idx_runs_started ON runs (started_at);
+"""
+
+
+class RunHistory:
+    """SQLite-backed store of run records (dicts with the COLUMNS keys)"""
+
+    def __init__(self, db_path, interrupted_status="Failed", unfinished=("Queued", "Running")):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+            self._conn.execute(
+                f"UPDATE runs SET status = ? WHERE status IN ({','.join('?' * len(unfinished))})",
+                (interrupted_status, *unfinished),
+            )
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(sql, params)]
+
+    def save(self, run):
+        """Insert or update a run record"""
+        values = [run.get(column) for column in COLUMNS]
+        updates = ", ".join(f"{column} = excluded.{column}" for column in COLUMNS[2:])
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"INSERT INTO runs ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))}) "
+                f"ON CONFLICT(run_id) DO UPDATE SET {updates}",
+                values,
+            )
+
+    def get(self, run_id):
+        rows = self._query(f"SELECT {', '.join(COLUMNS)} FROM runs WHERE run_id = ?", (run_id,))
+        return rows[0] if rows else None
+
+    def runs(self, dag_id, limit=50, offset=0):
+        """Runs of ``dag_id``, newest first"""
+        return self._query(
+            f"SELECT {', '.join(COLUMNS)} FROM runs WHERE dag_id = ? ORDER BY seq DESC LIMIT ? OFFSET ?",
+            (dag_id, limit, offset),
+        )
+
+    def latest(self, dag_id):
+        runs = self.runs(dag_id, limit=1)
+        return runs[0] if runs else None
+
+    def latest_per_dag(self):
+        """{dag_id: newest run} for every DAG with history, in one indexed query"""
+        rows = self._query(
+            f"SELECT {', '.join('r.' + c for c in COLUMNS)} FROM runs r "
+            "JOIN (SELECT MAX(seq) AS seq FROM runs GROUP BY dag_id) latest ON r.seq = latest.seq"
+        )
+        return {row['dag_id']: row for row in rows}
+
+    def count(self, dag_id=None):
+        if dag_id is None:
+            return self._query("SELECT COUNT(*) AS n FROM runs")[0]['n']
+        return self._query("SELECT COUNT(*) AS n FROM runs WHERE dag_id = ?", (dag_id,))[0]['n']
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,77 @@
+# schema.py
+"""
+Central column schema for the ODI cricket dataset.
+
+Declares the memory-lean dtype of every raw column and the columns each
+consumer actually needs, so every loader reads the data the same way:
+low-cardinality strings as categoricals and counts as float32 (exact for
+integers up to 2**24, and a blank cell becomes NaN for the mean imputation
+instead of failing the read). The European-formatted numeric columns are also
+read as categoricals, which makes the factorize step in cleaning.py free; they
+are parsed to float64 there because their values reach ~1e13, beyond float32
+precision.
+"""
+
+# ── Features & Target ────────────────────────────────────────────────────────────
+FEATURES = ["strike_rate", "total_balls_faced", "total_matches_played", "matches_won", "matches_lost"]
+TARGET   = "total_runs"
+
+# ── Raw column dtypes ────────────────────────────────────────────────────────────
+CATEGORICAL_COLUMNS = ["player_name", "role", "team"]
+TEXT_NUMERIC_COLUMNS = ["strike_rate", "average", "percentage"]
+COUNT_COLUMNS = [
+    "total_runs",
+    "total_balls_faced",
+    "total_wickets_taken",
+    "total_runs_conceded",
+    "total_overs_bowled",
+    "total_matches_played",
+    "matches_played_as_batter",
+    "matches_played_as_bowler",
+    "matches_won",
+    "matches_lost",
+    "player_of_match_awards",
+]
+
+DTYPES = {
+    **{col: "category" for col in CATEGORICAL_COLUMNS},
+    **{col: "category" for col in TEXT_NUMERIC_COLUMNS},
+    **{col: "float32" for col in COUNT_COLUMNS},
+}
+
+# Column order of data/raw/ODI_Cricket_Data.csv
+RAW_COLUMNS = [
+    "player_name", "role", "total_runs", "strike_rate", "total_balls_faced",
+    "total_wickets_taken", "total_runs_conceded", "total_overs_bowled",
+    "total_matches_played", "matches_played_as_batter", "matches_played_as_bowler",
+    "matches_won", "matches_lost", "player_of_match_awards", "team", "average", "percentage",
+]
+
+# ── Columns per consumer ─────────────────────────────────────────────────────────
+USECOLS = {
+    "extract": None,                  # all columns
+    "train": FEATURES + [TARGET],
+    "predict": FEATURES,
+}
+
+
+def usecols(consumer):
+    """Columns ``consumer`` reads (None for all)"""
+    return USECOLS[consumer]
+
+
+def dtypes(consumer="extract"):
+    """dtype mapping restricted to the columns ``consumer`` reads.
+
+    Only the raw export ("extract") is known to hold the text-formatted numeric
+    columns; other consumers may read cleaned data where they are already
+    float64, so their dtype is left to inference.
+    """
+    columns = USECOLS[consumer] or RAW_COLUMNS
+    skip = set() if consumer == "extract" else set(TEXT_NUMERIC_COLUMNS)
+    return {col: DTYPES[col] for col in columns if col in DTYPES and col not in skip}
+
+
+def read_csv_kwargs(consumer):
+    """``usecols``/``dtype`` keyword arguments for ``pd.read_csv``"""
+    return {"usecols": usecols(consumer), "dtype": dtypes(consumer)}
@@ -0,0 +1,214 @@
+# sweep.py
+"""
+Parallel k-fold sweep over model families, hyperparameters and feature subsets.
+
+The prepared training matrix is written once to .npy files and every worker
+opens them with ``np.load(mmap_mode="r")``, so the pages are shared through the
+OS page cache instead of being pickled into each process. Each (config, fold)
+pair is one task on a process pool sized to the usable cores; fold scores are
+aggregated into a single leaderboard, and the best configuration is refit on
+all rows and saved like train_model.py does.
+
+Usage:
+    python src/sweep.py --folds 5
+    python src/sweep.py --families linear ridge --workers 2 --no-save
+"""
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from schema import FEATURES, dtypes, usecols
+
+# ── Paths & Defaults ─────────────────────────────────────────────────────────────
+BASE_DIR         = Path(__file__).resolve().parent
+DATA_PATH        = BASE_DIR.parent / "data" / "raw" / "ODI_Cricket_Data.csv"
+MODEL_DIR        = BASE_DIR.parent / "models"
+LEADERBOARD_PATH = MODEL_DIR / "sweep_leaderboard.csv"
+DEFAULT_FOLDS    = 5
+RANDOM_STATE     = 42
+
+# ── Search Space ─────────────────────────────────────────────────────────────────
+FAMILIES = {
+    "linear": [{}],
+    "ridge": [{"alpha": a} for a in (0.01, 0.1, 1.0, 10.0, 100.0)],
+    "lasso": [{"alpha": a} for a in (0.01, 0.1, 1.0, 10.0)],
+    "gbr": [
+        {"n_estimators": n, "max_depth": d, "learning_rate": 0.05}
+        for n in (200, 400) for d in (2, 3)
+    ],
+}
+# Every subset that drops at most one feature
+FEATURE_SUBSETS = [list(FEATURES)] + [list(c) for c in combinations(FEATURES, len(FEATURES) - 1)]
+
+
+def sweep_configs(families=None):
+    """Expand the search space into a list of {family, params, features} dicts"""
+    return [
+        {"family": family, "params": params, "features": features}
+        for family in families or FAMILIES
+        for params in FAMILIES[family]
+        for features in FEATURE_SUBSETS
+    ]
+
+
+def build_estimator(config):
+    """Unfitted estimator for ``config``; consumes a DataFrame with all FEATURES"""
+    from sklearn.compose import ColumnTransformer
+    from sklearn.ensemble import GradientBoostingRegressor
+    from sklearn.linear_model import Lasso, LinearRegression, Ridge
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import StandardScaler
+
+    family, params, features = config["family"], config["params"], config["features"]
+    if family == "gbr":
+        regressor = GradientBoostingRegressor(random_state=RANDOM_STATE, **params)
+    elif family == "ridge":
+        regressor = Ridge(**params)
+    elif family == "lasso":
+        regressor = Lasso(max_iter=10_000, **params)
+    else:
+        regressor = LinearRegression(**params)
+
+    steps = []
+    if list(features) != list(FEATURES):
+        steps.append(("select", ColumnTransformer(
+            [("keep", "passthrough", list(features))], remainder="drop", verbose_feature_names_out=False
+        )))
+    if family != "gbr":
+        # The raw strike_rate reaches ~1e13; scale so the penalties mean something
+        steps.append(("scale", StandardScaler()))
+    steps.append(("model", regressor))
+    if len(steps) == 1:
+        return regressor
+    return Pipeline(steps)
+
+
+def config_name(config):
+    params = ",".join(f"{k}={v}" for k, v in config["params"].items())
+    dropped = [f for f in FEATURES if f not in config["features"]]
+    subset = f"-{dropped[0]}" if dropped else "all"
+    return f"{config['family']}({params})[{subset}]"
+
+
+# ── Worker ───────────────────────────────────────────────────────────────────────
+_X = _y = None
+
+
+def _init_worker(x_path, y_path):
+    """Open the shared matrix read-only and keep BLAS to one thread per process"""
+    global _X, _y
+    from threadpoolctl import threadpool_limits
+
+    threadpool_limits(1)
+    _X = np.load(x_path, mmap_mode="r")
+    _y = np.load(y_path, mmap_mode="r")
+
+
+def _score_fold(task):
+    """Fit one config on one fold; returns (config index, fold, MAE, seconds)"""
+    from sklearn.metrics import mean_absolute_error
+
+    index, config, fold, train_idx, test_idx = task
+    start = time.perf_counter()
+    X = pd.DataFrame(_X, columns=FEATURES, copy=False)
+    model = build_estimator(config)
+    model.fit(X.iloc[train_idx], _y[train_idx])
+    mae = mean_absolute_error(_y[test_idx], model.predict(X.iloc[test_idx]))
+    return index, fold, float(mae), time.perf_counter() - start
+
+
+def default_workers():
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def run_sweep(X, y, configs, folds=DEFAULT_FOLDS, workers=None):
+    """Score every config with k-fold CV on a process pool; returns the leaderboard"""
+    from sklearn.model_selection import KFold
+
+    splits = list(KFold(n_splits=folds, shuffle=True, random_state=RANDOM_STATE).split(X))
+    tasks = [
+        (i, config, fold, train_idx, test_idx)
+        for i, config in enumerate(configs)
+        for fold, (train_idx, test_idx) in enumerate(splits)
+    ]
+
+    scores = [[None] * folds for _ in configs]
+    seconds = [0.0] * len(configs)
+    with tempfile.TemporaryDirectory(prefix="sweep_") as tmp:
+        x_path, y_path = Path(tmp) / "X.npy", Path(tmp) / "y.npy"
+        np.save(x_path, np.ascontiguousarray(X, dtype=np.float64))
+        np.save(y_path, np.ascontiguousarray(y, dtype=np.float64))
+
+        with ProcessPoolExecutor(max_workers=workers or default_workers(),
+                                 initializer=_init_worker, initargs=(str(x_path), str(y_path))) as pool:
+            for index, fold, mae, elapsed in pool.map(_score_fold, tasks, chunksize=4):
+                scores[index][fold] = mae
+                seconds[index] += elapsed
+
+    leaderboard = pd.DataFrame([
+        {
+            "model": config_name(config),
+            "family": config["family"],
+            "params": config["params"],
+            "features": ",".join(config["features"]),
+            "cv_mae_mean": float(np.mean(fold_scores)),
+            "cv_mae_std": float(np.std(fold_scores)),
+            "fit_seconds": elapsed,
+        }
+        for config, fold_scores, elapsed in zip(configs, scores, seconds)
+    ])
+    leaderboard = leaderboard.sort_values("cv_mae_mean", kind="stable").reset_index(drop=True)
+    leaderboard.index += 1
+    leaderboard.index.name = "rank"
+    return leaderboard
+
+
+def main():
+    from data_io import read_frame
+    from drift import build_profile
+    from train_model import prepare, save_model
+
+    parser = argparse.ArgumentParser(description="Parallel k-fold sweep over models and feature subsets")
+    parser.add_argument("--input", default=str(DATA_PATH), help="CSV/Parquet/Feather file to train on")
+    parser.add_argument("--folds", type=int, default=DEFAULT_FOLDS, help="Number of CV folds")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: usable cores)")
+    parser.add_argument("--families", nargs="+", choices=sorted(FAMILIES), help="Model families to include")
+    parser.add_argument("--leaderboard", default=str(LEADERBOARD_PATH), help="CSV file for the leaderboard")
+    parser.add_argument("--model-dir", default=str(MODEL_DIR), help="Directory to save the best model to")
+    parser.add_argument("--no-save", action="store_true", help="Only write the leaderboard")
+    args = parser.parse_args()
+
+    df = read_frame(args.input, columns=usecols("train"), dtype=dtypes("train"))
+    X, y = prepare(df)
+    configs = sweep_configs(args.families)
+    workers = args.workers or default_workers()
+    print(f"Sweeping {len(configs)} configs x {args.folds} folds on {len(X):,} rows with {workers} workers")
+
+    start = time.perf_counter()
+    leaderboard = run_sweep(X.to_numpy(), y.to_numpy(), configs, args.folds, workers)
+    print(f"✅ Sweep finished in {time.perf_counter() - start:.1f}s")
+
+    Path(args.leaderboard).parent.mkdir(parents=True, exist_ok=True)
+    leaderboard.to_csv(args.leaderboard)
+    print(leaderboard[["model", "cv_mae_mean", "cv_mae_std", "fit_seconds"]].head(10).to_string())
+    print(f"✅ Leaderboard saved to: {args.leaderboard}")
+
+    if not args.no_save:
+        best = configs[[config_name(c) for c in configs].index(leaderboard.iloc[0]["model"])]
+        model = build_estimator(best).fit(X, y)
+        model.feature_profile_ = build_profile(X)
+        save_model(model, args.model_dir, mae=leaderboard.iloc[0]["cv_mae_mean"], data_path=args.input)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,53 +1,121 @@
+import argparse
 import pandas as pd
 import numpy as np
 from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import LabelEncoder
 from sklearn.linear_model import LinearRegression
 from sklearn.metrics import mean_absolute_error
 import joblib
 from pathlib import Path
 
+from cleaning import clean_numeric_columns
+from data_io import read_frame
+from drift import build_profile, profile_path, save_profile
+from export_model import export_linear_model, is_linear
+from model_registry import ModelRegistry
+from schema import FEATURES, TARGET, dtypes, usecols
+
 # ── Paths ────────────────────────────────────────────────────────────────────────
 BASE_DIR   = Path(__file__).resolve().parent
-DATA_PATH  = BASE_DIR / "dataset" / "raw" / "ODI Cricket Data new.csv"
-MODEL_DIR  = BASE_DIR / "models"
-MODEL_DIR.mkdir(parents=True, exist_ok=True)
-
-# ── Load & Clean ────────────────────────────────────────────────────────────────
-df = pd.read_csv(DATA_PATH)
-
-# Remove extra dots from strike_rate (if any) then convert to numeric
-df["strike_rate"] = (
-    df["strike_rate"]
-      .astype(str)
-      .apply(lambda x: x.replace(".", "", x.count(".") - 1))
-      .pipe(pd.to_numeric, errors="coerce")
-)
-
-# Encode categorical 'role' column
-le = LabelEncoder()
-df["role"] = le.fit_transform(df["role"].astype(str))
-
-# ── Features & Target ────────────────────────────────────────────────────────────
-features = ["strike_rate", "total_balls_faced", "total_matches_played", "matches_won", "matches_lost"]
-X = df[features].copy().fillna(df[features].mean())
-y = df["total_runs"]
-
-# ── Train/Test Split ────────────────────────────────────────────────────────────
-X_train, X_test, y_train, y_test = train_test_split(
-    X, y, test_size=0.2, random_state=42
-)
-
-# ── Model Training ──────────────────────────────────────────────────────────────
-model = LinearRegression()
-model.fit(X_train, y_train)
-
-# ── Evaluation ─────────────────────────────────────────────────────────────────
-y_pred = model.predict(X_test)
-mae = mean_absolute_error(y_test, y_pred)
-print(f"Mean Absolute Error: {mae:.2f}")
-
-# ── Save Model ─────────────────────────────────────────────────────────────────
-model_path = MODEL_DIR / "cricket_model.pkl"
-joblib.dump(model, model_path)
-print(f"✅ Model saved to: {model_path}")
+DATA_PATH  = BASE_DIR.parent / "data" / "raw" / "ODI_Cricket_Data.csv"
+MODEL_DIR  = BASE_DIR.parent / "models"
+
+def prepare(df):
+    """Clean the raw columns and return the feature matrix and target"""
+    # Remove extra dots from strike_rate/average and parse percentage (vectorized)
+    df = clean_numeric_columns(df)
+
+    X = df[FEATURES].copy().fillna(df[FEATURES].mean())
+    y = df[TARGET]
+    return X, y
+
+
+def train(df):
+    """Fit the LinearRegression on an 80/20 split; returns (model, mae)"""
+    return fit(*prepare(df))
+
+
+def fit(X, y):
+    """Fit and evaluate on prepared features, e.g. from the feature store; returns (model, mae)"""
+    # ── Train/Test Split ─────────────────────────────────────────────────────────
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.2, random_state=42
+    )
+
+    # ── Model Training ───────────────────────────────────────────────────────────
+    model = LinearRegression()
+    model.fit(X_train, y_train)
+    # Feature distributions (incl. the imputation means), saved next to the model for drift monitoring
+    model.feature_profile_ = build_profile(X)
+
+    # ── Evaluation ───────────────────────────────────────────────────────────────
+    y_pred = model.predict(X_test)
+    mae = mean_absolute_error(y_test, y_pred)
+    print(f"Mean Absolute Error: {mae:.2f}")
+    return model, mae
+
+
+def save_model(model, model_dir=MODEL_DIR, mae=None, data_path=None, register=True):
+    """Write the joblib model and the compact linear artifact to ``model_dir``
+
+    With ``register`` the model is also added to ``model_dir/registry`` as a new
+    version and made current, which running servers pick up without a restart;
+    versions beyond MODEL_REGISTRY_KEEP are pruned (see model_registry.py).
+    """
+    model_dir = Path(model_dir)
+    model_dir.mkdir(parents=True, exist_ok=True)
+
+    model_path = model_dir / "cricket_model.pkl"
+    joblib.dump(model, model_path)
+    print(f"✅ Model saved to: {model_path}")
+
+    # Compact coefficients-only artifact for the NumPy scoring path
+    artifact_path = model_dir / "cricket_model.json"
+    if is_linear(model):
+        export_linear_model(model, artifact_path)
+        print(f"✅ Linear scorer artifact saved to: {artifact_path}")
+    elif artifact_path.exists():
+        # A stale artifact would shadow the new non-linear model in the app
+        artifact_path.unlink()
+        print(f"⚠️ Removed stale linear artifact: {artifact_path}")
+
+    # Training feature profile for the drift monitor (drift.py)
+    profile = getattr(model, "feature_profile_", None)
+    if profile is not None:
+        print(f"✅ Feature profile saved to: {save_profile(profile, profile_path(model_path))}")
+    elif profile_path(model_path).exists():
+        # Keep drift monitoring running on the last known profile rather than switching it off
+        print(f"⚠️ Model has no feature profile; keeping the existing {profile_path(model_path)}")
+
+    if register:
+        version = ModelRegistry(model_dir / "registry").register(model, mae=mae, data_path=data_path)
+        print(f"✅ Registered model version {version}")
+    return model_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the cricket total-runs model")
+    parser.add_argument("--input", default=str(DATA_PATH),
+                        help="CSV/Parquet/Feather file to train on (raw or preprocessed)")
+    parser.add_argument("--model-dir", default=str(MODEL_DIR), help="Directory to save the model to")
+    parser.add_argument("--feature-store", help="Train on the precomputed features of this feature store "
+                                                "(see feature_store.py) instead of --input")
+    args = parser.parse_args()
+
+    # ── Load & Train ─────────────────────────────────────────────────────────────
+    if args.feature_store:
+        from feature_store import FeatureStore
+        store = FeatureStore(args.feature_store)
+        model, mae = fit(*store.training_data())
+        data_path = str(store.path)
+    else:
+        # Only the feature and target columns are read (column projection), with lean dtypes
+        df = read_frame(args.input, columns=usecols("train"), dtype=dtypes("train"))
+        model, mae = train(df)
+        data_path = args.input
+
+    # ── Save Model ───────────────────────────────────────────────────────────────
+    save_model(model, args.model_dir, mae=mae, data_path=data_path)
+
+
+if __name__ == "__main__":
+    main()
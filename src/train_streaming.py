@@ -0,0 +1,185 @@
+# train_streaming.py
+"""
+Out-of-core training of the total-runs LinearRegression.
+
+The input (CSV or Parquet) is streamed in chunks, so peak memory depends on the
+chunk size and not on the file size:
+
+1. pass 1 accumulates per-feature sums/counts for the mean imputation used in
+   train_model.py, and the quantile edges of the drift profile;
+2. pass 2 routes every row to train or validation by a hash of its content
+   (deterministic, independent of chunking) and merges per-chunk centered
+   sufficient statistics (means and X^T X / X^T y co-moments) of the train rows;
+   the imputed rows are also counted into the drift profile's histograms;
+3. pass 3 scores the validation rows for the MAE.
+
+The normal equations are solved from the merged statistics, giving the same
+least-squares fit as ``LinearRegression.fit`` on the same train rows.
+
+Usage:
+    python src/train_streaming.py --input data/raw/ODI_Cricket_Data.csv --check
+"""
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LinearRegression
+
+from batch_predict import iter_chunks
+from cleaning import clean_numeric_columns
+from drift import ProfileBuilder
+from schema import FEATURES, TARGET, usecols
+
+# ── Defaults ─────────────────────────────────────────────────────────────────────
+BASE_DIR           = Path(__file__).resolve().parent
+DATA_PATH          = BASE_DIR.parent / "data" / "raw" / "ODI_Cricket_Data.csv"
+MODEL_DIR          = BASE_DIR.parent / "models"
+DEFAULT_CHUNK_SIZE = 200_000
+DEFAULT_HOLDOUT    = 20      # percent of rows held out for validation
+
+
+def iter_clean_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield cleaned feature/target chunks of the training file"""
+    for chunk in iter_chunks(path, chunk_size, columns=usecols("train")):
+        yield clean_numeric_columns(chunk)
+
+
+def validation_mask(chunk, holdout=DEFAULT_HOLDOUT):
+    """True for rows in the hash-based validation split"""
+    hashes = pd.util.hash_pandas_object(chunk[FEATURES + [TARGET]], index=False).to_numpy()
+    return hashes % 100 < holdout
+
+
+class StreamingLinearRegression:
+    """Ordinary least squares from chunk-wise merged centered co-moments"""
+
+    def __init__(self, n_features):
+        self.n = 0
+        self.mean_x = np.zeros(n_features)
+        self.mean_y = 0.0
+        self.cxx = np.zeros((n_features, n_features))
+        self.cxy = np.zeros(n_features)
+
+    def partial_fit(self, X, y):
+        """Merge one chunk into the running statistics (Chan et al. pairwise update)"""
+        X = np.asarray(X, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        m = len(X)
+        if m == 0:
+            return self
+        mean_x, mean_y = X.mean(axis=0), y.mean()
+        Xc, yc = X - mean_x, y - mean_y
+
+        total = self.n + m
+        dx, dy = mean_x - self.mean_x, mean_y - self.mean_y
+        weight = self.n * m / total
+        self.cxx += Xc.T @ Xc + weight * np.outer(dx, dx)
+        self.cxy += Xc.T @ yc + weight * dx * dy
+        self.mean_x += dx * m / total
+        self.mean_y += dy * m / total
+        self.n = total
+        return self
+
+    def to_estimator(self, feature_names=FEATURES):
+        """Solve the normal equations and return a fitted sklearn LinearRegression"""
+        if self.n == 0:
+            raise ValueError("No training rows were seen")
+        # Scale to unit variance first: the raw strike_rate reaches ~1e13
+        scale = np.sqrt(np.diag(self.cxx))
+        scale[scale == 0] = 1.0
+        cxx = self.cxx / np.outer(scale, scale)
+        cxy = self.cxy / scale
+        beta, _, rank, singular = np.linalg.lstsq(cxx, cxy, rcond=None)
+        coef = beta / scale
+
+        model = LinearRegression()
+        model.coef_ = coef
+        model.intercept_ = self.mean_y - self.mean_x @ coef
+        model.rank_ = int(rank)
+        model.singular_ = np.sqrt(singular)
+        model.n_features_in_ = len(coef)
+        model.feature_names_in_ = np.asarray(feature_names, dtype=object)
+        return model
+
+
+def feature_means(path, chunk_size=DEFAULT_CHUNK_SIZE, profile=None):
+    """Pass 1: per-feature means over all rows (for mean imputation), and the profile's bin edges"""
+    sums = pd.Series(0.0, index=FEATURES)
+    counts = pd.Series(0, index=FEATURES)
+    for chunk in iter_clean_chunks(path, chunk_size):
+        sums += chunk[FEATURES].sum()
+        counts += chunk[FEATURES].count()
+        if profile is not None:
+            profile.add_edges(chunk)
+    return sums / counts
+
+
+def train_streaming(path, chunk_size=DEFAULT_CHUNK_SIZE, holdout=DEFAULT_HOLDOUT):
+    """Fit on the hash-selected train rows and score the rest; returns (model, mae)"""
+    profile = ProfileBuilder()
+    means = feature_means(path, chunk_size, profile)
+
+    # ── Pass 2: sufficient statistics of the train split ─────────────────────────
+    fitter = StreamingLinearRegression(len(FEATURES))
+    for chunk in iter_clean_chunks(path, chunk_size):
+        # Profiled like train_model.fit: every row, after mean imputation
+        profile.add(chunk[FEATURES].fillna(means))
+        train_rows = chunk[~validation_mask(chunk, holdout)]
+        fitter.partial_fit(train_rows[FEATURES].fillna(means), train_rows[TARGET])
+    model = fitter.to_estimator()
+    model.feature_profile_ = profile.profile()
+
+    # ── Pass 3: validation MAE ───────────────────────────────────────────────────
+    abs_error, n_val = 0.0, 0
+    for chunk in iter_clean_chunks(path, chunk_size):
+        val_rows = chunk[validation_mask(chunk, holdout)]
+        if len(val_rows):
+            pred = model.predict(val_rows[FEATURES].fillna(means))
+            abs_error += float(np.abs(val_rows[TARGET].to_numpy() - pred).sum())
+            n_val += len(val_rows)
+    mae = abs_error / n_val if n_val else float("nan")
+    print(f"Trained on {fitter.n:,} rows, validated on {n_val:,} rows")
+    print(f"Mean Absolute Error: {mae:.2f}")
+    return model, mae
+
+
+def check_equivalence(model, path, holdout=DEFAULT_HOLDOUT, rtol=1e-6):
+    """Fit LinearRegression in memory on the same split and compare predictions"""
+    df = clean_numeric_columns(pd.read_csv(path, usecols=usecols("train")))
+    X = df[FEATURES].fillna(df[FEATURES].mean())
+    train_rows = ~validation_mask(df, holdout)
+    # Column scaling leaves the OLS solution unchanged but keeps LinearRegression's
+    # SVD from truncating everything but strike_rate (rank 1 on the raw columns)
+    scale = X[train_rows].std().replace(0, 1.0)
+    reference = LinearRegression().fit(X[train_rows] / scale, df.loc[train_rows, TARGET])
+
+    expected, actual = reference.predict(X / scale), model.predict(X)
+    max_rel = float(np.max(np.abs(expected - actual) / np.maximum(np.abs(expected), 1.0)))
+    if max_rel > rtol:
+        raise AssertionError(f"Streaming model differs from in-memory fit (max rel error {max_rel:.3g})")
+    return max_rel
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the model out-of-core in chunks")
+    parser.add_argument("--input", default=str(DATA_PATH), help="CSV/Parquet file to train on")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Rows per chunk")
+    parser.add_argument("--holdout", type=int, default=DEFAULT_HOLDOUT, help="Percent of rows held out")
+    parser.add_argument("--model-dir", default=str(MODEL_DIR), help="Directory to save the model to")
+    parser.add_argument("--check", action="store_true",
+                        help="Compare with an in-memory LinearRegression on the same split (data must fit in RAM)")
+    args = parser.parse_args()
+
+    model, mae = train_streaming(args.input, args.chunk_size, args.holdout)
+
+    if args.check:
+        max_rel = check_equivalence(model, args.input, args.holdout)
+        print(f"✅ Matches in-memory LinearRegression (max rel prediction error {max_rel:.3g})")
+
+    from train_model import save_model
+    save_model(model, args.model_dir, mae=mae, data_path=args.input)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+# conftest.py
+"""Make the src/ modules importable the way the scripts import each other (by bare name)."""
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
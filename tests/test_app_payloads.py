@@ -0,0 +1,40 @@
+# test_app_payloads.py
+"""Request validation of the prediction API: malformed bodies are 400s, not 500s."""
+import pytest
+
+from app import BadRequest, players_query, to_rows
+
+ROW = {"strike_rate": 130.5, "total_balls_faced": 1000, "total_matches_played": 50,
+       "matches_won": 20, "matches_lost": 25}
+
+
+@pytest.mark.parametrize("payload", [
+    [{"players": ["V Kohli"]}],          # list body
+    {"players": "V Kohli"},              # a string would be iterated by character
+    {"players": [["V Kohli"]]},          # unhashable entries
+    {"players": ["V Kohli", 18]},
+    {"team": 1},
+    {},
+])
+def test_players_query_rejects_malformed_bodies(payload):
+    with pytest.raises(BadRequest):
+        players_query(payload)
+
+
+def test_players_query_accepts_names_or_filters():
+    assert players_query({"players": ["V Kohli"]}) == (["V Kohli"], None, None)
+    assert players_query({"team": "India", "role": "Batsman"}) == (None, "India", "Batsman")
+
+
+@pytest.mark.parametrize("payload", [
+    [], [1], {**ROW, "strike_rate": "fast"}, {**ROW, "matches_won": float("nan")},
+    {k: v for k, v in ROW.items() if k != "matches_lost"},
+])
+def test_to_rows_rejects_bad_records(payload):
+    with pytest.raises(BadRequest):
+        to_rows(payload)
+
+
+def test_to_rows_orders_features():
+    _, rows = to_rows([ROW, ROW])
+    assert rows == [[130.5, 1000.0, 50.0, 20.0, 25.0]] * 2
@@ -0,0 +1,33 @@
+# test_etl_pipeline.py
+"""Team partitioning and clean-up of the cricket_etl DAG tasks."""
+import sys
+
+import pandas as pd
+
+from conftest import ROOT
+
+sys.path.insert(0, str(ROOT / "airflow" / "dags"))
+from etl_pipeline import ROW_COLUMN, cleanup_partitions, split_by_team, team_slug  # noqa: E402
+
+RAW_CSV = ROOT / "data" / "raw" / "ODI_Cricket_Data.csv"
+
+
+def test_team_slugs_are_unique():
+    assert team_slug("A&B") != team_slug("A B")
+    assert team_slug("India").startswith("India-")
+    assert team_slug(None) == team_slug(float("nan")) == "unknown"
+
+
+def test_split_keeps_teams_with_colliding_names_apart(tmp_path):
+    raw = pd.read_csv(RAW_CSV, nrows=40)
+    raw["team"] = ["A&B"] * 20 + ["A B"] * 20
+    raw.to_csv(tmp_path / "raw.csv", index=False)
+
+    paths = split_by_team(tmp_path / "raw.csv", tmp_path / "work")
+    assert len(paths) == 2
+    parts = [pd.read_parquet(path) for path in paths]
+    assert sorted(len(part) for part in parts) == [20, 20]
+    assert sorted(pd.concat(parts)[ROW_COLUMN]) == list(range(40))
+
+    cleanup_partitions(tmp_path / "work")
+    assert not (tmp_path / "work").exists()
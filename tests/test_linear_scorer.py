@@ -0,0 +1,58 @@
+# test_linear_scorer.py
+"""Parity of the NumPy-only LinearScorer with sklearn's predict."""
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+
+from export_model import check_parity, export_linear_model, load_check_data
+from linear_scorer import LinearScorer
+from schema import FEATURES
+
+TOLERANCE = 1e-9
+
+
+def synthetic_xy(rows=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame({
+        "strike_rate": rng.uniform(50, 150, rows),
+        "total_balls_faced": rng.integers(0, 20000, rows).astype(float),
+        "total_matches_played": rng.integers(1, 500, rows).astype(float),
+        "matches_won": rng.integers(0, 300, rows).astype(float),
+        "matches_lost": rng.integers(0, 300, rows).astype(float),
+    })
+    y = X.to_numpy() @ np.array([3.0, 0.8, -0.03, 0.5, -0.5]) + rng.normal(0, 25, rows)
+    return X, y
+
+
+def exported(model, tmp_path):
+    return LinearScorer.load(export_linear_model(model, tmp_path / "model.json"))
+
+
+@pytest.mark.parametrize("make_model", [LinearRegression, lambda: make_pipeline(StandardScaler(), LinearRegression())])
+def test_scorer_matches_sklearn_predict(tmp_path, make_model):
+    X, y = synthetic_xy()
+    model = make_model().fit(X, y)
+    scorer = exported(model, tmp_path)
+
+    expected = model.predict(X)
+    np.testing.assert_allclose(scorer.predict(X), expected, rtol=TOLERANCE, atol=TOLERANCE)
+    np.testing.assert_allclose(scorer.predict(X.to_numpy()), expected, rtol=TOLERANCE, atol=TOLERANCE)
+    single = [scorer.predict_one(record) for record in X.head(50).to_dict(orient="records")]
+    np.testing.assert_allclose(single, expected[:50], rtol=TOLERANCE, atol=TOLERANCE)
+
+
+def test_scorer_matches_model_trained_on_repo_data(tmp_path):
+    X = load_check_data()
+    y = X.to_numpy() @ np.array([1e-12, 0.8, -0.03, 0.5, -0.5])
+    model = LinearRegression().fit(X, y)
+    scorer = exported(model, tmp_path)
+    assert check_parity(model, scorer, X, rtol=TOLERANCE, atol=TOLERANCE) <= TOLERANCE * np.abs(y).max()
+
+
+def test_scorer_rejects_wrong_width():
+    scorer = LinearScorer(FEATURES, [1.0] * len(FEATURES), 0.0)
+    with pytest.raises(ValueError):
+        scorer.predict(np.ones((2, 3)))
@@ -0,0 +1,57 @@
+# test_log_store.py
+"""Paging, tails and segment rotation of the dashboard LogStore."""
+import os
+
+from log_store import LogStore
+
+RUN_ID = "cricket_etl__20240101T000000"
+
+
+def write_lines(store, count):
+    with store.writer(RUN_ID) as writer:
+        for i in range(count):
+            writer.write(f"line {i}\n")
+
+
+def test_pages_hold_page_lines_lines(tmp_path):
+    store = LogStore(tmp_path, page_lines=100)
+    write_lines(store, 1050)
+    assert store.page_count(RUN_ID) == (0, 11)
+    assert store.read_page(RUN_ID, 3).splitlines() == [f"line {i}" for i in range(300, 400)]
+    assert store.read_page(RUN_ID, 10).splitlines() == [f"line {i}" for i in range(1000, 1050)]
+    assert store.read_page(RUN_ID, 11) is None
+
+
+def test_tail_and_ranges(tmp_path):
+    store = LogStore(tmp_path, page_lines=100)
+    write_lines(store, 500)
+    text, _, end = store.tail(RUN_ID, lines=3)
+    assert text.splitlines() == ["line 497", "line 498", "line 499"]
+    assert end == store.bounds(RUN_ID)[1]
+
+    first, start, following = store.read_range(RUN_ID, 0, limit=15)
+    assert first == "line 0\nline 1\n"   # partial third line left for the next read
+    second, _, _ = store.read_range(RUN_ID, following, limit=7)
+    assert (start, second) == (0, "line 2\n")
+
+
+def test_rotated_segments_drop_old_pages(tmp_path):
+    store = LogStore(tmp_path, page_lines=10, segment_bytes=1000, max_segments=2)
+    write_lines(store, 2000)
+    assert len(store.segments(RUN_ID)) == 2
+    first, count = store.page_count(RUN_ID)
+    assert first > 0 and count == 200
+    assert store.read_page(RUN_ID, 0) is None
+    assert store.read_page(RUN_ID, count - 1).splitlines() == [f"line {i}" for i in range(1990, 2000)]
+    assert store.tail(RUN_ID, lines=1)[0] == "line 1999\n"
+
+
+def test_retention_keeps_newest_runs(tmp_path):
+    store = LogStore(tmp_path, keep_runs=2, max_age_days=None)
+    for i in range(4):
+        with store.writer(f"cricket_etl__run{i}") as writer:
+            writer.write("done\n")
+        os.utime(tmp_path / f"cricket_etl__run{i}.idx", (1_700_000_000 + i, 1_700_000_000 + i))
+    removed = store.enforce_retention("cricket_etl", active={"cricket_etl__run0"})
+    assert removed == ["cricket_etl__run1"]
+    assert [store.exists(f"cricket_etl__run{i}") for i in range(4)] == [True, False, True, True]
@@ -0,0 +1,59 @@
+# test_micro_batcher.py
+"""Request batching in MicroBatcher."""
+import numpy as np
+import pytest
+
+from micro_batcher import MicroBatcher
+
+
+class RecordingModel:
+    """Sums each row; raises on NaN like sklearn's input validation"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, X):
+        self.calls.append(len(X))
+        if np.isnan(X).any():
+            raise ValueError("Input X contains NaN")
+        return X.sum(axis=1)
+
+
+@pytest.fixture
+def model():
+    return RecordingModel()
+
+
+def test_concurrent_requests_share_one_predict_call(model):
+    batcher = MicroBatcher(model, max_batch_size=64, max_wait_ms=200)
+    futures = [batcher.submit([[i, 1.0]]) for i in range(5)]
+    assert [float(f.result(timeout=5)[0]) for f in futures] == [1.0, 2.0, 3.0, 4.0, 5.0]
+    assert model.calls == [5]
+    batcher.close()
+
+
+def test_bad_row_fails_only_its_own_request(model):
+    batcher = MicroBatcher(model, max_batch_size=64, max_wait_ms=200)
+    good_before = batcher.submit([[1.0, 2.0]])
+    bad = batcher.submit([[np.nan, 1.0]])
+    good_after = batcher.submit([[3.0, 4.0], [5.0, 6.0]])
+    assert good_before.result(timeout=5).tolist() == [3.0]
+    assert good_after.result(timeout=5).tolist() == [7.0, 11.0]
+    with pytest.raises(ValueError, match="NaN"):
+        bad.result(timeout=5)
+    batcher.close()
+
+
+def test_large_request_is_scored_in_slices(model):
+    batcher = MicroBatcher(model, max_batch_size=4, max_wait_ms=0)
+    result = batcher.predict(np.ones((10, 2)), timeout=5)
+    assert result.tolist() == [2.0] * 10
+    assert model.calls == [4, 4, 2]
+    batcher.close()
+
+
+def test_closed_batcher_rejects_requests(model):
+    batcher = MicroBatcher(model)
+    batcher.close()
+    with pytest.raises(RuntimeError):
+        batcher.submit([[1.0]])
@@ -0,0 +1,70 @@
+# test_model_registry.py
+"""Registering versions and hot-swapping the served one."""
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LinearRegression
+
+from model_registry import ModelRegistry, ModelWatcher
+from schema import FEATURES
+
+X = pd.DataFrame(np.eye(len(FEATURES)), columns=FEATURES)
+
+
+def constant_model(value):
+    """A fitted linear model predicting ``value`` everywhere"""
+    return LinearRegression().fit(X, np.full(len(X), value))
+
+
+def test_register_versions_and_promote(tmp_path):
+    registry = ModelRegistry(tmp_path)
+    v1 = registry.register(constant_model(1.0), mae=1.5)
+    v2 = registry.register(constant_model(2.0), set_current=False)
+    assert registry.versions() == [v1, v2]
+    assert registry.current() == v1
+    assert registry.metadata(v1)["mae"] == 1.5
+    registry.set_current(v2)
+    assert registry.current() == v2
+
+
+def test_watcher_swaps_in_the_promoted_version(tmp_path):
+    registry = ModelRegistry(tmp_path)
+    v1 = registry.register(constant_model(1.0))
+    v2 = registry.register(constant_model(2.0), set_current=False)
+    swaps = []
+    watcher = ModelWatcher(registry, interval=60, on_swap=lambda old, new: swaps.append((old, new))).start()
+    try:
+        version, before = watcher.current()
+        assert version == v1
+        assert watcher.check() is False   # nothing changed
+
+        registry.set_current(v2)
+        assert watcher.check() is True
+        version, after = watcher.current()
+        assert version == v2
+        assert np.allclose(after.predict(X), 2.0)
+        # A request holding the old model still finishes on it
+        assert np.allclose(before.predict(X), 1.0)
+        assert swaps == [(None, v1), (v1, v2)]
+        assert watcher.stats()["swaps"] == 1
+    finally:
+        watcher.stop()
+
+
+def test_register_prunes_old_versions_but_not_current_or_pinned(tmp_path):
+    registry = ModelRegistry(tmp_path)
+    v1 = registry.register(constant_model(1.0), keep=2)
+    v2 = registry.register(constant_model(2.0), keep=2)
+    registry.pin(v1)
+    v3 = registry.register(constant_model(3.0), set_current=False, keep=2)
+    assert registry.versions() == [v1, v2, v3]   # v1 is pinned, v2 is current
+
+    registry.unpin(v1)
+    v4 = registry.register(constant_model(4.0), set_current=False, keep=2)
+    assert registry.versions() == [v2, v3, v4]
+    assert not (tmp_path / v1).exists()
+    assert registry.current() == v2
+
+    registry.set_current(v4)
+    assert registry.prune(keep=2) == [v2]
+    assert registry.register(constant_model(5.0), keep=0) == "v0005"
+    assert registry.versions() == [v3, v4, "v0005"]
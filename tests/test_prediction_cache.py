@@ -0,0 +1,52 @@
+# test_prediction_cache.py
+"""LRU, TTL, quantized keys and model-file invalidation of PredictionCache."""
+import os
+import time
+
+from prediction_cache import PredictionCache, parse_quantize
+
+ROW = {"strike_rate": 90.04, "total_balls_faced": 1000, "total_matches_played": 50,
+       "matches_won": 20, "matches_lost": 25}
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = PredictionCache(max_size=2)
+    cache.put("a", 1.0)
+    cache.put("b", 2.0)
+    assert cache.get("a") == 1.0    # "b" is now the least recently used
+    cache.put("c", 3.0)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1.0 and cache.get("c") == 3.0
+    assert cache.evictions == 1
+
+
+def test_entries_expire_after_ttl():
+    cache = PredictionCache(ttl=0.05)
+    cache.put("a", 1.0)
+    assert cache.get("a") == 1.0
+    time.sleep(0.06)
+    assert cache.get("a") is None
+    assert cache.expirations == 1
+
+
+def test_quantized_keys_share_an_entry():
+    cache = PredictionCache(quantize=parse_quantize(["strike_rate=0.1"]))
+    calls = []
+    compute = lambda row: calls.append(row) or 42.0  # noqa: E731
+    assert cache.get_or_compute(ROW, compute) == 42.0
+    assert cache.get_or_compute({**ROW, "strike_rate": 89.96}, compute) == 42.0
+    assert len(calls) == 1
+    assert cache.get_or_compute({**ROW, "strike_rate": 90.2}, compute) == 42.0
+    assert len(calls) == 2
+
+
+def test_changed_model_file_clears_the_cache(tmp_path):
+    model_file = tmp_path / "model.json"
+    model_file.write_text("v1")
+    cache = PredictionCache(watch_paths=[model_file], check_interval=0)
+    cache.put("a", 1.0)
+    assert cache.get("a") == 1.0
+    model_file.write_text("version 2")
+    os.utime(model_file, ns=(time.time_ns(), time.time_ns() + 10**9))
+    assert cache.get("a") is None
+    assert cache.invalidations == 1
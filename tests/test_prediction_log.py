@@ -0,0 +1,43 @@
+# test_prediction_log.py
+"""Counting, per-source retention and ordered replay of the prediction log."""
+import threading
+
+from prediction_log import PredictionLogger, iter_records, rotated_files
+
+ROW = [90.0, 1000.0, 50.0, 20.0, 25.0]
+
+
+def test_concurrent_callers_are_all_counted(tmp_path):
+    plog = PredictionLogger(tmp_path, source="api", queue_size=100_000)
+    threads = [threading.Thread(target=lambda: [plog.log("api", [ROW], [1.0]) for _ in range(2000)])
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    plog.close()
+    stats = plog.stats()
+    assert stats["logged"] + stats["dropped"] == 16_000
+    assert stats["written"] == stats["logged"]
+
+
+def test_retention_is_per_source(tmp_path):
+    for source, runs in (("api", 1), ("batch", 5)):
+        for _ in range(runs):
+            plog = PredictionLogger(tmp_path, source=source, max_bytes=1, keep=2)
+            plog.log(source, [ROW], [1.0], block=True)
+            plog.close()   # max_bytes=1: every write rotates
+    assert len(rotated_files(tmp_path, "api")) == 1
+    assert len(rotated_files(tmp_path, "batch")) == 2
+
+
+def test_replay_merges_processes_in_time_order(tmp_path):
+    first = PredictionLogger(tmp_path, source="api")
+    second = PredictionLogger(tmp_path, source="batch")
+    for i in range(10):
+        (first if i % 2 else second).log("api" if i % 2 else "batch", [ROW], [float(i)], block=True)
+    first.close()
+    second.close()
+    records = list(iter_records(tmp_path))
+    assert [record["predictions"][0] for record in records] == [float(i) for i in range(10)]
+    assert [len(r["rows"]) for r in iter_records(tmp_path, paths={"api"})] == [1] * 5
@@ -0,0 +1,54 @@
+# test_schema.py
+"""Loading incomplete raw exports through the central schema."""
+import numpy as np
+import pandas as pd
+
+from conftest import ROOT
+from data_io import read_frame, write_frame
+from preprocess import preprocess_frame
+from schema import COUNT_COLUMNS, FEATURES, TARGET, dtypes, usecols
+from train_model import prepare, train
+
+RAW_CSV = ROOT / "data" / "raw" / "ODI_Cricket_Data.csv"
+
+
+def incomplete_export(tmp_path, rows=200):
+    """The first ``rows`` raw rows with some count cells left blank"""
+    raw = pd.read_csv(RAW_CSV, nrows=rows)
+    raw.loc[[3, 10], "total_balls_faced"] = np.nan
+    raw.loc[[5], "matches_won"] = np.nan
+    raw.loc[[7], "player_of_match_awards"] = np.nan
+    path = tmp_path / "raw.csv"
+    raw.to_csv(path, index=False)
+    return path
+
+
+def test_blank_count_cells_read_as_nan(tmp_path):
+    df = read_frame(incomplete_export(tmp_path), dtype=dtypes("extract"))
+    assert df["total_balls_faced"].isna().sum() == 2
+    assert df["matches_won"].isna().sum() == 1
+    for col in COUNT_COLUMNS:
+        assert df[col].dtype == np.float32
+
+
+def test_counts_stay_exact_integers(tmp_path):
+    raw = pd.read_csv(RAW_CSV, nrows=200)
+    df = read_frame(RAW_CSV, dtype=dtypes("extract")).head(200)
+    for col in COUNT_COLUMNS:
+        np.testing.assert_array_equal(df[col].to_numpy("float64"), raw[col].to_numpy("float64"))
+
+
+def test_extract_preprocess_train_with_missing_cells(tmp_path):
+    df = preprocess_frame(read_frame(incomplete_export(tmp_path), dtype=dtypes("extract")))
+    cleaned = tmp_path / "cleaned.parquet"
+    write_frame(df, cleaned)
+
+    train_df = read_frame(cleaned, columns=usecols("train"), dtype=dtypes("train"))
+    X, y = prepare(train_df)
+    assert not X.isna().any().any()
+    assert X.loc[3, "total_balls_faced"] == train_df["total_balls_faced"].mean()
+    assert len(y) == len(train_df) and TARGET in train_df
+
+    model, mae = train(train_df)
+    assert np.isfinite(mae)
+    assert list(model.feature_names_in_) == FEATURES